@@ -1,4 +1,5 @@
 import logging
+import multiprocessing
 
 import flet as ft
 
@@ -24,4 +25,7 @@ def main_wrapper(page: ft.Page):
 
 
 if __name__ == "__main__":
+    # Event worker processes are spawned from the frozen executable, which
+    # must run the worker instead of opening another app.
+    multiprocessing.freeze_support()
     ft.app(target=main_wrapper, view=ft.AppView.FLET_APP)
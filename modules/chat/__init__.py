@@ -0,0 +1,17 @@
+from modules.chat.dispatcher import (
+    ChatDispatcher,
+    ChatMessage,
+    ChatPriority,
+    default_priority,
+    get_chat_dispatcher,
+    get_or_create_chat_dispatcher,
+    has_chat_dispatcher,
+    set_chat_dispatcher,
+)
+from modules.chat.reminders import ReminderCache
+from modules.chat.transport import (
+    ChatTransport,
+    ClipboardTransport,
+    LoopbackRecord,
+    LoopbackTransport,
+)
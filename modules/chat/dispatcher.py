@@ -0,0 +1,244 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+
+# How long the dispatcher blocks on an empty outbox before rechecking for stop.
+IDLE_SLICE = 0.1
+
+
+class ChatPriority(IntEnum):
+    """
+    Order in which queued chat messages are sent, most urgent first.
+    """
+
+    COMMAND = 0
+    MESSAGE = 1
+    REMINDER = 2
+
+
+def default_priority(message, race_control=False):
+    """
+    Gets the priority for a message that wasn't given one.
+
+    Admin commands such as ``!y``, ``!pitclose`` and ``!bl`` go first, and
+    everything else (announcements and DMs) after them.
+
+    Args:
+        message (str): The message to send.
+        race_control (bool, optional): Whether the message is a race control announcement. Defaults to False.
+
+    Returns:
+        ChatPriority: The priority to send the message with.
+    """
+    if not race_control and message.startswith("!"):
+        return ChatPriority.COMMAND
+    return ChatPriority.MESSAGE
+
+
+class ChatMessage:
+    """
+    A message waiting in the outbox.
+
+    Attributes:
+        message (str): The text as it will be typed, including any /all prefix.
+        priority (ChatPriority): The priority the message was queued with.
+        future (Future): Resolves to the time.monotonic() the message was sent at.
+        queued_at (float): The time.monotonic() the message was queued at.
+    """
+
+    __slots__ = ("message", "priority", "future", "queued_at")
+
+    def __init__(self, message, priority):
+        self.message = message
+        self.priority = priority
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+class ChatDispatcher:
+    """
+    The only thread that types into the sim's chat.
+
+    Events queue messages with ``send`` and carry on; the dispatcher sends them
+    one at a time in priority order, and in the order they were queued within
+    a priority, through its ChatTransport.
+
+    Attributes:
+        transport (ChatTransport): Sends each message.
+        lock (threading.Lock): Held while a message is being sent.
+    """
+
+    def __init__(self, transport, lock=None, logger=None):
+        """
+        Initializes the ChatDispatcher.  The thread starts on the first send.
+
+        Args:
+            transport (ChatTransport): Sends each message.
+            lock (threading.Lock, optional): Held while a message is being sent. Defaults to a new lock.
+            logger (logging.Logger, optional): Logger to use. Defaults to the global logger.
+        """
+        self.transport = transport
+        self.lock = lock or threading.Lock()
+        if logger is None:
+            from modules.logging_context import get_logger
+
+            logger = logging.LoggerAdapter(
+                get_logger() or logging.getLogger(__name__),
+                {"event": self.__class__.__name__},
+            )
+        self.logger = logger
+        self._outbox = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self):
+        """
+        int: Number of messages waiting to be sent.
+        """
+        return self._outbox.qsize()
+
+    def start(self):
+        """
+        Starts the dispatcher thread if it isn't running.
+        """
+        with self._thread_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ChatDispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """
+        Stops the dispatcher thread and cancels every message still queued.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the message being sent. Defaults to 5.
+        """
+        self._stop.set()
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=timeout)
+        while True:
+            try:
+                _, _, chat_message = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            chat_message.future.cancel()
+
+    def send(self, message, race_control=False, priority=None):
+        """
+        Queues a chat message without waiting for it to be sent.
+
+        Args:
+            message (str): The message to send.
+            race_control (bool, optional): Whether to send the message to everyone as race control. Defaults to False.
+            priority (ChatPriority, optional): When to send the message. Defaults to default_priority(message, race_control).
+
+        Returns:
+            Future: Resolves to the time.monotonic() the message was sent at.
+        """
+        if priority is None:
+            priority = default_priority(message, race_control)
+        if race_control:
+            message = f"/all {message}"
+        chat_message = ChatMessage(message, priority)
+        self._outbox.put((priority, next(self._sequence), chat_message))
+        self.start()
+        return chat_message.future
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                _, _, chat_message = self._outbox.get(timeout=IDLE_SLICE)
+            except queue.Empty:
+                continue
+            if not chat_message.future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._deliver(chat_message.message)
+            except BaseException as e:
+                if not isinstance(e, KeyboardInterrupt):
+                    self.logger.error(f"Chat message not sent: {chat_message.message}")
+                chat_message.future.set_exception(e)
+            else:
+                chat_message.future.set_result(time.monotonic())
+
+    def _wait(self, seconds):
+        if self._stop.wait(seconds):
+            raise KeyboardInterrupt
+
+    def _deliver(self, message):
+        """
+        Sends one message through the transport.
+        """
+        while not self.lock.acquire(timeout=IDLE_SLICE):
+            self._wait(0)
+        try:
+            self.transport.send(message, self._wait)
+        finally:
+            self.lock.release()
+
+
+_global_dispatcher = None
+_global_dispatcher_lock = threading.Lock()
+
+
+def set_chat_dispatcher(dispatcher):
+    """
+    Sets the global chat dispatcher.
+
+    Args:
+        dispatcher (ChatDispatcher): The dispatcher to share, or None to clear it.
+
+    Returns:
+        ChatDispatcher: The dispatcher.
+    """
+    global _global_dispatcher
+    _global_dispatcher = dispatcher
+    return dispatcher
+
+
+def get_chat_dispatcher():
+    """
+    Gets the global chat dispatcher.
+
+    Returns:
+        ChatDispatcher: The dispatcher, or None if not set.
+    """
+    return _global_dispatcher
+
+
+def has_chat_dispatcher():
+    return _global_dispatcher is not None
+
+
+def get_or_create_chat_dispatcher(factory):
+    """
+    Gets the global chat dispatcher, creating it with ``factory`` if there isn't one.
+
+    Args:
+        factory (callable): Returns a new ChatDispatcher.
+
+    Returns:
+        ChatDispatcher: The global dispatcher.
+    """
+    global _global_dispatcher
+    with _global_dispatcher_lock:
+        if _global_dispatcher is None:
+            _global_dispatcher = factory()
+        return _global_dispatcher
@@ -0,0 +1,55 @@
+class ReminderCache:
+    """
+    Suppresses reminders that repeat an instruction the car was just given.
+
+    Reminders are keyed by (car, instruction).  One is due when the car
+    hasn't been given that instruction, when its wording has changed (e.g.
+    it now has to let a different car by), or when it was last sent at least
+    ``ttl`` seconds ago.
+
+    Attributes:
+        ttl (float): Seconds before an unchanged reminder is sent again.
+    """
+
+    def __init__(self, ttl):
+        """
+        Initializes the ReminderCache.
+
+        Args:
+            ttl (float): Seconds before an unchanged reminder is sent again.
+        """
+        self.ttl = ttl
+        self._sent = {}
+
+    def __len__(self):
+        return len(self._sent)
+
+    def clear(self):
+        self._sent.clear()
+
+    def due(self, reminders, now, cars=None):
+        """
+        Gets the reminders that should be sent now, and records them as sent.
+
+        Instructions no longer being given to ``cars`` are forgotten, so they
+        are sent straight away if they are needed again.
+
+        Args:
+            reminders (dict): Reminder text keyed by (car, instruction).
+            now (float): The current time, e.g. SessionTime.
+            cars (iterable, optional): The cars ``reminders`` covers. Defaults to the cars in ``reminders``.
+
+        Returns:
+            dict: The reminders to send, keyed and ordered like ``reminders``.
+        """
+        cars = {car for car, _ in reminders} if cars is None else set(cars)
+        for key in [k for k in self._sent if k[0] in cars and k not in reminders]:
+            del self._sent[key]
+
+        due = {}
+        for key, text in reminders.items():
+            sent = self._sent.get(key)
+            if sent is None or sent[0] != text or now - sent[1] >= self.ttl:
+                self._sent[key] = (text, now)
+                due[key] = text
+        return due
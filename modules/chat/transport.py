@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import pyperclip
+
+# Title of the sim window the chat keystrokes are sent to.
+SIM_WINDOW = "iRacing.com Simulator"
+
+
+class ChatTransport:
+    """
+    Puts a chat message into the sim.  Used by ChatDispatcher, one message at a time.
+    """
+
+    def send(self, message, wait):
+        """
+        Sends one message, returning once it has been sent.
+
+        Args:
+            message (str): The message, exactly as it should appear in chat.
+            wait (callable): Sleeps for the given seconds, raising KeyboardInterrupt
+                if the dispatcher is stopped.  Use it for any pauses.
+
+        Raises:
+            NotImplementedError: If not implemented by subclass.
+        """
+        raise NotImplementedError
+
+
+class ClipboardTransport(ChatTransport):
+    """
+    Pastes messages into the sim's chat box through the clipboard and keystrokes.
+
+    Attributes:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) used to open the chat.
+        pwa (pywinauto.Application): The application connected to the sim window.
+    """
+
+    def __init__(self, sdk, pwa, logger=None):
+        """
+        Initializes the ClipboardTransport.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) used to open the chat.
+            pwa (pywinauto.Application): The application connected to the sim window.
+            logger (logging.Logger, optional): Logger to use. Defaults to the global logger.
+        """
+        self.sdk = sdk
+        self.pwa = pwa
+        if logger is None:
+            from modules.logging_context import get_logger
+
+            logger = logging.LoggerAdapter(
+                get_logger() or logging.getLogger(__name__),
+                {"event": self.__class__.__name__},
+            )
+        self.logger = logger
+
+    def send(self, message, wait):
+        while self.sdk["IsGarageVisible"]:
+            wait(1)
+        pyperclip.copy(message)
+        self.logger.debug(f"Sending chat message: {message}")
+        self.sdk.chat_command(3)
+        wait(0.1)
+        self.sdk.chat_command(1)
+        try:
+            self.pwa[SIM_WINDOW].type_keys("^v")
+        except Exception as e:
+            self.logger.critical("Error sending chat message.")
+            self.logger.critical(e)
+            raise
+        self.pwa[SIM_WINDOW].type_keys("{ENTER}")
+        wait(0.1)
+
+
+LoopbackRecord = namedtuple("LoopbackRecord", ["message", "started_at", "sent_at"])
+
+
+class LoopbackTransport(ChatTransport):
+    """
+    Records messages in-process instead of sending them, for tests and benchmarks.
+
+    Attributes:
+        send_time (float): Seconds each message takes to "send".
+        sent (list): A LoopbackRecord per message, in the order they were sent.
+            Times are time.monotonic().
+    """
+
+    def __init__(self, send_time=0.0):
+        """
+        Initializes the LoopbackTransport.
+
+        Args:
+            send_time (float, optional): Seconds each message takes to "send". Defaults to 0.
+        """
+        self.send_time = send_time
+        self.sent = []
+        self._lock = threading.Lock()
+
+    @property
+    def messages(self):
+        """
+        list: The text of every message sent, in order.
+        """
+        with self._lock:
+            return [record.message for record in self.sent]
+
+    def send(self, message, wait):
+        started_at = time.monotonic()
+        if self.send_time:
+            wait(self.send_time)
+        with self._lock:
+            self.sent.append(LoopbackRecord(message, started_at, time.monotonic()))
@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import logging
+import threading
+
+# Seconds stop() waits for the loop's tasks to finish after cancelling them.
+STOP_TIMEOUT = 1
+
+_current_runtime = contextvars.ContextVar("event_runtime", default=None)
+
+
+class EventRuntime:
+    """
+    Runs events as coroutines on one asyncio loop, in one thread.
+
+    Events that can run as coroutines (see ``BaseEvent.run_async``) await
+    ticks, timers and chat sends on the loop, so dozens of them waiting for
+    their start time cost no threads at all, and stopping the runtime cancels
+    them straight away.  Synchronous code is run through ``run_in_thread``,
+    which gives it a thread of its own for as long as it runs.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop, or None until started.
+        threads (list): Threads started by ``run_in_thread``, including finished ones.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Initializes the EventRuntime.
+
+        Args:
+            logger (logging.Logger, optional): Logger to use. Defaults to the global logger.
+        """
+        if logger is None:
+            from modules.logging_context import get_logger
+
+            logger = logging.LoggerAdapter(
+                get_logger() or logging.getLogger(__name__),
+                {"event": self.__class__.__name__},
+            )
+        self.logger = logger
+        self.loop = None
+        self.threads = []
+        self._tasks = set()
+        self._thread = None
+        self._started = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Starts the loop's thread, if it isn't running.
+        """
+        if self.running:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="EventRuntime", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+
+    def submit(self, coro):
+        """
+        Runs a coroutine on the loop.
+
+        Args:
+            coro (coroutine): The coroutine, e.g. ``event.run_async(...)``.
+
+        Returns:
+            concurrent.futures.Future: Resolves when the coroutine finishes.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._track(coro), self.loop)
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Cancels every coroutine and stops the loop.
+
+        Threads started by ``run_in_thread`` are not waited for; callers
+        should set the events' cancel_event first and join ``threads``.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the coroutines to finish. Defaults to STOP_TIMEOUT.
+        """
+        if not self.running:
+            return
+        cancelled = asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop)
+        try:
+            cancelled.result(timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"Event coroutines did not stop cleanly: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def _track(self, coro):
+        _current_runtime.set(self)
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            return await coro
+        finally:
+            self._tasks.discard(task)
+
+    async def _cancel_all(self):
+        tasks = [task for task in self._tasks if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """
+    Runs a blocking function on a thread of its own, and waits for it
+    without blocking the loop.
+
+    Unlike ``asyncio.to_thread`` the thread isn't pooled, so a long-running
+    event can't starve the others, and it is recorded in the current
+    EventRuntime's ``threads`` so it can be joined when the runtime stops.
+
+    Args:
+        func (callable): The function to run.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        Any: What ``func`` returned.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _resolve(result, error):
+        if future.cancelled():
+            return
+        if isinstance(error, KeyboardInterrupt):
+            # Events raise KeyboardInterrupt when cancelled; on the loop that
+            # would stop the loop itself, so it becomes a task cancellation.
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _target():
+        try:
+            outcome = (func(*args, **kwargs), None)
+        except BaseException as e:
+            outcome = (None, e)
+        try:
+            loop.call_soon_threadsafe(_resolve, *outcome)
+        except RuntimeError:
+            pass  # The runtime stopped while the thread was running.
+
+    owner = getattr(func, "__self__", None)
+    if owner is not None:
+        name = type(owner).__name__
+    else:
+        name = getattr(func, "__name__", "EventThread")
+    thread = threading.Thread(target=_target, name=name, daemon=True)
+    runtime = _current_runtime.get()
+    if runtime is not None:
+        runtime.threads.append(thread)
+    thread.start()
+    return await future
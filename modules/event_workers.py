@@ -0,0 +1,272 @@
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future
+
+from modules.chat import ChatDispatcher, set_chat_dispatcher
+from modules.chat.dispatcher import IDLE_SLICE
+from modules.logging_context import set_logger
+from modules.telemetry import SharedTelemetrySDK, TelemetryHub, set_hub
+
+# Workers are spawned rather than forked, so they start the same way on every
+# platform and don't inherit the parent's threads.
+START_METHOD = "spawn"
+# Seconds a worker gets to exit after the cancel event is set before it is terminated.
+WORKER_STOP_TIMEOUT = 10
+
+# The session queues an event puts on, relayed into the parent's queues.
+RELAYED_QUEUES = ("audio_queue", "broadcast_text_queue", "chat_consumer_queue")
+
+
+def get_worker_context():
+    """
+    Gets the multiprocessing context workers, and what they share, are made in.
+
+    Returns:
+        multiprocessing.context.BaseContext: The context.
+    """
+    return multiprocessing.get_context(START_METHOD)
+
+
+class _Channel:
+    """
+    Stands in for a queue.Queue in the worker, forwarding everything put on
+    it to the parent through the worker's outbox.
+    """
+
+    def __init__(self, outbox, name):
+        self.outbox = outbox
+        self.name = name
+
+    def put(self, item, block=True, timeout=None):
+        self.outbox.put((self.name, item), block, timeout)
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+
+class RemoteChatDispatcher(ChatDispatcher):
+    """
+    A worker's chat dispatcher, which hands every message to the parent's.
+
+    The parent sends the worker's messages in priority order along with
+    everyone else's, and the futures ``send`` returns resolve once it has.
+
+    Attributes:
+        outbox (multiprocessing.Queue): Messages for the parent.
+        replies (multiprocessing.Queue): (message id, sent at) from the parent,
+            with sent at None if the message wasn't sent.
+    """
+
+    def __init__(self, outbox, replies, logger=None):
+        super().__init__(transport=None, logger=logger)
+        self.outbox = outbox
+        self.replies = replies
+        self._futures = {}
+
+    @property
+    def pending(self):
+        return len(self._futures)
+
+    def send(self, message, race_control=False, priority=None):
+        future = Future()
+        message_id = next(self._sequence)
+        self._futures[message_id] = future
+        self.outbox.put(("chat", (message_id, message, race_control, priority)))
+        self.start()
+        return future
+
+    def stop(self, timeout=5):
+        super().stop(timeout)
+        while self._futures:
+            _, future = self._futures.popitem()
+            future.cancel()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                message_id, sent_at = self.replies.get(timeout=IDLE_SLICE)
+            except queue.Empty:
+                continue
+            future = self._futures.pop(message_id, None)
+            if future is None:
+                continue
+            if sent_at is None:
+                future.cancel()
+            elif future.set_running_or_notify_cancel():
+                future.set_result(sent_at)
+
+
+def run_worker(event_class, args, names, outbox, replies, shared):
+    """
+    Runs in the worker process: builds the event and runs it until it
+    finishes or is cancelled.
+
+    Args:
+        event_class (type): The event's class.
+        args (dict): The keyword arguments to build it with.
+        names (tuple): SharedTelemetryWriter.names.
+        outbox (multiprocessing.Queue): Chat, queue items, log records and key requests for the parent.
+        replies (multiprocessing.Queue): Chat results from the parent.
+        shared (dict): The cancel and busy events shared with the parent.
+    """
+    logger = logging.getLogger(f"worker.{event_class.__name__}")
+    logger.handlers = [logging.handlers.QueueHandler(_Channel(outbox, "log"))]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    set_logger(logger)
+
+    sdk = SharedTelemetrySDK(names, request_key=_Channel(outbox, "key").put)
+    hub = set_hub(TelemetryHub(sdk))
+    dispatcher = set_chat_dispatcher(RemoteChatDispatcher(outbox, replies))
+    hub.start()
+    try:
+        event = event_class(**args)
+        event.run(**shared, **{name: _Channel(outbox, name) for name in RELAYED_QUEUES})
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.exception(f"Error in worker for {event_class.__name__}: {e}")
+    finally:
+        dispatcher.stop()
+        hub.stop()
+        sdk.close()
+
+
+class EventWorker:
+    """
+    Runs one event in a process of its own.
+
+    The event is built in the worker from its class and arguments and reads
+    telemetry published by a SharedTelemetryWriter.  Its chat goes through the
+    parent's chat dispatcher, and what it puts on the audio, broadcast text
+    and chat consumer queues, and its log records, are relayed into the
+    parent's.  Events that read those queues must run in the parent.
+
+    Attributes:
+        event_class (type): The event's class.
+        args (dict): The keyword arguments to build it with.
+        process (multiprocessing.Process): The worker, once started.
+    """
+
+    def __init__(self, event_class, args, logger=None):
+        """
+        Initializes the EventWorker.
+
+        Args:
+            event_class (type): The event's class.  Must be importable, as the worker imports it.
+            args (dict): The keyword arguments to build it with.  Must be picklable.
+            logger (logging.Logger, optional): Logger the worker's records are handled by. Defaults to the global logger.
+        """
+        self.event_class = event_class
+        self.args = dict(args)
+        if logger is None:
+            from modules.logging_context import get_logger
+
+            logger = get_logger() or logging.getLogger(__name__)
+        self.logger = logger
+        self.process = None
+        self.writer = None
+        self.chat_dispatcher = None
+        self.queues = {}
+        self._outbox = None
+        self._replies = None
+        self._relay_thread = None
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, writer, chat_dispatcher, cancel_event, busy_event, **queues):
+        """
+        Starts the worker process, and the thread relaying what it sends back.
+
+        Args:
+            writer (SharedTelemetryWriter): Publishes the telemetry the event reads.
+            chat_dispatcher (ChatDispatcher): Sends the event's chat.
+            cancel_event (multiprocessing.Event): Event to signal cancellation.  Must come from get_worker_context().
+            busy_event (multiprocessing.Event): Event to signal busy state.  Must come from get_worker_context().
+            **queues: The parent's audio_queue, broadcast_text_queue and chat_consumer_queue.
+        """
+        context = get_worker_context()
+        self.writer = writer
+        self.chat_dispatcher = chat_dispatcher
+        self.queues = queues
+        self._outbox = context.Queue()
+        self._replies = context.Queue()
+        self.process = context.Process(
+            target=run_worker,
+            args=(
+                self.event_class,
+                self.args,
+                writer.names,
+                self._outbox,
+                self._replies,
+                {"cancel_event": cancel_event, "busy_event": busy_event},
+            ),
+            name=self.event_class.__name__,
+            daemon=True,
+        )
+        self.process.start()
+        self._relay_thread = threading.Thread(
+            target=self._relay, name=f"{self.event_class.__name__}Relay", daemon=True
+        )
+        self._relay_thread.start()
+
+    def stop(self, timeout=WORKER_STOP_TIMEOUT):
+        """
+        Waits for the worker to exit, terminating it if it doesn't.  The
+        cancel event should be set first.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to WORKER_STOP_TIMEOUT.
+        """
+        if self.process is not None:
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                name = self.event_class.__name__
+                self.logger.warning(f"Worker for {name} didn't stop, terminating it.")
+                self.process.terminate()
+                self.process.join(timeout=1)
+        if self._relay_thread is not None:
+            self._relay_thread.join(timeout=1)
+            self._relay_thread = None
+
+    def _relay(self):
+        while True:
+            try:
+                channel, payload = self._outbox.get(timeout=IDLE_SLICE)
+            except queue.Empty:
+                if not self.running:
+                    return
+                continue
+            try:
+                self._handle(channel, payload)
+            except Exception as e:
+                self.logger.error(f"Error relaying {channel} from worker: {e}")
+
+    def _handle(self, channel, payload):
+        if channel == "chat":
+            message_id, message, race_control, priority = payload
+            future = self.chat_dispatcher.send(
+                message, race_control=race_control, priority=priority
+            )
+            future.add_done_callback(lambda future: self._reply(message_id, future))
+        elif channel == "log":
+            self.logger.handle(payload)
+        elif channel == "key":
+            self.writer.request_key(payload)
+        else:
+            self.queues[channel].put(payload)
+
+    def _reply(self, message_id, future):
+        if future.cancelled() or future.exception() is not None:
+            sent_at = None
+        else:
+            sent_at = future.result()
+        try:
+            self._replies.put((message_id, sent_at))
+        except (OSError, ValueError):
+            pass  # The worker has exited.
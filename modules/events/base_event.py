@@ -1,12 +1,35 @@
+import asyncio
 import logging
+import math
 import queue
 import threading
 import time
 
 import irsdk
-import pyperclip
 import pywinauto
-from pandas import DataFrame, concat
+
+from modules.chat import (
+    ChatDispatcher,
+    ChatPriority,
+    ClipboardTransport,
+    get_or_create_chat_dispatcher,
+)
+from modules.event_runtime import run_in_thread
+from modules.telemetry import (
+    FieldClassification,
+    FieldSnapshot,
+    IncidentKind,
+    StepDelta,
+    TelemetryHub,
+    get_driver_directory,
+    get_incident_stream,
+    get_leader_lap,
+    get_or_create_hub,
+    get_pit_lane_tracker,
+    get_speed_estimator,
+    get_track_model,
+)
+from modules.trigger_scheduler import get_trigger_scheduler
 
 
 class IRSDK(irsdk.IRSDK):
@@ -21,6 +44,12 @@ class IRSDK(irsdk.IRSDK):
         return sorted(self._header.var_buf, key=lambda v: v.tick_count, reverse=True)[1]
 
 
+# iRacing publishes telemetry at 60 Hz.
+TICKS_PER_SECOND = 60
+# How long a tick wait blocks before rechecking cancellation if the sim stalls.
+TICK_WAIT_SLICE = 0.1
+
+
 class BaseEvent:
     """
     Base class for handling events in the iRacing simulator.
@@ -41,6 +70,10 @@ class BaseEvent:
     Flags = irsdk.Flags
     PaceFlags = irsdk.PaceFlags
 
+    # Events that can run as a coroutine on the EventRuntime define this as
+    # an async method.  Otherwise event_sequence runs on a thread of its own.
+    async_event_sequence = None
+
     def __init__(
         self,
         sdk=None,
@@ -57,7 +90,7 @@ class BaseEvent:
         Initializes the BaseEvent class.
 
         Args:
-            sdk (irsdk.IRSDK, optional): Instance of the iRacing SDK. Defaults to None.
+            sdk (irsdk.IRSDK, optional): Instance of the iRacing SDK. Defaults to None, which reads from the shared TelemetryHub.
             pwa (pywinauto.Application, optional): Instance of the pywinauto Application. Defaults to None.
             cancel_event (threading.Event, optional): Event to signal cancellation. Defaults to None.
             busy_event (threading.Event, optional): Event to signal busy state. Defaults to None.
@@ -67,12 +100,27 @@ class BaseEvent:
             chat_consumer_queue (queue.Queue, optional): Queue for chat messages directed to the player. Defaults to None.
             max_laps_behind_leader (int, optional): Maximum Laps Down for cars to be considered in the field. Defaults to 99.
         """
-        self.sdk = IRSDK() if sdk is None else sdk
-        if self.sdk:
+        if sdk is None:
+            # Every event shares one connection to the sim rather than mapping
+            # and parsing the telemetry buffers separately.
+            hub = get_or_create_hub(
+                lambda: TelemetryHub(IRSDK(), pwa or pywinauto.Application())
+            )
+            hub.connect()
+            self.sdk = hub.view()
+            self.pwa = hub.pwa
+            self._hub = hub
+        elif sdk:
+            self.sdk = sdk
             self.pwa = pwa or pywinauto.Application()
             self.sdk.shutdown()
             self.sdk.startup()
             self.pwa.connect(best_match="iRacing.com Simulator", timeout=10)
+            self._hub = None
+        else:
+            self.sdk = sdk
+            self._hub = None
+        self.chat_dispatcher = None
         self.thread = None
         self.killed = False
         self.task = None
@@ -108,10 +156,131 @@ class BaseEvent:
         Raises:
             KeyboardInterrupt: If the cancel_event is set.
         """
-        time.sleep(seconds)
+        if self.cancel_event.wait(seconds):
+            self.logger.info("Event cancelled.")
+            raise KeyboardInterrupt
+
+    def wait_for_next_tick(self, max_hz=None, timeout=None):
+        """
+        Blocks until the sim publishes a new SessionTick, then freezes the sdk on it.
+
+        The sim publishes 60 ticks a second.  With max_hz set, ticks are
+        decimated so the caller wakes at most max_hz times a second, e.g.
+        max_hz=10 returns once at least 6 ticks have passed since the last call.
+
+        Args:
+            max_hz (float, optional): Maximum number of wake-ups per second. Defaults to None, meaning every tick.
+            timeout (float, optional): Maximum seconds to wait. Defaults to None.
+
+        Returns:
+            int: The SessionTick the sdk is now frozen on.
+
+        Raises:
+            KeyboardInterrupt: If the cancel_event is set, as soon as it is set.
+        """
+        step = max(1, math.ceil(TICKS_PER_SECOND / max_hz)) if max_hz else 1
+        last_tick = getattr(self, "_last_waited_tick", None)
+        if last_tick is None:
+            last_tick = self.sdk["SessionTick"]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        hub = getattr(self.sdk, "hub", None)
+
+        while True:
+            if hub is not None and hub.running:
+                hub.wait_for_tick(
+                    after_tick=self.sdk.snapshot.tick,
+                    timeout=TICK_WAIT_SLICE,
+                    cancel_event=self.cancel_event,
+                )
+            tick = self._refreeze_for_tick(last_tick, step, deadline)
+            if tick is not None:
+                break
+            if hub is None or not hub.running:
+                self.cancel_event.wait(1 / TICKS_PER_SECOND)
+        self._last_waited_tick = tick
+        return tick
+
+    def _refreeze_for_tick(self, last_tick, step, deadline):
+        """
+        Freezes the sdk on its latest tick, returning the tick if the wait for
+        the next one is over, or None to keep waiting.
+        """
+        self.sdk.unfreeze_var_buffer_latest()
+        self.sdk.freeze_var_buffer_latest()
+        tick = self.sdk["SessionTick"]
         if self.cancel_event.is_set():
             self.logger.info("Event cancelled.")
             raise KeyboardInterrupt
+        # Ticks restart from zero when the session changes.
+        if tick >= last_tick + step or tick < last_tick:
+            return tick
+        if deadline is not None and time.monotonic() >= deadline:
+            return tick
+        return None
+
+    async def async_sleep(self, seconds):
+        """
+        Sleeps on the EventRuntime's loop for a specified number of seconds.
+
+        Args:
+            seconds (float): Number of seconds to sleep.
+
+        Raises:
+            asyncio.CancelledError: If the cancel_event is set.
+        """
+        if not self.cancel_event.is_set():
+            await asyncio.sleep(seconds)
+        if self.cancel_event.is_set():
+            self.logger.info("Event cancelled.")
+            raise asyncio.CancelledError
+
+    async def async_wait_for_next_tick(self, max_hz=None, timeout=None):
+        """
+        Waits on the EventRuntime's loop for a new SessionTick, then freezes
+        the sdk on it.
+
+        See wait_for_next_tick.
+
+        Args:
+            max_hz (float, optional): Maximum number of wake-ups per second. Defaults to None, meaning every tick.
+            timeout (float, optional): Maximum seconds to wait. Defaults to None.
+
+        Returns:
+            int: The SessionTick the sdk is now frozen on.
+
+        Raises:
+            asyncio.CancelledError: If the cancel_event is set.
+        """
+        step = max(1, math.ceil(TICKS_PER_SECOND / max_hz)) if max_hz else 1
+        last_tick = getattr(self, "_last_waited_tick", None)
+        if last_tick is None:
+            last_tick = self.sdk["SessionTick"]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while (tick := self._refreeze_for_tick(last_tick, step, deadline)) is None:
+                await asyncio.sleep(1 / TICKS_PER_SECOND)
+        except KeyboardInterrupt:
+            raise asyncio.CancelledError
+        self._last_waited_tick = tick
+        return tick
+
+    async def async_chat(self, message, race_control=False, priority=None):
+        """
+        Sends a chat message, and waits on the EventRuntime's loop until it
+        has been sent.
+
+        Args:
+            message (str): The message to send.
+            race_control (bool, optional): Whether to send the message to everyone as race control. Defaults to False.
+            priority (ChatPriority, optional): When to send the message. Defaults to the message's default priority.
+
+        Returns:
+            float: The time.monotonic() the message was sent at.
+        """
+        future = self._chat(message, race_control=race_control, priority=priority)
+        if future is None:
+            return None
+        return await asyncio.wrap_future(future)
 
     def run(
         self,
@@ -125,6 +294,59 @@ class BaseEvent:
         """
         Runs the event sequence.
 
+        Args:
+            cancel_event (threading.Event, optional): Event to signal cancellation. Defaults to None.
+            busy_event (threading.Event, optional): Event to signal busy state. Defaults to None.
+            chat_lock (threading.Lock, optional): Lock to ensure thread-safe access to chat method. Defaults to None.
+            audio_queue (queue.Queue, optional): Queue for audio commands. Defaults to None.
+            broadcast_text_queue (queue.Queue, optional): Queue for broadcast text messages. Defaults to None.
+            chat_consumer_queue (queue.Queue, optional): Queue for chat consumer messages. Defaults to None.
+        """
+        self.share(
+            cancel_event,
+            busy_event,
+            chat_lock,
+            audio_queue,
+            broadcast_text_queue,
+            chat_consumer_queue,
+        )
+        try:
+            self.event_sequence()
+        except Exception as e:
+            self.logger.exception("Error in event sequence.")
+            self.logger.exception(e)
+
+    async def run_async(self, **kwargs):
+        """
+        Runs the event on the EventRuntime's loop.
+
+        Events with an async_event_sequence run it as a coroutine.  Anything
+        else, including events that override run, runs run on a thread of its own.
+
+        Args:
+            **kwargs: The shared objects run takes.
+        """
+        if type(self).run is not BaseEvent.run or self.async_event_sequence is None:
+            return await run_in_thread(self.run, **kwargs)
+        self.share(**kwargs)
+        try:
+            await self.async_event_sequence()
+        except Exception as e:
+            self.logger.exception("Error in event sequence.")
+            self.logger.exception(e)
+
+    def share(
+        self,
+        cancel_event=None,
+        busy_event=None,
+        chat_lock=None,
+        audio_queue=None,
+        broadcast_text_queue=None,
+        chat_consumer_queue=None,
+    ):
+        """
+        Uses the given session-wide objects in place of the event's own.
+
         Args:
             cancel_event (threading.Event, optional): Event to signal cancellation. Defaults to None.
             busy_event (threading.Event, optional): Event to signal busy state. Defaults to None.
@@ -139,11 +361,6 @@ class BaseEvent:
         self.audio_queue = audio_queue or self.audio_queue
         self.broadcast_text_queue = broadcast_text_queue or self.broadcast_text_queue
         self.chat_consumer_queue = chat_consumer_queue or self.chat_consumer_queue
-        try:
-            self.event_sequence()
-        except Exception as e:
-            self.logger.exception("Error in event sequence.")
-            self.logger.exception(e)
 
     def event_sequence(self):
         """
@@ -162,10 +379,12 @@ class BaseEvent:
         """
         raise NotImplementedError
 
-    def _chat(self, message, race_control=False):
+    def _chat(self, message, race_control=False, priority=None):
         """
-        Sends a chat message in the iRacing simulator.
-        Uses chat_lock to ensure thread-safe access to the chat functionality.
+        Queues a chat message to be sent in the iRacing simulator.
+
+        Messages are sent by the chat dispatcher, one at a time in priority
+        order, so the calling thread doesn't wait for the keystrokes.
 
         Also checks if the message is a DM to the player car (e.g., /123, #123, @123)
         and if so, places it on the chat consumer queue for display in the UI.
@@ -173,6 +392,11 @@ class BaseEvent:
         Args:
             message (str): The message to send.
             race_control (bool, optional): Whether the message is from race control. Defaults to False.
+            priority (ChatPriority, optional): When to send the message relative to others.
+                Defaults to commands first, then everything else.
+
+        Returns:
+            Future: Resolves when the message has been sent.
         """
         # Check if this is a DM to the player car
         import re
@@ -180,12 +404,9 @@ class BaseEvent:
         try:
             # Get player car number
             player_car_idx = self.sdk["PlayerCarIdx"]
-            driver = [
-                d
-                for d in self.sdk["DriverInfo"]["Drivers"]
-                if d["CarIdx"] == player_car_idx
-            ][0]
-            player_car_number = str(driver["CarNumber"])
+            player_car_number = str(
+                self.get_driver_directory().car_number(player_car_idx)
+            )
 
             # Check if message starts with /123, #123, or @123 (where 123 is the player car number)
             dm_pattern = rf"^[/@#]{player_car_number}\s+(.+)$"
@@ -203,31 +424,33 @@ class BaseEvent:
             # If anything goes wrong with DM detection, just log and continue
             self.logger.debug(f"Error checking for player DM: {e}")
 
-        # Acquire the lock - this will block if another thread holds it
-        while not self.chat_lock.acquire(blocking=False):
-            self.sleep(0.1)
-        try:
-            while self.sdk["IsGarageVisible"]:
-                self.sleep(1)
-            if race_control:
-                message = f"/all {message}"
-            pyperclip.copy(message)
-            self.logger.debug(f"Sending chat message: {message}")
-            self.sdk.chat_command(3)
-            self.sleep(0.1)
-            self.sdk.chat_command(1)
-            keys = ["^v"]
-            try:
-                self.pwa["iRacing.com Simulator"].type_keys("".join(keys))
-            except Exception as e:
-                self.logger.critical("Error sending chat message.")
-                self.logger.critical(e)
+        return self.get_chat_dispatcher().send(
+            message, race_control=race_control, priority=priority
+        )
+
+    def get_chat_dispatcher(self):
+        """
+        Gets the dispatcher that sends this event's chat messages.
+
+        Events reading from the shared telemetry hub share one dispatcher;
+        an event given its own sdk gets its own.
+
+        Returns:
+            ChatDispatcher: The dispatcher.
+        """
+        if self.chat_dispatcher is None:
+            if self._hub is not None:
+                hub = self._hub
+                self.chat_dispatcher = get_or_create_chat_dispatcher(
+                    lambda: ChatDispatcher(
+                        ClipboardTransport(hub.view(), hub.pwa), lock=self.chat_lock
+                    )
+                )
             else:
-                self.pwa["iRacing.com Simulator"].type_keys("{ENTER}")
-            self.sleep(0.1)
-        finally:
-            # Always release the lock, even if an error occurred
-            self.chat_lock.release()
+                self.chat_dispatcher = ChatDispatcher(
+                    ClipboardTransport(self.sdk, self.pwa), lock=self.chat_lock
+                )
+        return self.chat_dispatcher
 
     def wave_and_eol(self, car):
         """
@@ -236,8 +459,7 @@ class BaseEvent:
         Args:
             car (int): The car index.
         """
-        driver = [d for d in self.sdk["DriverInfo"]["Drivers"] if d["CarIdx"] == car][0]
-        car_number = driver["CarNumber"]
+        car_number = self.get_driver_directory().car_number(car)
         self.logger.info(f"Waving around car {car_number}")
         self._chat(f"!w {car_number}")
         self._chat(f"!eol {car_number}")
@@ -294,11 +516,10 @@ class BaseEvent:
         Returns:
             list: List of drivers on the pit lane.
         """
+        directory = self.get_driver_directory()
         return [
-            driver
-            for driver in self.sdk["DriverInfo"]["Drivers"]
-            if driver["CarIsPaceCar"] != 1
-            and self.sdk["CarIdxOnPitRoad"][driver["CarIdx"]]
+            directory.by_car_idx(car_idx)
+            for car_idx in self.get_field_classification().on_pit_road.tolist()
         ]
 
     def get_lap_down_cars(self):
@@ -308,24 +529,91 @@ class BaseEvent:
         Returns:
             list: List of car indices that are a lap down.
         """
-        laps_completed = self.sdk["CarIdxLapCompleted"]
-        partial_laps = self.sdk["CarIdxLapDistPct"]
-        distance_covered = [
-            laps_completed[i] + partial_laps[i] for i in range(len(laps_completed))
-        ]
-        max_distance_covered = max(distance_covered)
-        return sorted(
-            [
-                driver["CarIdx"]
-                for driver in self.sdk["DriverInfo"]["Drivers"]
-                if driver["CarIsPaceCar"] != 1
-                and max_distance_covered - 1
-                >= distance_covered[driver["CarIdx"]]
-                >= max_distance_covered - self.max_laps_behind_leader - 1
-            ],
-            key=lambda x: laps_completed[x] + partial_laps[x],
-            reverse=True,
-        )
+        classification = self.get_field_classification()
+        return classification.lapped(self.max_laps_behind_leader).tolist()
+
+    def get_driver_directory(self):
+        """
+        Gets the DriverDirectory for the current DriverInfo.
+
+        Returns:
+            DriverDirectory: O(1) driver lookups, rebuilt only when DriverInfo changes.
+        """
+        return get_driver_directory(self.sdk)
+
+    def get_incident_stream(self):
+        """
+        Gets the IncidentStream shared by every event reading the same telemetry.
+
+        Returns:
+            IncidentStream: Per-car incident changes, computed once per tick.
+        """
+        return get_incident_stream(self.sdk)
+
+    def get_trigger_scheduler(self):
+        """
+        Gets the TriggerScheduler shared by every event reading the telemetry hub.
+
+        Returns:
+            TriggerScheduler: The scheduler, or None for an event given its own sdk.
+        """
+        if getattr(self, "_hub", None) is None:
+            return None
+        return get_trigger_scheduler(self._hub)
+
+    def get_field_snapshot(self):
+        """
+        Gets the FieldSnapshot for the current telemetry tick.
+
+        Snapshots are shared through the telemetry hub when there is one, and
+        otherwise cached until SessionTick changes.
+
+        Returns:
+            FieldSnapshot: The field as NumPy arrays for the current tick.
+        """
+        snapshot = getattr(self.sdk, "snapshot", None)
+        if snapshot is not None:
+            return snapshot.memo(
+                FieldSnapshot, lambda: FieldSnapshot(snapshot, snapshot.tick)
+            )
+        try:
+            tick = self.sdk["SessionTick"]
+        except KeyError:
+            return FieldSnapshot(self.sdk)
+        field = getattr(self, "_field_snapshot", None)
+        if field is None or field.tick != tick:
+            field = self._field_snapshot = FieldSnapshot(self.sdk, tick)
+        return field
+
+    def get_leader_lap(self):
+        """
+        Gets how far round the race the leader is, in laps.
+
+        Returns:
+            float: The leader's completed laps plus their distance round the current one.
+        """
+        return get_leader_lap(self.sdk)
+
+    def get_field_classification(self):
+        """
+        Gets the FieldClassification for the current telemetry tick.
+
+        Shared through the telemetry hub like the FieldSnapshot it is built
+        from, and otherwise rebuilt when the FieldSnapshot is.
+
+        Returns:
+            FieldClassification: Lapped and pit road cars for the current tick.
+        """
+        field = self.get_field_snapshot()
+        snapshot = getattr(self.sdk, "snapshot", None)
+        if snapshot is not None:
+            return snapshot.memo(
+                FieldClassification, lambda: FieldClassification(field)
+            )
+        classification = getattr(self, "_field_classification", None)
+        if classification is None or classification.field is not field:
+            classification = self._field_classification = FieldClassification(field)
+        return classification
 
     def get_current_running_order(self):
         """
@@ -334,28 +622,7 @@ class BaseEvent:
         Returns:
             list: List of dictionaries representing the running order.
         """
-        running_order = [
-            {
-                "CarIdx": car["CarIdx"],
-                "CarNumber": car["CarNumber"],
-                "LapCompleted": self.sdk["CarIdxLapCompleted"][car["CarIdx"]],
-                "LapDistPct": self.sdk["CarIdxLapDistPct"][car["CarIdx"]],
-                "InPits": self.sdk["CarIdxOnPitRoad"][car["CarIdx"]],
-                "total_completed": self.sdk["CarIdxLapCompleted"][car["CarIdx"]]
-                + self.sdk["CarIdxLapDistPct"][car["CarIdx"]],
-                "last_lap_time": self.sdk["CarIdxLastLapTime"][car["CarIdx"]],
-                "f2time": self.sdk["CarIdxF2Time"][car["CarIdx"]],
-            }
-            for car in self.sdk["DriverInfo"]["Drivers"]
-            if car["CarIsPaceCar"] != 1
-        ]
-        running_order.sort(key=lambda x: x["total_completed"], reverse=True)
-        return [
-            runner
-            for runner in running_order
-            if runner["total_completed"]
-            >= (running_order[0]["total_completed"] - self.max_laps_behind_leader - 1)
-        ]
+        return self.get_field_snapshot().running_order(self.max_laps_behind_leader)
 
     def get_leader(self):
         """
@@ -364,29 +631,73 @@ class BaseEvent:
         Returns:
             int: Car index of the leader.
         """
-        return self.get_current_running_order()[0]["CarIdx"]
+        return self.get_field_snapshot().leader
+
+    def get_pit_lane_tracker(self):
+        """
+        Gets the PitLaneTracker shared by every event reading the same telemetry.
+
+        Returns:
+            PitLaneTracker: The cars on pit road, kept from CarIdxOnPitRoad transitions.
+        """
+        return get_pit_lane_tracker(self.sdk)
+
+    def is_pit_lane_clear(self):
+        """
+        Checks whether pit lane is clear of cars close enough to the leader to matter.
+
+        Returns:
+            bool: True if pit lane is clear.
+        """
+        tracker = self.get_pit_lane_tracker().update(self.sdk)
+        return tracker.is_clear(self.sdk, self.max_laps_behind_leader)
 
     def wait_for_cars_to_clear_pit_lane(self, max_time=300):
         """
         Waits for cars to clear the pit lane.
+
+        Checks on every tick, so the wait ends on the tick the last car leaves
+        pit road.
+
+        Args:
+            max_time (int, optional): Maximum session seconds to wait. Defaults to 300.
+
+        Returns:
+            bool: True if pit lane cleared, False if max_time ran out first.
         """
         max_time = int(max_time)
         end_time = self.sdk["SessionTimeRemain"] - max_time
         self.logger.debug(
             f"Waiting for cars to clear pit lane with a maximum of {max_time} seconds."
         )
-        while (
-            any(
-                self.sdk["CarIdxLapCompleted"][car["CarIdx"]]
-                >= max(self.sdk["CarIdxLapCompleted"]) - self.max_laps_behind_leader
-                for car in self.get_cars_on_pit_lane()
-            )
-            and self.sdk["SessionTimeRemain"] > end_time
-        ):
-            self.sleep(1)
+        while not (cleared := self.is_pit_lane_clear()):
+            if self.sdk["SessionTimeRemain"] <= end_time:
+                break
+            self.wait_for_next_tick()
         self.logger.debug(
             f"Finished waiting for cars to clear pit lane after {end_time + max_time - self.sdk['SessionTimeRemain']} seconds."
         )
+        return cleared
+
+    async def async_wait_for_cars_to_clear_pit_lane(self, max_time=300):
+        """
+        Waits on the EventRuntime's loop for cars to clear the pit lane.
+
+        See wait_for_cars_to_clear_pit_lane.
+
+        Args:
+            max_time (int, optional): Maximum session seconds to wait. Defaults to 300.
+
+        Returns:
+            bool: True if pit lane cleared, False if max_time ran out first.
+        """
+        max_time = int(max_time)
+        end_time = self.sdk["SessionTimeRemain"] - max_time
+        while not (cleared := self.is_pit_lane_clear()):
+            if self.sdk["SessionTimeRemain"] <= end_time:
+                break
+            await self.async_wait_for_next_tick()
+        return cleared
 
     def get_wave_around_cars(self):
         """
@@ -395,12 +706,10 @@ class BaseEvent:
         Returns:
             list: List of car indices eligible for wave around.
         """
-        lap_down_cars = [
-            car
-            for car in self.get_lap_down_cars()
-            if self.sdk["CarIdxLapCompleted"][car]
-            >= max(self.sdk["CarIdxLapCompleted"]) - self.max_laps_behind_leader
-        ]
+        classification = self.get_field_classification()
+        lap_down_cars = classification.wave_arounds(
+            self.max_laps_behind_leader
+        ).tolist()
         self.logger.debug(f"Lap down cars: {lap_down_cars}")
         return lap_down_cars
 
@@ -423,6 +732,38 @@ class BaseEvent:
             ]
         )
 
+    def step_delta(self, last_step, this_step):
+        """
+        Gets the StepDelta between two steps.
+
+        The delta is cached for the most recent pair of steps, so calling this
+        (or any car_has_* method) once per car is O(1) after the first call.
+
+        Args:
+            last_step (FieldSnapshot | list): The running order of the last step in time.
+            this_step (FieldSnapshot | list): The running order of the current step in time.
+
+        Returns:
+            StepDelta: The transitions between the two steps.
+        """
+        cached = getattr(self, "_step_delta", None)
+        if cached is None or cached[0] is not last_step or cached[1] is not this_step:
+            cached = self._step_delta = (
+                last_step,
+                this_step,
+                StepDelta(last_step, this_step),
+            )
+        return cached[2]
+
+    def _car_has(self, transition, car, last_step, this_step):
+        delta = self.step_delta(last_step, this_step)
+        if car["CarIdx"] not in delta.present:
+            self.logger.error(
+                f"Car {car.get('CarNumber', car['CarIdx'])} not found in running order."
+            )
+            return False
+        return car["CarIdx"] in getattr(delta, transition)
+
     def car_has_new_last_lap_time(self, car, last_step, this_step):
         """
         Checks if a car has a new lap time.
@@ -435,20 +776,7 @@ class BaseEvent:
         Returns:
             bool: True if the car has a new lap time, False otherwise.
         """
-        try:
-            last_step_record = [
-                record for record in last_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            this_step_record = [
-                record for record in this_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            return (
-                this_step_record["last_lap_time"] != last_step_record["last_lap_time"]
-            )
-        except IndexError as e:
-            self.logger.error(f"Car {car['CarNumber']} not found in running order.")
-            self.logger.error(e)
-            return False
+        return self._car_has("new_lap_time", car, last_step, this_step)
 
     def car_has_completed_lap(self, car, last_step, this_step):
         """
@@ -462,20 +790,7 @@ class BaseEvent:
         Returns:
             bool: True if the car has completed their lap in the last step, False otherwise.
         """
-        try:
-            last_step_record = [
-                record for record in last_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            this_step_record = [
-                record for record in this_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            return (
-                this_step_record["LapCompleted"] == last_step_record["LapCompleted"] + 1
-            )
-        except IndexError as e:
-            self.logger.error(f"Car {car['CarNumber']} not found in running order.")
-            self.logger.error(e)
-            return False
+        return self._car_has("completed_lap", car, last_step, this_step)
 
     def car_has_left_pits(self, car, last_step, this_step):
         """
@@ -489,23 +804,7 @@ class BaseEvent:
         Returns:
             bool: True if the car has left the pits in the last step, False otherwise.
         """
-        try:
-            last_step_record = [
-                record for record in last_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            this_step_record = [
-                record for record in this_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            return (
-                this_step_record["InPits"] == 0
-                and last_step_record["InPits"] == 1
-                and last_step_record["LapCompleted"] > 0
-                and this_step_record["LapCompleted"] > 0
-            )
-        except IndexError as e:
-            self.logger.error(f"Car {car['CarNumber']} not found in running order.")
-            self.logger.error(e)
-            return False
+        return self._car_has("left_pits", car, last_step, this_step)
 
     def car_has_entered_pits(self, car, last_step, this_step):
         """
@@ -519,63 +818,26 @@ class BaseEvent:
         Returns:
             bool: True if the car has entered the pits in the last step, False otherwise.
         """
-        try:
-            last_step_record = [
-                record for record in last_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            this_step_record = [
-                record for record in this_step if record["CarIdx"] == car["CarIdx"]
-            ][0]
-            return (
-                this_step_record["InPits"] == 1
-                and last_step_record["InPits"] == 0
-                and last_step_record["LapCompleted"] > 0
-                and this_step_record["LapCompleted"] > 0
-            ) or (
-                this_step_record["InPits"] == 1 and last_step_record["LapDistPct"] < 0
-            )
-        except IndexError as e:
-            self.logger.error(f"Car {car['CarNumber']} not found in running order.")
-            self.logger.error(e)
-            return False
+        return self._car_has("entered_pits", car, last_step, this_step)
 
-    def monitor_speed(self, carIdx):
+    def get_track_model(self):
         """
-        Yields the speed of a car.
+        Gets the TrackModel shared by every event reading the same telemetry.
 
-        Args:
-            carIdx (int): The car index to monitor.
-        """
-        carIdx = int(carIdx)
-        speeds = {
-            "speed": 0,
-            "last_location": self.sdk["CarIdxLapDistPct"][carIdx],
-            "last_time": self.sdk["SessionTime"],
-        }
-        while True:
-            next_speed = 0
-            try:
-                distance_in_lap = (
-                    1 + self.sdk["CarIdxLapDistPct"][carIdx] - speeds["last_location"]
-                ) % 1
-                time_elapsed = self.sdk["SessionTime"] - speeds["last_time"]
-                km_per_lap = float(
-                    str(self.sdk["WeekendInfo"]["TrackLength"]).replace(" km", "")
-                )
-                seconds_per_hour = 3600
-                speed = distance_in_lap / time_elapsed * km_per_lap * seconds_per_hour
-                speeds = {
-                    "speed": speed,
-                    "last_location": self.sdk["CarIdxLapDistPct"][carIdx],
-                    "last_time": self.sdk["SessionTime"],
-                }
-                next_speed = speeds["speed"]
-            except ZeroDivisionError:
-                self.logger.error("Zero division error in speed calculation.")
-            except Exception as e:
-                self.logger.error("Error in speed calculation.")
-                self.logger.error(e)
-            yield next_speed
+        Returns:
+            TrackModel: The track's length and sectors, for the current session.
+        """
+        return get_track_model(self.sdk)
+
+    def get_speed_estimator(self):
+        """
+        Gets the SpeedEstimator shared by every event reading the same
+        telemetry, updated to the current tick.
+
+        Returns:
+            SpeedEstimator: Every car's smoothed speed and acceleration.
+        """
+        return get_speed_estimator(self.sdk).update(self.sdk)
 
     def multi_lane_restart(
         self,
@@ -599,45 +861,58 @@ class BaseEvent:
                     message += f" behind the #{car_ahead}"
                 self._chat(message)
 
-        # make sure everyone stays in position
+        # make sure everyone stays in position, checking once per tick
         last_reminder = self.sdk["SessionTime"]
         last_longer_reminder = self.sdk["SessionTime"]
         while not restart_flag.is_set():
+            self.wait_for_next_tick(max_hz=10)
             out_of_position = []
-            current_order = [c["CarNumber"] for c in self.get_current_running_order()]
+            field = self.get_field_snapshot()
+            position = {
+                field.car_numbers[car_idx]: i
+                for i, car_idx in enumerate(
+                    field.in_field(self.max_laps_behind_leader).tolist()
+                )
+            }
             for i, lane in enumerate(lane_order):
-                for car in lane:
+                for n, car in enumerate(lane):
+                    if car not in position:
+                        continue
                     cars_incorrectly_behind = [
                         c
-                        for c in current_order[current_order.index(car) :]  # is behind
-                        if c in lane[: lane.index(car)]  # should be in front
+                        for c in lane[:n]  # should be in front
+                        if position.get(c, -1) > position[car]  # is behind
                     ]
                     if cars_incorrectly_behind:
                         out_of_position.append((car, cars_incorrectly_behind))
 
             if self.sdk["SessionTime"] - last_reminder > reminder_frequency:
                 for car, cars in out_of_position:
-                    self._chat(f"/{car} let the #{', '.join(cars)} by.")
+                    self._chat(
+                        f"/{car} let the #{', '.join(cars)} by.",
+                        priority=ChatPriority.REMINDER,
+                    )
                     for c in cars:
-                        self._chat(f"/{c} pass the #{car}.")
+                        self._chat(
+                            f"/{c} pass the #{car}.", priority=ChatPriority.REMINDER
+                        )
                 last_reminder = self.sdk["SessionTime"]
 
             if self.sdk["SessionTime"] - last_longer_reminder > reminder_frequency * 3:
                 # remind cars what lane they're in
                 for i, lane in enumerate(lane_order):
                     for car in lane:
-                        self._chat(f"/{car} {str(lane_names[i]).upper()} lane.")
+                        self._chat(
+                            f"/{car} {str(lane_names[i]).upper()} lane.",
+                            priority=ChatPriority.REMINDER,
+                        )
                 last_longer_reminder = self.sdk["SessionTime"]
 
         return lane_order
 
     def get_car_class(self, carIdx=None, car_number=None):
         if carIdx is None:
-            carIdx = [
-                car["CarIdx"]
-                for car in self.sdk["DriverInfo"]["Drivers"]
-                if car["CarNumber"] == car_number
-            ][0]
+            carIdx = self.get_driver_directory().car_idx(car_number)
         car_class = self.sdk["CarIdxClass"][carIdx]
         return car_class
 
@@ -665,107 +940,30 @@ class BaseEvent:
                 yield False
 
     def driver_4x_generator(self, window: int = 10):
-        # Initialize tracking variables
-        driver_incidents_df = DataFrame(
-            data=[], columns=["timestamp", "car_number", "incidents"]
-        )
-
-        this_step = self.get_current_running_order()
-        cars_taken_checkers = []
-        while True:
-            y = []
-            # Freeze the SDK buffer to get a consistent view of the data
-            self.sdk.freeze_var_buffer_latest()
-            last_step = this_step
-            this_step = self.get_current_running_order()
-
-            # Get current timestamp
-            current_time = time.time()
-
-            # The SDK allows dictionary-like access
-            driver_info = self.sdk["DriverInfo"]
-            drivers = driver_info["Drivers"]
-
-            # Process each driver
-            for driver in drivers:
-                if self.sdk["SessionState"] == 5:
-                    c = [c for c in this_step if c["CarNumber"] == driver["CarNumber"]]
-                    if c:
-                        c = c[0]
-                        if (
-                            self.car_has_completed_lap(c, last_step, this_step)
-                            and driver["CarNumber"] not in cars_taken_checkers
-                        ):
-                            self.logger.debug(
-                                f"Car {driver['CarNumber']} Checkered Flag"
-                            )
-                            cars_taken_checkers.append(driver["CarNumber"])
-                        if driver["CarNumber"] in cars_taken_checkers:
-                            continue
-
-                car_number = driver["CarNumber"]
-                incident_count = driver["TeamIncidentCount"]
-
-                # Add the current incident count to the dataframe
-                new_row = DataFrame(
-                    {
-                        "timestamp": [current_time],
-                        "car_number": [car_number],
-                        "incidents": [incident_count],
-                    }
-                )
-                # Append to dataframe (using pandas v1.x style)
-                driver_incidents_df = concat(
-                    [driver_incidents_df, new_row], ignore_index=True
-                )
-
-            # Remove old data outside the tracking window
-            cutoff_time = current_time - window
-            driver_incidents_df = driver_incidents_df[
-                driver_incidents_df["timestamp"] >= cutoff_time
-            ]
-
-            # Process the data for collisions
-            # Get unique car numbers in the current data
-            car_numbers = list(set(driver_incidents_df["car_number"]))
-
-            for car_number in car_numbers:
-                # Get incidents for this car within the tracking window
-                car_data = driver_incidents_df[
-                    driver_incidents_df["car_number"] == car_number
-                ]
-
-                if len(car_data) < 2:
-                    continue  # Need at least two data points to check for a spread
-
-                # Calculate the incident spread
-                min_incidents = car_data["incidents"].min()
-                max_incidents = car_data["incidents"].max()
-                incident_spread = max_incidents - min_incidents
-
-                # If the spread exceeds the threshold, count it as a collision
-                if incident_spread >= 4:
-                    # Clear the data for this car to prevent counting the same collision multiple times
-                    driver_incidents_df = driver_incidents_df[
-                        driver_incidents_df["car_number"] != car_number
-                    ]
-                    car_record = next(
-                        d
-                        for d in self.sdk["DriverInfo"]["Drivers"]
-                        if d["CarNumber"] == car_number
-                    )
-                    car_idx = car_record["CarIdx"]
+        # Collisions come from the shared incident stream, so every incident
+        # rule reads the incident counts once between them.
+        subscription = self.get_incident_stream().subscribe(collision_window=window)
+        try:
+            while True:
+                # Freeze the SDK buffer to get a consistent view of the data
+                self.sdk.freeze_var_buffer_latest()
+                y = []
+                for incident in subscription.poll(self.sdk):
+                    if incident.kind is not IncidentKind.COLLISION:
+                        continue
+                    car_idx = incident.car_idx
                     laps_complete = (
                         self.sdk["CarIdxLapCompleted"][car_idx]
                         + self.sdk["CarIdxLapDistPct"][car_idx]
                     )
                     # Log the collision
                     self.logger.info(
-                        f"Collision detected for car #{car_number} with {laps_complete} laps completed."
+                        f"Collision detected for car #{incident.car_number} with {laps_complete} laps completed."
                     )
+                    y.append(incident.car_number)
 
-                    y.append(car_number)
-
-            # Release the SDK buffer
-            self.sdk.unfreeze_var_buffer_latest()
-            yield y
+                # Release the SDK buffer
+                self.sdk.unfreeze_var_buffer_latest()
+                yield y
+        finally:
+            subscription.close()
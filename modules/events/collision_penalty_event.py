@@ -1,4 +1,4 @@
-from modules.events import IRSDK, BaseEvent
+from modules.events import BaseEvent
 
 
 class CollisionPenaltyEvent(BaseEvent):
@@ -36,7 +36,7 @@ class CollisionPenaltyEvent(BaseEvent):
         self.driver_collision_counts = {}
 
         super().__init__(
-            sdk=sdk or IRSDK(),
+            sdk=sdk,
             pwa=pwa,
             max_laps_behind_leader=max_laps_behind_leader,
         )
@@ -199,7 +199,7 @@ class F1QualifyingEvent(BaseEvent):
         # Update the dataframe representation of the leaderboard
         self.leaderboard_df = DataFrame(self.leaderboard)
         driver_names = {
-            c["CarNumber"]: c["UserName"] for c in self.sdk["DriverInfo"]["Drivers"]
+            c["CarNumber"]: c["UserName"] for c in self.get_driver_directory().drivers
         }
         self.leaderboard_df["Driver"] = self.leaderboard_df.index.map(driver_names)
         # sort df columns
@@ -264,12 +264,10 @@ class F1QualifyingEvent(BaseEvent):
                 out_of_time = True
 
             # Process lap times for each car
+            delta = self.step_delta(last_step, this_step)
+            drivers = self.get_driver_directory()
             for car in this_step:
-                driver_info_record = [
-                    c
-                    for c in self.sdk["DriverInfo"]["Drivers"]
-                    if c["CarNumber"] == car["CarNumber"]
-                ]
+                driver_info_record = drivers.by_car_number(car["CarNumber"])
 
                 # Only process eligible cars (either all cars or the subset for this session)
                 is_eligible = (
@@ -278,12 +276,12 @@ class F1QualifyingEvent(BaseEvent):
 
                 if driver_info_record and is_eligible:
                     if (
-                        self.car_has_new_last_lap_time(car, last_step, this_step)
+                        car["CarIdx"] in delta.new_lap_time
                         and not self.sdk["CarIdxOnPitRoad"][
-                            driver_info_record[0]["CarIdx"]
+                            driver_info_record["CarIdx"]
                         ]
                     ):
-                        car_idx = driver_info_record[0]["CarIdx"]
+                        car_idx = driver_info_record["CarIdx"]
                         last_lap = self.sdk["CarIdxLastLapTime"][car_idx]
                         fastest_laps = self.apply_new_laptime(
                             fastest_laps, car["CarNumber"], last_lap
@@ -335,14 +333,12 @@ class F1QualifyingEvent(BaseEvent):
 
             last_step = this_step
             this_step = self.get_current_running_order()
+            delta = self.step_delta(last_step, this_step)
+            drivers = self.get_driver_directory()
 
             for car in this_step:
                 if car["CarNumber"] in remaining_cars:
-                    driver_info_record = [
-                        c
-                        for c in self.sdk["DriverInfo"]["Drivers"]
-                        if c["CarNumber"] == car["CarNumber"]
-                    ]
+                    driver_info_record = drivers.by_car_number(car["CarNumber"])
 
                     is_eligible = (
                         car["CarNumber"] in subset_of_drivers
@@ -352,13 +348,11 @@ class F1QualifyingEvent(BaseEvent):
 
                     if driver_info_record and is_eligible:
                         # Check if car has completed a lap
-                        if self.car_has_completed_lap(car, last_step, this_step):
+                        if car["CarIdx"] in delta.completed_lap:
                             if (
-                                not self.car_has_new_last_lap_time(
-                                    car, last_step, this_step
-                                )
+                                car["CarIdx"] not in delta.new_lap_time
                                 and not self.sdk["CarIdxOnPitRoad"][
-                                    driver_info_record[0]["CarIdx"]
+                                    driver_info_record["CarIdx"]
                                 ]
                             ):
                                 # The last lap data might be a bit late
@@ -399,7 +393,7 @@ class F1QualifyingEvent(BaseEvent):
                                         f"/{car['CarNumber']} Checkered Flag, please return to the pits."
                                     )
                             else:
-                                car_idx = driver_info_record[0]["CarIdx"]
+                                car_idx = driver_info_record["CarIdx"]
                                 last_lap = self.sdk["CarIdxLastLapTime"][car_idx]
                                 fastest_laps = self.apply_new_laptime(
                                     fastest_laps, car["CarNumber"], last_lap
@@ -419,7 +413,7 @@ class F1QualifyingEvent(BaseEvent):
                             continue
 
                         # Check if car has returned to pits
-                        carIdx = driver_info_record[0]["CarIdx"]
+                        carIdx = driver_info_record["CarIdx"]
                         if self.sdk["CarIdxOnPitRoad"][carIdx] == 1:
                             remaining_cars.remove(car["CarNumber"])
                             self._chat(f"/{car['CarNumber']} Checkered Flag.")
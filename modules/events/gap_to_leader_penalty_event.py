@@ -63,4 +63,4 @@ class GapToLeaderPenaltyEvent(BaseEvent):
                 self.audio_queue.put("pacer2") if self.sound else None
                 next_tone = None
 
-            self.sleep(0.1)
+            self.wait_for_next_tick(max_hz=10)
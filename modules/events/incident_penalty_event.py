@@ -1,4 +1,5 @@
 from modules.events import BaseEvent
+from modules.telemetry import IncidentKind
 
 
 class IncidentPenaltyEvent(BaseEvent):
@@ -15,6 +16,8 @@ class IncidentPenaltyEvent(BaseEvent):
         recurring_penalty: str = "",
         end_recurring_penalty: str = "",
         sound: bool = True,
+        sdk=None,
+        pwa=None,
     ):
         self.initial_penalty = initial_penalty
         self.recurring_penalty = recurring_penalty
@@ -33,99 +36,76 @@ class IncidentPenaltyEvent(BaseEvent):
             raise ValueError("You must set the initial penalty")
         if self.recurring_penalty_incidents and not self.recurring_penalty:
             raise ValueError("You must set the recurring penalty")
-        super().__init__()
+        super().__init__(sdk=sdk, pwa=pwa)
 
     def event_sequence(self):
         """
         Applies penalties to any driver who has more than the specified number of incidents.
-        """
-        self.sdk.freeze_var_buffer_latest()
-        this_step = self.sdk["DriverInfo"]["Drivers"]
-        this_driver_positions = self.get_current_running_order()
-        cars_taken_checkers = []
-        while True:
-            self.sdk.freeze_var_buffer_latest()
-            last_step = this_step
-            this_step = self.sdk["DriverInfo"]["Drivers"]
-            last_driver_positions = this_driver_positions
-            this_driver_positions = self.get_current_running_order()
-            for car in this_step:
-                try:
-                    if self.sdk["SessionState"] == 5:
-                        c = [
-                            c
-                            for c in this_driver_positions
-                            if c["CarNumber"] == car["CarNumber"]
-                        ]
-                        if c:
-                            c = c[0]
-                            if (
-                                self.car_has_completed_lap(
-                                    c, last_driver_positions, this_driver_positions
-                                )
-                                and car["CarNumber"] not in cars_taken_checkers
-                            ):
-                                self.logger.debug(
-                                    f"Car {car['CarNumber']} Checkered Flag"
-                                )
-                                cars_taken_checkers.append(car["CarNumber"])
-                            if car["CarNumber"] in cars_taken_checkers:
-                                continue
-                except Exception as e:
-                    self.logger.exception(f"Error in post race detection: {e}")
 
-                car_no = car["CarNumber"]
-                try:
-                    prev_inc = [x for x in last_step if x["CarNumber"] == car_no][0][
-                        "TeamIncidentCount"
-                    ]
-                except IndexError:
-                    self.logger.debug(f"Car {car_no} not found in last step")
-                    continue
-                this_inc = car["TeamIncidentCount"]
-                if this_inc > prev_inc:
-                    self.logger.debug(f"Car {car_no} has {this_inc} incidents")
-                if (
-                    self.initial_penalty_incidents
-                    and prev_inc < self.initial_penalty_incidents <= this_inc
-                ):
-                    self.penalize(
-                        car_no, self.initial_penalty, self.initial_penalty_incidents
-                    )
-                    continue
-                if (
-                    self.recurring_penalty_incidents
-                    and (this_inc > prev_inc)
-                    and (
-                        (this_inc - self.initial_penalty_incidents)
-                        % self.recurring_penalty_incidents
-                        <= (prev_inc - self.initial_penalty_incidents)
-                        % self.recurring_penalty_incidents
-                    )
-                    and (
-                        self.end_recurring_incidents == 0
-                        or this_inc < self.end_recurring_incidents
+        Checked every tick, but only for cars whose incident count changed
+        since the last session info update.
+        """
+        subscription = self.get_incident_stream().subscribe()
+        try:
+            while True:
+                self.wait_for_next_tick()
+                for incident in subscription.poll(self.sdk):
+                    if incident.kind is not IncidentKind.INCIDENT:
+                        continue
+                    self.logger.debug(
+                        f"Car {incident.car_number} has {incident.incidents} incidents"
                     )
-                    and (this_inc > self.initial_penalty_incidents)
-                ):
-                    n = (
-                        this_inc - self.initial_penalty_incidents
-                    ) // self.recurring_penalty_incidents
-                    x = self.initial_penalty_incidents + (
-                        n * self.recurring_penalty_incidents
+                    self.check_penalty(
+                        incident.car_number, incident.previous, incident.incidents
                     )
-                    self.penalize(car_no, self.recurring_penalty, x)
-                    continue
+        finally:
+            subscription.close()
 
-                if (
-                    self.end_recurring_incidents
-                    and this_inc >= self.end_recurring_incidents > prev_inc
-                ):
-                    self.penalize(
-                        car_no, self.end_recurring_penalty, self.end_recurring_incidents
-                    )
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sleep(5)
+    def check_penalty(self, car_no, prev_inc, this_inc):
+        """
+        Penalizes a car if its incident count reached a limit going from
+        ``prev_inc`` to ``this_inc``.
+
+        Args:
+            car_no (str): The car number.
+            prev_inc (int): The car's previous incident count.
+            this_inc (int): The car's incident count now.
+        """
+        if (
+            self.initial_penalty_incidents
+            and prev_inc < self.initial_penalty_incidents <= this_inc
+        ):
+            self.penalize(car_no, self.initial_penalty, self.initial_penalty_incidents)
+            return
+        if (
+            self.recurring_penalty_incidents
+            and (this_inc > prev_inc)
+            and (
+                (this_inc - self.initial_penalty_incidents)
+                % self.recurring_penalty_incidents
+                <= (prev_inc - self.initial_penalty_incidents)
+                % self.recurring_penalty_incidents
+            )
+            and (
+                self.end_recurring_incidents == 0
+                or this_inc < self.end_recurring_incidents
+            )
+            and (this_inc > self.initial_penalty_incidents)
+        ):
+            n = (
+                this_inc - self.initial_penalty_incidents
+            ) // self.recurring_penalty_incidents
+            x = self.initial_penalty_incidents + (n * self.recurring_penalty_incidents)
+            self.penalize(car_no, self.recurring_penalty, x)
+            return
+
+        if (
+            self.end_recurring_incidents
+            and this_inc >= self.end_recurring_incidents > prev_inc
+        ):
+            self.penalize(
+                car_no, self.end_recurring_penalty, self.end_recurring_incidents
+            )
 
     def penalize(self, car_no, penalty, threshold):
         self._chat(f"!bl {car_no} {penalty} ({threshold}x)")
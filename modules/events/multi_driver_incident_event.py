@@ -128,16 +128,39 @@ from modules.events import RandomLapEvent
 
 
 class MultiDriverLapIncidentEvent(RandomLapEvent, MultiDriverTimedIncidentEvent):
+    @override
+    def run(self, *args, **kwargs):
+        try:
+            super().run(*args, **kwargs)
+        finally:
+            end_trigger = getattr(self, "_end_trigger", None)
+            if end_trigger is not None:
+                end_trigger.cancel()
+
     @override
     def is_time_to_end(self):
-        order = self.get_current_running_order()
-        lap = max([car["total_completed"] for car in order]) + 1
-        end_lap = (
-            self.end_time
-            if self.end_time > 0
-            else self.sdk["SessionLapsTotal"] + self.end_time
-        )
-        return lap >= end_lap
+        """
+        Checks whether the leader has reached the event's end lap.
+
+        The first call registers the end lap with the TriggerScheduler, and
+        later calls just check whether it has fired.  Without a scheduler the
+        leader's lap is checked every call.
+
+        Returns:
+            bool: True once the event should stop watching for incidents.
+        """
+        end_trigger = getattr(self, "_end_trigger", None)
+        if end_trigger is None:
+            end_lap = (
+                self.end_time
+                if self.end_time > 0
+                else self.sdk["SessionLapsTotal"] + self.end_time
+            )
+            scheduler = self.get_trigger_scheduler()
+            if scheduler is None:
+                return self.get_leader_lap() + 1 >= end_lap
+            end_trigger = self._end_trigger = scheduler.at_lap(self, end_lap - 1, None)
+        return end_trigger.future.done()
 
     def __init__(self, *args, **kwargs):
         MultiDriverTimedIncidentEvent.__init__(self, *args, **kwargs)
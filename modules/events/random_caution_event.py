@@ -1,6 +1,118 @@
+import time
+from concurrent.futures import Future
+
 from modules.events import RandomTimedEvent
 
 
+class WaveAroundDispatcher:
+    """
+    Waves around every eligible car on the tick it crosses the line.
+
+    Each tick, every waiting car that has just completed a lap (or left pit
+    road before the line) is found from one StepDelta, and their ``!w`` and
+    ``!eol`` commands are queued together in track order without waiting for
+    each other to be sent.
+
+    Attributes:
+        event (BaseEvent): The event the commands are sent through.
+        waiting (list): CarIdx of the cars still to be waved around.
+        lateness (dict): Session seconds from the tick each car was seen
+            crossing the line until its ``!w`` was sent, keyed by CarNumber.
+    """
+
+    def __init__(self, event, cars):
+        """
+        Initializes the WaveAroundDispatcher.
+
+        Args:
+            event (BaseEvent): The event the commands are sent through.
+            cars (list): CarIdx of the cars to wave around.
+        """
+        self.event = event
+        self.waiting = list(cars)
+        self.lateness = {}
+        self._last_step = event.get_field_snapshot()
+
+    def step(self):
+        """
+        Waves around the waiting cars that crossed the line since the last step.
+
+        Cars the sim shows as waved around stop waiting.
+
+        Returns:
+            list: CarIdx of the cars waved around, furthest around the track first.
+        """
+        event = self.event
+        this_step = event.get_field_snapshot()
+        delta = event.step_delta(self._last_step, this_step)
+        self._last_step = this_step
+        pace_flags = event.sdk["CarIdxPaceFlags"]
+
+        crossed = []
+        for car in list(self.waiting):
+            if pace_flags[car] & event.PaceFlags.waved_around:
+                self.waiting.remove(car)
+            elif car in delta.completed_lap or (
+                car in delta.left_pits and this_step.lap_dist_pct[car] < 0.5
+            ):
+                if this_step.on_pit_road[car]:
+                    event.logger.debug(f"{car} is on pit road.")
+                    continue
+                crossed.append(car)
+
+        crossed.sort(key=lambda car: this_step.total_completed[car], reverse=True)
+        # Lateness is measured from the tick the cars were seen crossing on,
+        # not from now, so the time spent on this step isn't counted as late.
+        crossed_at = event.sdk["SessionTime"]
+        seen_at = time.monotonic()
+        for car in crossed:
+            self._wave(this_step.car_numbers[car], crossed_at, seen_at)
+        return crossed
+
+    def _wave(self, car_number, crossed_at, seen_at):
+        self.event.logger.info(f"Waving around car {car_number}")
+        wave = self.event._chat(f"!w {car_number}")
+        self.event._chat(f"!eol {car_number}")
+        if isinstance(wave, Future):
+            wave.add_done_callback(
+                lambda future: self._sent(car_number, crossed_at, seen_at, future)
+            )
+        else:
+            self._record(car_number, crossed_at, seen_at, time.monotonic())
+
+    def _sent(self, car_number, crossed_at, seen_at, future):
+        if future.cancelled() or future.exception() is not None:
+            self.event.logger.warning(f"Wave around for car {car_number} not sent.")
+            return
+        self._record(car_number, crossed_at, seen_at, future.result())
+
+    def _record(self, car_number, crossed_at, seen_at, sent_at):
+        hub = getattr(self.event.sdk, "hub", None)
+        if hub is not None:
+            # The session clock when the !w went out.
+            sent_session_time = hub.latest["SessionTime"]
+        else:
+            # Without a hub the sdk is frozen by the event's thread, so the
+            # send is placed on the session clock from when the step ran.
+            sent_session_time = crossed_at + sent_at - seen_at
+        late = self.lateness[car_number] = max(sent_session_time - crossed_at, 0.0)
+        self.event.logger.debug(
+            f"Car {car_number} waved around {late:.2f}s after crossing the line."
+        )
+
+    def report(self):
+        """
+        Logs how late the wave arounds sent so far were.
+        """
+        if not self.lateness:
+            return
+        car_number, late = max(self.lateness.items(), key=lambda item: item[1])
+        self.event.logger.info(
+            f"Waved around {len(self.lateness)} cars, the latest {late:.2f}s "
+            f"after crossing the line (car {car_number})."
+        )
+
+
 class RandomCautionEvent(RandomTimedEvent):
     """
     A class to represent a random caution event in the iRacing simulator.
@@ -64,19 +176,15 @@ class RandomCautionEvent(RandomTimedEvent):
         self.throw_caution()
         self.audio_queue.put("caution")
 
-        pace_car = next(
-            driver
-            for driver in self.sdk["DriverInfo"]["Drivers"]
-            if driver["CarIsPaceCar"] == 1
-        )["CarIdx"]
+        pace_car = self.get_driver_directory().pace_car_idx
 
         def await_pace_car_lap():
             while not (0.4 <= self.sdk["CarIdxLapDistPct"][pace_car] <= 0.5):
-                self.sleep(1)
+                self.wait_for_next_tick(max_hz=10)
             initial_lap = self.sdk["CarIdxLapCompleted"][pace_car]
 
             while self.sdk["CarIdxLapCompleted"][pace_car] < initial_lap + 1:
-                self.sleep(1)
+                self.wait_for_next_tick(max_hz=10)
             self.logger.debug("Pace car has completed a lap.")
 
         if self.extend_laps > 0:
@@ -92,36 +200,17 @@ class RandomCautionEvent(RandomTimedEvent):
                 laps_completed += 1
             self.logger.debug("Ready for Wave Arounds.")
             self.audio_queue.put("wavenow")
-            current_positions = self.get_wave_around_cars()
-
-            last_step = self.get_current_running_order()
+            waves = WaveAroundDispatcher(self, self.get_wave_around_cars())
 
             overridden = False
-            while current_positions:
-                self.sdk.unfreeze_var_buffer_latest()
-                self.sdk.freeze_var_buffer_latest()
-                this_step = self.get_current_running_order()
-                to_remove = []
-                for car in current_positions:
-                    args = [{"CarIdx": car}, last_step, this_step]
-                    if self.sdk["CarIdxPaceFlags"][car] & self.PaceFlags.waved_around:
-                        to_remove.append(car)
-                    if self.car_has_completed_lap(*args) or (
-                        self.car_has_left_pits(*args)
-                        and self.sdk["CarIdxLapDistPct"][car] < 0.5
-                    ):
-                        if self.sdk["CarIdxOnPitRoad"][car]:
-                            self.logger.debug(f"{car} is on pit road.")
-                            continue
-                        self.wave_and_eol(car)
-                for car in to_remove:
-                    current_positions.pop(current_positions.index(car))
-                last_step = this_step
-                self.sleep(1)
+            while waves.waiting:
+                self.wait_for_next_tick()
+                waves.step()
                 if self.sdk["SessionFlags"] & self.Flags.green:
                     self.logger.warning("Caution ended during wave arounds.")
                     overridden = True
                     break
+            waves.report()
             if not overridden:
                 self._chat("!p 3")
                 self.audio_queue.put("wavecomplete")
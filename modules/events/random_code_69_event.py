@@ -1,6 +1,115 @@
+import bisect
 import threading
+from collections.abc import MutableMapping
 
+import numpy as np
+
+from modules.chat import ChatPriority, ReminderCache
 from modules.events import RandomTimedEvent
+from modules.telemetry import get_class_pace, get_driver_directory, get_track_model
+
+# Reminders that haven't changed are only repeated every this many reminder cycles.
+REMINDER_REPEAT_CYCLES = 3
+
+
+class RestartRecord(MutableMapping):
+    """
+    One car's place in a restart order.
+
+    A slotted record rather than a dict, since the order is updated every tick
+    for every car.  Fields are read and written by key, like the dicts it
+    replaced, and ``as_dict()`` gives a plain dict for logs and fixtures.
+
+    The overtake lists are owned by the record and refilled in place.
+    """
+
+    FIELDS = (
+        "CarIdx",
+        "CarNumber",
+        "CarClassOrder",
+        "BeganPacingLap",
+        "BeganPacingTick",
+        "BeganPacingDistance",
+        "WaveAround",
+        "SlowerClassCatchup",
+        "ExpectedPosition",
+        "ActualPosition",
+        "LatePit",
+        "IncorrectOvertakes",
+        "IncorrectlyOvertakenBy",
+        "WavesRemain",
+    )
+    __slots__ = FIELDS
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(
+        self,
+        CarIdx,
+        CarNumber,
+        CarClassOrder,
+        BeganPacingLap,
+        BeganPacingTick,
+        BeganPacingDistance,
+        WaveAround=0,
+        SlowerClassCatchup=0,
+    ):
+        self.CarIdx = CarIdx
+        self.CarNumber = CarNumber
+        self.CarClassOrder = CarClassOrder
+        self.BeganPacingLap = BeganPacingLap
+        self.BeganPacingTick = BeganPacingTick
+        self.BeganPacingDistance = BeganPacingDistance
+        self.WaveAround = WaveAround
+        self.SlowerClassCatchup = SlowerClassCatchup
+        self.ExpectedPosition = 0
+        self.ActualPosition = 0
+        self.LatePit = 0
+        self.IncorrectOvertakes = []
+        self.IncorrectlyOvertakenBy = []
+        self.WavesRemain = False
+
+    @classmethod
+    def from_mapping(cls, car):
+        """
+        Get a RestartRecord for a restart record dict.  Records are returned as is.
+        """
+        if isinstance(car, cls):
+            return car
+        record = cls.__new__(cls)
+        for field in cls.FIELDS:
+            setattr(record, field, car[field])
+        return record
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("RestartRecord fields can't be deleted")
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def as_dict(self):
+        """
+        Get the record as a plain dict, with copies of the overtake lists.
+        """
+        record = {field: getattr(self, field) for field in self.FIELDS}
+        record["IncorrectOvertakes"] = list(self.IncorrectOvertakes)
+        record["IncorrectlyOvertakenBy"] = list(self.IncorrectlyOvertakenBy)
+        return record
+
+    def __repr__(self):
+        return repr(self.as_dict())
 
 
 class RestartOrderManager:
@@ -13,52 +122,37 @@ class RestartOrderManager:
             preset_order (list, optional): A preset order of cars. Defaults to None.
         """
         if preset_order is not None:
-            self.order = preset_order
+            self.order = [RestartRecord.from_mapping(car) for car in preset_order]
         else:
             self.order = []
         self.sdk = sdk
         self.class_separation = False
-        self.one_meter = 1 / (
-            float(str(self.sdk["WeekendInfo"]["TrackLength"]).replace(" km", "")) * 1000
-        )
+        self.one_meter = 1 / get_track_model(self.sdk).length
         self.wave_around_cars = []
         self.out_of_place_cars = []
         self.displaced_cars = []
         self.race_classes = self.sdk["CarIdxClass"]
-        self.class_lap_times = {}
-
-        def get_fastest_lap_for_class(cc):
-            classes = self.sdk["CarIdxClass"]
-            best_laps = self.sdk["CarIdxBestLapTime"]
-            last_laps = self.sdk["CarIdxLastLapTime"]
-            best_lap = None
-            for i, c in enumerate(classes):
-                if c == cc:
-                    cars_best = best_laps[i] if best_laps[i] > 0 else last_laps[i]
-                    if (best_lap is None or cars_best < best_lap) and cars_best > 0:
-                        best_lap = cars_best
-
-            if best_lap is None:
-                return 999999
-            return best_lap
-
-        for car_class in self.race_classes:
-            if car_class not in self.class_lap_times:
-                self.class_lap_times[car_class] = get_fastest_lap_for_class(car_class)
-
-        # {'1': 'Faestest_class', '2': 'Second_fastest_class', '3': 'Third_fastest_class'}
-
-        self.class_speed_rank = {
-            class_: str(i + 1)
-            for i, class_ in enumerate(
-                sorted(
-                    {k: v for k, v in self.class_lap_times.items() if v is not None},
-                    key=lambda x: self.class_lap_times[x],
-                )
-            )
-        }
+        self.class_pace = get_class_pace(self.sdk)
+        self._leader = None
+        self._leader_order = None
+        self._leader_key = None
         print(self.class_lap_times)
 
+    @property
+    def class_lap_times(self):
+        """
+        dict: Fastest lap time keyed by car class, from the session's ClassPace.
+        """
+        return self.class_pace.update(self.sdk).class_lap_times
+
+    # {'1': 'Faestest_class', '2': 'Second_fastest_class', '3': 'Third_fastest_class'}
+    @property
+    def class_speed_rank(self):
+        """
+        dict: Rank of each car class by lap time, fastest first, from the session's ClassPace.
+        """
+        return self.class_pace.update(self.sdk).class_speed_rank
+
     def add_car_to_order(self, carIdx, wave_around=0, slower_class_catchup=0):
         """
         Add a car to the restart order.
@@ -70,26 +164,17 @@ class RestartOrderManager:
         """
         began_pacing_distance = self.sdk["CarIdxLapDistPct"][carIdx]
         if carIdx not in [car["CarIdx"] for car in self.order]:
-            driver = [
-                d for d in self.sdk["DriverInfo"]["Drivers"] if d["CarIdx"] == carIdx
-            ][0]
-            car_number = driver["CarNumber"]
-            car_restart_record = {
-                "CarIdx": carIdx,
-                "CarNumber": car_number,
-                "CarClassOrder": self.class_speed_rank[self.sdk["CarIdxClass"][carIdx]],
-                "BeganPacingLap": self.sdk["CarIdxLapCompleted"][carIdx],
-                "BeganPacingTick": int(self.sdk["SessionTick"]),
-                "BeganPacingDistance": began_pacing_distance,
-                "WaveAround": wave_around,
-                "SlowerClassCatchup": slower_class_catchup,
-                "ExpectedPosition": 0,
-                "ActualPosition": 0,
-                "LatePit": 0,
-                "IncorrectOvertakes": [],
-                "IncorrectlyOvertakenBy": [],
-                "WavesRemain": False,
-            }
+            car_number = get_driver_directory(self.sdk).car_number(carIdx)
+            car_restart_record = RestartRecord(
+                CarIdx=carIdx,
+                CarNumber=car_number,
+                CarClassOrder=self.class_speed_rank[self.sdk["CarIdxClass"][carIdx]],
+                BeganPacingLap=self.sdk["CarIdxLapCompleted"][carIdx],
+                BeganPacingTick=int(self.sdk["SessionTick"]),
+                BeganPacingDistance=began_pacing_distance,
+                WaveAround=wave_around,
+                SlowerClassCatchup=slower_class_catchup,
+            )
         else:
             car_restart_record = [car for car in self.order if car["CarIdx"] == carIdx][
                 0
@@ -112,28 +197,35 @@ class RestartOrderManager:
         """
         # check if we've separated classes
         if self.class_separation:
+            # Separate on the current pace, not the pace when each car was added.
+            class_speed_rank = self.class_speed_rank
+            car_classes = self.sdk["CarIdxClass"]
+            for car in self.order:
+                car.CarClassOrder = class_speed_rank.get(
+                    car_classes[car.CarIdx], car.CarClassOrder
+                )
             self.order = sorted(
                 self.order,
                 key=lambda x: (
-                    x["LatePit"],
-                    x["CarClassOrder"],
-                    x["WaveAround"] + x["SlowerClassCatchup"],
-                    x["BeganPacingTick"],
-                    -x["BeganPacingDistance"],
+                    x.LatePit,
+                    x.CarClassOrder,
+                    x.WaveAround + x.SlowerClassCatchup,
+                    x.BeganPacingTick,
+                    -x.BeganPacingDistance,
                 ),
             )
         else:
             self.order = sorted(
                 self.order,
                 key=lambda x: (
-                    x["LatePit"],
-                    x["WaveAround"] + x["SlowerClassCatchup"],
-                    x["BeganPacingTick"],
-                    -x["BeganPacingDistance"],
+                    x.LatePit,
+                    x.WaveAround + x.SlowerClassCatchup,
+                    x.BeganPacingTick,
+                    -x.BeganPacingDistance,
                 ),
             )
         self.update_car_positions()
-        return [car["CarNumber"] for car in self.order]
+        return [car.CarNumber for car in self.order]
 
     def update_car_positions(self):
         """
@@ -142,58 +234,46 @@ class RestartOrderManager:
         This method checks for cars that are out of position, have been overtaken incorrectly,
         or need to perform wave arounds.
         """
+        lap_completed = self.sdk["CarIdxLapCompleted"]
+        lap_dist_pct = self.sdk["CarIdxLapDistPct"]
+        on_pit_road = self.sdk["CarIdxOnPitRoad"]
         # First update all the actual positions
-        # self.sdk.freeze_var_buffer_latest()
-        for i, car in enumerate(self.order):
-            self.order[i]["ActualPosition"] = (
-                self.sdk["CarIdxLapCompleted"][car["CarIdx"]]
-                + self.sdk["CarIdxLapDistPct"][car["CarIdx"]]
-                - car["BeganPacingLap"]
+        for car in self.order:
+            car.ActualPosition = (
+                lap_completed[car.CarIdx]
+                + lap_dist_pct[car.CarIdx]
+                - car.BeganPacingLap
             )
-        # self.sdk.unfreeze_var_buffer_latest()
-        # Then update the expected positions to be right behind the car in front of them
-        for i, car in enumerate(self.order):
-            self.order[i]["IncorrectOvertakes"] = []
-            self.order[i]["IncorrectlyOvertakenBy"] = []
-            for car_ahead in self.order[:i]:
-                wave_adjusted_car_ahead_position = (
-                    car_ahead["ActualPosition"]
-                    - car_ahead["WaveAround"]
-                    - car_ahead["SlowerClassCatchup"]
-                    + car["WaveAround"]
-                    + car["SlowerClassCatchup"]
-                )
-                if (
-                    car["ActualPosition"] > wave_adjusted_car_ahead_position
-                    and not self.sdk["CarIdxOnPitRoad"][car_ahead["CarIdx"]]
-                    and not self.sdk["CarIdxOnPitRoad"][car["CarIdx"]]
-                    and not self.sdk["CarIdxLapDistPct"][car_ahead["CarIdx"]] == -1
-                    and not self.sdk["CarIdxLapDistPct"][car["CarIdx"]] == -1
-                ):
-                    self.order[i]["IncorrectOvertakes"].append(car_ahead["CarNumber"])
-            for car_behind in self.order[i + 1 :]:
-                wave_adjusted_car_behind_position = (
-                    car_behind["ActualPosition"]
-                    - car_behind["WaveAround"]
-                    - car_behind["SlowerClassCatchup"]
-                    + car["WaveAround"]
-                    + car["SlowerClassCatchup"]
+        # Then find the cars that aren't right behind the car in front of them.
+        # Only cars on track are compared, using their position less any wave
+        # arounds, so a car is out of place wherever that position is out of
+        # order.
+        compared = []
+        wave_adjusted_positions = []
+        for car in self.order:
+            car.IncorrectOvertakes.clear()
+            car.IncorrectlyOvertakenBy.clear()
+            if not on_pit_road[car.CarIdx] and lap_dist_pct[car.CarIdx] != -1:
+                compared.append(car)
+                wave_adjusted_positions.append(
+                    car.ActualPosition - car.WaveAround - car.SlowerClassCatchup
                 )
-                if (
-                    car["ActualPosition"] < wave_adjusted_car_behind_position
-                    and not self.sdk["CarIdxOnPitRoad"][car_behind["CarIdx"]]
-                    and not self.sdk["CarIdxOnPitRoad"][car["CarIdx"]]
-                    and not self.sdk["CarIdxLapDistPct"][car_behind["CarIdx"]] == -1
-                    and not self.sdk["CarIdxLapDistPct"][car["CarIdx"]] == -1
-                ):
-                    self.order[i]["IncorrectlyOvertakenBy"].append(
-                        car_behind["CarNumber"]
-                    )
+        overtakes, overtaken_by = _find_inversions(wave_adjusted_positions)
+        for i, passed in overtakes.items():
+            compared[i].IncorrectOvertakes.extend(compared[j].CarNumber for j in passed)
+        for i, passed_by in overtaken_by.items():
+            compared[i].IncorrectlyOvertakenBy.extend(
+                compared[j].CarNumber for j in passed_by
+            )
 
-            self.order[i]["WavesRemain"] = (
-                car["ActualPosition"] - (car["WaveAround"] + car["SlowerClassCatchup"])
-                < self.leader()["ActualPosition"] - 1
-            ) and car["ActualPosition"] > 0
+        # The order may have just been re-sorted, so work the leader out afresh.
+        self._leader_order = None
+        leader = self.leader()
+        for car in self.order:
+            car.WavesRemain = (
+                car.ActualPosition - (car.WaveAround + car.SlowerClassCatchup)
+                < leader["ActualPosition"] - 1
+            ) and car.ActualPosition > 0
 
         if self.order:
             self.out_of_place_cars = []
@@ -203,36 +283,90 @@ class RestartOrderManager:
                 # skip the leader
                 if i == 0:
                     continue
-                if car["WavesRemain"]:
+                if car.WavesRemain:
                     self.wave_around_cars.append(car)
-                if car["IncorrectOvertakes"]:
+                if car.IncorrectOvertakes:
                     self.out_of_place_cars.append(car)
-                if car["IncorrectlyOvertakenBy"]:
+                if car.IncorrectlyOvertakenBy:
                     self.displaced_cars.append(car)
 
     def leader(self):
         """
         Get the current leader car.
 
+        The leader is the first connected car in the order that is on track,
+        or the first connected car if none of the order is on track.  It is
+        cached until the next telemetry tick or a change to the order.
+
         Returns:
             dict: The car data for the current leader, or None if no leader is found.
         """
-        return next(
-            (
-                car
-                for car in self.order
-                if self.sdk["CarIdxLapDistPct"][car["CarIdx"]] != -1
-                and (
-                    not [
-                        c
-                        for c in self.order
-                        if not self.sdk["CarIdxOnPitRoad"][c["CarIdx"]]
-                    ]
-                    or not self.sdk["CarIdxOnPitRoad"][car["CarIdx"]]
-                )
-            ),
-            None,
+        key = (self.sdk["SessionTick"], len(self.order))
+        if self._leader_order is not self.order or self._leader_key != key:
+            self._leader = self._find_leader()
+            self._leader_order = self.order
+            self._leader_key = key
+        return self._leader
+
+    def _find_leader(self):
+        if not self.order:
+            return None
+        car_idx = np.fromiter(
+            (car.CarIdx for car in self.order), dtype=np.intp, count=len(self.order)
         )
+        connected = np.asarray(self.sdk["CarIdxLapDistPct"])[car_idx] != -1
+        on_track = ~np.asarray(self.sdk["CarIdxOnPitRoad"], dtype=bool)[car_idx]
+        candidates = connected & on_track if on_track.any() else connected
+        if not candidates.any():
+            return None
+        return self.order[int(np.argmax(candidates))]
+
+
+def _find_inversions(positions):
+    """
+    Finds every pair of entries that is out of order.
+
+    Binary search keeps the comparisons to O(n log n), but each insert into
+    the sorted lists shifts their tails, so the pass is O(n^2) in the worst
+    case.  For a field's worth of entries that shift is a short memmove.
+
+    The entries are expected in descending order of position, leader first.
+
+    Args:
+        positions (list): Position of each entry, in the expected order.
+
+    Returns:
+        tuple: Two dicts keyed by the index of each entry that is out of
+            order: the earlier entries with a lower position (the ones it has
+            passed), and the later entries with a higher position (the ones
+            that have passed it).  Both are lists of indices, in ascending
+            order.
+    """
+    passed = {}
+    passed_by = {}
+
+    # Walk forwards keeping the earlier positions sorted; the ones below the
+    # current position are a prefix.
+    seen_positions, seen_indices = [], []
+    for i, position in enumerate(positions):
+        below = bisect.bisect_left(seen_positions, position)
+        if below:
+            passed[i] = sorted(seen_indices[:below])
+        insert_at = bisect.bisect_right(seen_positions, position)
+        seen_positions.insert(insert_at, position)
+        seen_indices.insert(insert_at, i)
+
+    # Then backwards; the later positions above the current one are a suffix.
+    seen_positions, seen_indices = [], []
+    for i in range(len(positions) - 1, -1, -1):
+        position = positions[i]
+        above = bisect.bisect_right(seen_positions, position)
+        if above < len(seen_positions):
+            passed_by[i] = sorted(seen_indices[above:])
+        seen_positions.insert(above, position)
+        seen_indices.insert(above, i)
+
+    return passed, passed_by
 
 
 class RandomTimedCode69Event(RandomTimedEvent):
@@ -309,6 +443,9 @@ class RandomTimedCode69Event(RandomTimedEvent):
         self.can_separate_classes = True
         self.can_separate_lanes = True
         self.reminder_frequency = reminder_frequency
+        self.reminder_cache = ReminderCache(
+            ttl=float(reminder_frequency) * REMINDER_REPEAT_CYCLES
+        )
         self.restart_speed_pct = restart_speed_pct
         # self.restart_speed = self.max_speed_km * (int(restart_speed_pct) / 100)
         self.auto_class_separate_position = auto_class_separate_position
@@ -335,25 +472,62 @@ class RandomTimedCode69Event(RandomTimedEvent):
         """
         Send reminder messages to cars that are out of position.
 
+        An instruction is only repeated when it changes or once the reminder
+        cache's TTL has passed, and each car gets its instructions in one DM.
+
         Args:
             order_generator (RestartOrderManager): The restart order manager instance.
         """
         self.logger.debug(order_generator.order)
+        reminders = {}
         # Instructions to cars that are out of place
         for car in order_generator.wave_around_cars:
             if self.wave_arounds_active:
-                self._chat(
-                    f"/{car['CarNumber']} Safely overtake the leader and join at the back of the pack."
+                reminders[(car["CarNumber"], "wave_around")] = (
+                    "Safely overtake the leader and join at the back of the pack."
                 )
         for car in order_generator.out_of_place_cars:
-            self._chat(
-                f"/{car['CarNumber']} Let the {', '.join(car['IncorrectOvertakes'])} car{'s' if len(car['IncorrectOvertakes']) > 1 else ''} by."
+            reminders[(car["CarNumber"], "let_by")] = (
+                f"Let the {', '.join(car['IncorrectOvertakes'])} car{'s' if len(car['IncorrectOvertakes']) > 1 else ''} by."
             )
         for car in order_generator.displaced_cars:
+            reminders[(car["CarNumber"], "pass")] = (
+                f"Pass the {', '.join(car['IncorrectlyOvertakenBy'])} car{'s' if len(car['IncorrectlyOvertakenBy']) > 1 else ''}."
+            )
+
+        due = self.reminder_cache.due(
+            reminders,
+            self.sdk["SessionTime"],
+            cars=[car["CarNumber"] for car in order_generator.order],
+        )
+        instructions = {}
+        for (car_number, _), text in due.items():
+            instructions.setdefault(car_number, []).append(text)
+        for car_number, texts in instructions.items():
             self._chat(
-                f"/{car['CarNumber']} Pass the {', '.join(car['IncorrectlyOvertakenBy'])} car{'s' if len(car['IncorrectlyOvertakenBy']) > 1 else ''}."
+                f"/{car_number} {' '.join(texts)}", priority=ChatPriority.REMINDER
             )
 
+    def leader_has_gone(self, leader, restart_speed):
+        """
+        Checks whether the leader has sped up past the restart speed.
+
+        Reads the speed over the latest step between samples on purpose, not
+        the smoothed speed or acceleration, which lag by up to SPEED_WINDOW:
+        the green flag has to follow within a tick of the leader going.
+
+        Args:
+            leader (RestartRecord): The leader.
+            restart_speed (float): The restart speed in kilometres per hour.
+
+        Returns:
+            bool: True if the leader's speed over the latest tick is over the restart speed.
+        """
+        speeds = self.get_speed_estimator()
+        if speeds.tick is None:
+            return False
+        return speeds.latest_speed_kph(leader["CarIdx"]) > restart_speed
+
     def event_sequence(self):
         """
         Executes the event sequence for a random Code 69.
@@ -368,6 +542,7 @@ class RandomTimedCode69Event(RandomTimedEvent):
 
         self.busy_event.set()
         self.restart_ready.clear()
+        self.reminder_cache.clear()
         # self._chat(self.reason, race_control=True)
         self.audio_queue.put("quickiesoon" if self.quickie else "code69beginsoon")
 
@@ -393,18 +568,18 @@ class RandomTimedCode69Event(RandomTimedEvent):
         }
         self.broadcast_text_queue.put(broadcast_msg)
         while not any([car["LapCompleted"] > lead_lap for car in this_step]):
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sdk.freeze_var_buffer_latest()
+            self.wait_for_next_tick(max_hz=10)
             last_step = this_step
             this_step = self.get_current_running_order()
             if any([car["LapCompleted"] > lead_lap for car in this_step]):
                 break
+            delta = self.step_delta(last_step, this_step)
             for car in this_step:
                 if (
-                    self.car_has_completed_lap(car, last_step, this_step)
+                    car["CarIdx"] in delta.completed_lap
                     and not self.sdk["CarIdxOnPitRoad"][car["CarIdx"]]
                 ) or (
-                    self.car_has_left_pits(car, last_step, this_step)
+                    car["CarIdx"] in delta.left_pits
                     and self.sdk["CarIdxLapDistPct"][car["CarIdx"]] < 0.5
                 ):
                     self._chat(
@@ -420,9 +595,8 @@ class RandomTimedCode69Event(RandomTimedEvent):
             self.audio_queue.put("quickiebegin")
 
         speed_km_per_hour = 0
-        leader_speed_generator = None
         restart_order_generator = RestartOrderManager(self.sdk)
-        leader = -1
+        leader = None
 
         while not self.restart_ready.is_set():
             this_step = self.get_current_running_order()
@@ -467,6 +641,7 @@ class RandomTimedCode69Event(RandomTimedEvent):
                 return (car["total_completed"], car["LapDistPct"])
 
             this_step = sorted(this_step, key=_sort_key, reverse=True)
+            delta = self.step_delta(last_step, this_step)
 
             for car in this_step:
                 existing_restart_record = [
@@ -477,7 +652,7 @@ class RandomTimedCode69Event(RandomTimedEvent):
                 car_flags = self.sdk["CarIdxSessionFlags"][car["CarIdx"]]
                 if (
                     existing_restart_record
-                    and self.car_has_entered_pits(car, last_step, this_step)
+                    and car["CarIdx"] in delta.entered_pits
                     and existing_restart_record[0]["ActualPosition"] < 0.5
                 ):
                     # welcome to Bathurst
@@ -497,11 +672,11 @@ class RandomTimedCode69Event(RandomTimedEvent):
                     (
                         car["CarIdx"]
                         not in [c["CarIdx"] for c in restart_order_generator.order]
-                        and self.car_has_completed_lap(car, last_step, this_step)
+                        and car["CarIdx"] in delta.completed_lap
                         and not self.sdk["CarIdxOnPitRoad"][car["CarIdx"]]
                     )
                     or (
-                        self.car_has_left_pits(car, last_step, this_step)
+                        car["CarIdx"] in delta.left_pits
                         and [x for x in this_step if x["CarIdx"] == car["CarIdx"]][0][
                             "LapDistPct"
                         ]
@@ -511,7 +686,7 @@ class RandomTimedCode69Event(RandomTimedEvent):
                         car["CarIdx"]
                         in [c["CarIdx"] for c in restart_order_generator.order]
                         and (
-                            self.car_has_entered_pits(car, last_step, this_step)
+                            car["CarIdx"] in delta.entered_pits
                             or car_flags & self.Flags.black
                         )
                     )
@@ -623,8 +798,8 @@ class RandomTimedCode69Event(RandomTimedEvent):
                             f"{car['CarNumber']} gets wave around: {gets_wave_around}, catch up: {gets_catch_up}"
                         )
                     continue
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sdk.freeze_var_buffer_latest()
+            self.wait_for_next_tick(max_hz=10)
+            speeds = self.get_speed_estimator()
             last_step = this_step
             if not restart_order_generator.leader():
                 continue
@@ -635,17 +810,15 @@ class RandomTimedCode69Event(RandomTimedEvent):
             if send_message_indicator.__next__():
                 # Check the leader's speed
                 if len(correct_order) > 0 and (
-                    leader_speed_generator is None
+                    leader is None
                     or leader["CarNumber"]
                     != restart_order_generator.leader()["CarNumber"]
                     or leader["CarNumber"]
                     not in [car["CarNumber"] for car in restart_order_generator.order]
                 ):
-                    # New leader, we need a new speed generator
                     leader = restart_order_generator.leader()
-                    leader_speed_generator = self.monitor_speed(leader["CarIdx"])
-                if leader_speed_generator is not None:
-                    speed_km_per_hour = leader_speed_generator.__next__()
+                if leader is not None:
+                    speed_km_per_hour = speeds.speed_kph(leader["CarIdx"])
 
                 self.send_reminders(restart_order_generator)
 
@@ -653,7 +826,6 @@ class RandomTimedCode69Event(RandomTimedEvent):
                     self._chat(
                         f"/{leader['CarNumber']} Slow down to {self.pacing_speed_km()} kph / {int(self.pacing_speed_km() * 0.621371)} mph."
                     )
-            self.sleep(0.1)
 
             if (
                 self.class_separation
@@ -763,16 +935,17 @@ class RandomTimedCode69Event(RandomTimedEvent):
             self.reminder_frequency * 2
         )
         while not self.restart_ready.is_set():
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sdk.freeze_var_buffer_latest()
+            self.wait_for_next_tick(max_hz=10)
+            speeds = self.get_speed_estimator()
             last_step = this_step
             this_step = self.get_current_running_order()
+            delta = self.step_delta(last_step, this_step)
             for i in range(number_of_lanes):
                 lane_order_generators[i].update_order()
                 for car in this_step:
                     if (
-                        self.car_has_left_pits(car, last_step, this_step)
-                        or self.car_has_entered_pits(car, last_step, this_step)
+                        car["CarIdx"] in delta.left_pits
+                        or car["CarIdx"] in delta.entered_pits
                     ) and car["CarIdx"] in [
                         lane["CarIdx"] for lane in lane_order_generators[i].order
                     ]:
@@ -787,17 +960,15 @@ class RandomTimedCode69Event(RandomTimedEvent):
 
             if send_message_indicator.__next__():
                 if len(lane_order_generators[0].order) > 0 and (
-                    leader_speed_generator is None
+                    leader is None
                     or leader["CarNumber"]
                     != lane_order_generators[0].leader()["CarNumber"]
                     or leader["CarNumber"]
                     not in [car["CarNumber"] for car in lane_order_generators[0].order]
                 ):
-                    # New leader, we need a new speed generator
                     leader = lane_order_generators[0].leader()
-                    leader_speed_generator = self.monitor_speed(leader["CarIdx"])
-                if leader_speed_generator is not None:
-                    speed_km_per_hour = leader_speed_generator.__next__()
+                if leader is not None:
+                    speed_km_per_hour = speeds.speed_kph(leader["CarIdx"])
                 for i in range(number_of_lanes):
                     lane_order_generators[i].update_car_positions()
                     self.send_reminders(lane_order_generators[i])
@@ -818,12 +989,9 @@ class RandomTimedCode69Event(RandomTimedEvent):
                 for i in range(number_of_lanes):
                     for car in lane_order_generators[i].order:
                         self._chat(
-                            f"/{car['CarNumber']} Line up {number_of_lanes} wide in the {str(lane_names[i]).upper()} lane."
+                            f"/{car['CarNumber']} Line up {number_of_lanes} wide in the {str(lane_names[i]).upper()} lane.",
+                            priority=ChatPriority.REMINDER,
                         )
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sdk.freeze_var_buffer_latest()
-
-            self.sleep(0.1)
         self.sdk.unfreeze_var_buffer_latest()
 
         self.audio_queue.put("code69end")
@@ -831,20 +999,26 @@ class RandomTimedCode69Event(RandomTimedEvent):
         self._chat("Get Ready, Code 69 will end soon.", race_control=True)
         self._chat("Get Ready, Code 69 will end soon.", race_control=True)
         self.sleep(2)
-        throwaway_speed = (
-            leader_speed_generator.__next__()
-        )  # Make sure we aren't using an average from a while ago
-        immediate_throw = True
         restart_speed = self.pacing_speed_km() * (int(self.restart_speed_pct) / 100)
+        # Sample two fresh ticks, so the leader's latest speed is their speed
+        # as they are told to go rather than an average over the sleep.
+        self.wait_for_next_tick()
+        self.get_speed_estimator()
+        self.wait_for_next_tick()
+        immediate_throw = self.leader_has_gone(leader, restart_speed)
         while True:
             self._chat(f"/{leader['CarNumber']} you control the field, go when ready")
-            speed_km_per_hour = leader_speed_generator.__next__()
-            if speed_km_per_hour > restart_speed:
+            if immediate_throw:
+                break
+            # Check every tick, so the green flag follows the leader's first
+            # tick over the restart speed rather than the next reminder.
+            remind_at = self.sdk["SessionTime"] + 0.5
+            gone = False
+            while not gone and self.sdk["SessionTime"] < remind_at:
+                self.wait_for_next_tick()
+                gone = self.leader_has_gone(leader, restart_speed)
+            if gone:
                 break
-            self.sleep(0.5)
-            self.sdk.unfreeze_var_buffer_latest()
-            self.sdk.freeze_var_buffer_latest()
-            immediate_throw = False
 
         for i in range(len(lane_order_generators)):
             lane_order_generators[i].update_order()
@@ -1,6 +1,10 @@
+import asyncio
+import concurrent.futures
 import random
 
+from modules.event_runtime import run_in_thread
 from modules.events import BaseEvent
+from modules.events.base_event import TICK_WAIT_SLICE
 
 
 class RandomEvent(BaseEvent):
@@ -12,12 +16,47 @@ class RandomEvent(BaseEvent):
         super().__init__(*args, **kwargs)
         self.likelihood = likelihood
 
+    def schedule_start(self):
+        """
+        Schedules the event's start with the TriggerScheduler, if it can be.
+
+        Returns:
+            Trigger: The trigger to wait on, or None if the event polls is_time_to_start instead.
+        """
+        return None
+
     def wait_for_start(self):
         """
         Waits until it is time to start the event.
         """
-        while not self.is_time_to_start():
-            self.sleep(1)
+        trigger = self.schedule_start()
+        if trigger is None:
+            while not self.is_time_to_start():
+                self.sleep(1)
+            return
+        try:
+            while True:
+                try:
+                    trigger.future.result(timeout=TICK_WAIT_SLICE)
+                    return
+                except concurrent.futures.TimeoutError:
+                    self.sleep(0)
+        finally:
+            trigger.cancel()
+
+    async def async_wait_for_start(self):
+        """
+        Waits on the EventRuntime's loop until it is time to start the event.
+        """
+        trigger = self.schedule_start()
+        if trigger is None:
+            while not self.is_time_to_start():
+                await self.async_sleep(1)
+            return
+        try:
+            await asyncio.wrap_future(trigger.future)
+        finally:
+            trigger.cancel()
 
     def run(
         self,
@@ -39,12 +78,14 @@ class RandomEvent(BaseEvent):
             broadcast_text_queue (queue.Queue, optional): Queue for text events. Defaults to None.
             chat_consumer_queue (queue.Queue, optional): Queue for chat consumer messages. Defaults to None.
         """
-        self.cancel_event = cancel_event or self.cancel_event
-        self.busy_event = busy_event or self.busy_event
-        self.chat_lock = chat_lock or self.chat_lock
-        self.audio_queue = audio_queue or self.audio_queue
-        self.broadcast_text_queue = broadcast_text_queue or self.broadcast_text_queue
-        self.chat_consumer_queue = chat_consumer_queue or self.chat_consumer_queue
+        self.share(
+            cancel_event,
+            busy_event,
+            chat_lock,
+            audio_queue,
+            broadcast_text_queue,
+            chat_consumer_queue,
+        )
         self.wait_for_start()
 
         if random.randrange(0, 100) > float(self.likelihood):
@@ -56,6 +97,35 @@ class RandomEvent(BaseEvent):
             self.logger.exception("Error in event sequence.")
             self.logger.exception(e)
 
+    async def run_async(self, **kwargs):
+        """
+        Runs the event on the EventRuntime's loop.
+
+        Waiting for the start time happens on the loop, so a scheduled event
+        has no thread until it starts.  The event sequence then runs as a
+        coroutine if the event has an async_event_sequence, and otherwise on
+        a thread of its own.
+
+        Args:
+            **kwargs: The shared objects run takes.
+        """
+        if type(self).run is not RandomEvent.run:
+            return await run_in_thread(self.run, **kwargs)
+        self.share(**kwargs)
+        await self.async_wait_for_start()
+
+        if random.randrange(0, 100) > float(self.likelihood):
+            self.logger.debug(f"{type(self)} Event skipped.")
+            return
+        try:
+            if self.async_event_sequence is not None:
+                await self.async_event_sequence()
+            else:
+                await run_in_thread(self.event_sequence)
+        except Exception as e:
+            self.logger.exception("Error in event sequence.")
+            self.logger.exception(e)
+
     @staticmethod
     def is_time_to_start():
         return True
@@ -42,18 +42,33 @@ class RandomLapEvent(RandomEvent):
         Returns:
             bool: True if it is lap to start the event, False otherwise.
         """
-        order = self.get_current_running_order()
-        lap = max([car["total_completed"] for car in order])
+        lap = self.get_leader_lap()
         valid_session = lap >= 1 and self.sdk["SessionState"] == 4
         if valid_session:
             self.check_and_set_quickie_flag()
         return lap >= self.start_lap + adjustment
 
+    def schedule_start(self):
+        """
+        Schedules the start lap with the TriggerScheduler.
+
+        Returns:
+            Trigger: The trigger to wait on, or None if the event polls is_time_to_start instead.
+        """
+        scheduler = self.get_trigger_scheduler()
+        if (
+            scheduler is None
+            or type(self).is_time_to_start is not RandomLapEvent.is_time_to_start
+        ):
+            return None
+        return scheduler.at_lap(
+            self, self.start_lap, self.start_lap - self.quickie_window
+        )
+
     def check_and_set_quickie_flag(self):
         total_session_time = self.sdk["SessionTimeTotal"]
         time_remaining = self.sdk["SessionTimeRemain"]
-        order = self.get_current_running_order()
-        lap = max([car["total_completed"] for car in order])
+        lap = self.get_leader_lap()
 
         # if we're within 5 minutes of the start time, and there is another event processing, set the quickie flag
         if (
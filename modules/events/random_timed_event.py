@@ -58,6 +58,23 @@ class RandomTimedEvent(RandomEvent):
             self.check_and_set_quickie_flag()
         return time_until_trigger < 0 and valid_session
 
+    def schedule_start(self):
+        """
+        Schedules the start time with the TriggerScheduler.
+
+        Returns:
+            Trigger: The trigger to wait on, or None if the event polls is_time_to_start instead.
+        """
+        scheduler = self.get_trigger_scheduler()
+        if (
+            scheduler is None
+            or type(self).is_time_to_start is not RandomTimedEvent.is_time_to_start
+        ):
+            return None
+        return scheduler.at_time(
+            self, self.start_time, self.start_time - self.quickie_window * 60
+        )
+
     def check_and_set_quickie_flag(self):
         total_session_time = self.sdk["SessionTimeTotal"]
         time_remaining = self.sdk["SessionTimeRemain"]
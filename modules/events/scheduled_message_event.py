@@ -46,3 +46,8 @@ class ScheduledMessageEvent(TimedEvent):
             self.broadcast_text_queue.put(msg)
         if self.play_audio and self.audio_file:
             self.audio_queue.put(self.audio_file)
+
+    async def async_event_sequence(self):
+        # Nothing here blocks: chat is queued and sent by the dispatcher, so
+        # the message goes out from the runtime's loop without a thread.
+        self.event_sequence()
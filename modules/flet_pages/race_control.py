@@ -458,6 +458,20 @@ class RaceControlApp:
 
             self.page.update()
 
+    def build_run_in_process_check(self, config: Dict):
+        """Build the checkbox that runs an event type in a process of its own"""
+
+        def update_config(e):
+            config["run_in_process"] = e.control.value
+
+        return ft.Checkbox(
+            label="Run in Separate Process",
+            value=config.get("run_in_process", False),
+            tooltip="Keeps the UI responsive while these events are busy",
+            disabled=self.is_running,
+            on_change=update_config,
+        )
+
     def build_random_cautions_tab(self):
         """Build the Random Cautions tab content"""
         self.random_caution_list = ft.Column(
@@ -660,7 +674,12 @@ class RaceControlApp:
                         spacing=8,
                     ),
                     ft.Row(
-                        [wave_arounds_check, notify_skip_check, full_sequence_check],
+                        [
+                            wave_arounds_check,
+                            notify_skip_check,
+                            full_sequence_check,
+                            self.build_run_in_process_check(global_config),
+                        ],
                         wrap=True,
                         spacing=8,
                     ),
@@ -1090,7 +1109,11 @@ class RaceControlApp:
                         spacing=8,
                     ),
                     ft.Row(
-                        [wave_arounds_check, notify_skip_check],
+                        [
+                            wave_arounds_check,
+                            notify_skip_check,
+                            self.build_run_in_process_check(global_config),
+                        ],
                         wrap=True,
                         spacing=8,
                     ),
@@ -1566,7 +1589,12 @@ class RaceControlApp:
                         spacing=10,
                     ),
                     ft.Row(
-                        [wave_arounds_check, full_sequence_check, notify_skip_check],
+                        [
+                            wave_arounds_check,
+                            full_sequence_check,
+                            notify_skip_check,
+                            self.build_run_in_process_check(config),
+                        ],
                         wrap=True,
                     ),
                 ],
@@ -1710,7 +1738,7 @@ class RaceControlApp:
                     ft.Text("Final Penalty", size=14, weight=ft.FontWeight.BOLD),
                     ft.Row([final_incidents, final_penalty], wrap=True, spacing=8),
                     ft.Divider(height=5),
-                    ft.Row([sound_check]),
+                    ft.Row([sound_check, self.build_run_in_process_check(config)]),
                 ],
                 scroll=ft.ScrollMode.AUTO,
             ),
@@ -2016,6 +2044,7 @@ class RaceControlApp:
                         wrap=True,
                         spacing=10,
                     ),
+                    ft.Row([self.build_run_in_process_check(config)]),
                 ],
                 scroll=ft.ScrollMode.AUTO,
             ),
@@ -2588,6 +2617,7 @@ class RaceControlApp:
                                 ],
                                 "likelihood": config["likelihood"],
                             },
+                            "process": global_config.get("run_in_process", False),
                         }
                     )
 
@@ -2650,6 +2680,7 @@ class RaceControlApp:
                                 ],
                                 "likelihood": config["likelihood"],
                             },
+                            "process": global_config.get("run_in_process", False),
                         }
                     )
 
@@ -2693,6 +2724,7 @@ class RaceControlApp:
                                 "notify_on_skipped_caution"
                             ],
                         },
+                        "process": config.get("run_in_process", False),
                     }
                 )
 
@@ -2700,7 +2732,15 @@ class RaceControlApp:
             if self.incident_penalties_enabled and self.incident_penalty_config:
                 config = self.incident_penalty_config
                 event_list.append(
-                    {"class": events.IncidentPenaltyEvent, "args": config}
+                    {
+                        "class": events.IncidentPenaltyEvent,
+                        "args": {
+                            key: value
+                            for key, value in config.items()
+                            if key != "run_in_process"
+                        },
+                        "process": config.get("run_in_process", False),
+                    }
                 )
 
             # Add Scheduled Messages (only if enabled)
@@ -2735,6 +2775,7 @@ class RaceControlApp:
                             ],
                             "max_laps_behind_leader": config["max_laps_behind_leader"],
                         },
+                        "process": config.get("run_in_process", False),
                     }
                 )
 
@@ -2805,9 +2846,18 @@ class RaceControlApp:
                     }
                 )
 
+            # Events selected to run in a process of their own are built there
+            worker_events = [
+                (item["class"], item["args"])
+                for item in event_list
+                if item.get("process")
+            ]
+
             # Create event instances with error handling
             event_instances = []
             for i, item in enumerate(event_list):
+                if item.get("process"):
+                    continue
                 try:
                     event_instance = item["class"](**item["args"])
                     event_instances.append(event_instance)
@@ -2835,10 +2885,14 @@ class RaceControlApp:
 
             if logger:
                 logger.info(f"Started {len(event_instances)} events successfully")
+                if worker_events:
+                    logger.info(f"Starting {len(worker_events)} events in workers")
 
             # Create and start subprocess manager
             event_run_methods = [event.run for event in event_instances]
-            self.subprocess_manager = SubprocessManager(event_run_methods)
+            self.subprocess_manager = SubprocessManager(
+                event_run_methods, workers=worker_events
+            )
             self.subprocess_manager.start()
 
             # Start chat consumer refresh task if enabled
@@ -1,66 +1,155 @@
 import queue
 import threading
 
+from modules.chat import (
+    ChatDispatcher,
+    ClipboardTransport,
+    get_chat_dispatcher,
+    get_or_create_chat_dispatcher,
+)
+from modules.event_runtime import EventRuntime, run_in_thread
+from modules.event_workers import RELAYED_QUEUES, EventWorker, get_worker_context
+from modules.telemetry import SharedTelemetryWriter, get_hub, get_or_create_hub
+
+# Seconds stop() waits for each event thread to notice the cancel event.
+THREAD_JOIN_TIMEOUT = 10
+
+
+def create_hub():
+    """
+    Gets the shared telemetry hub, connecting to the sim if no event has yet.
+
+    Returns:
+        TelemetryHub: The hub.
+    """
+    import pywinauto
+
+    from modules.events.base_event import IRSDK
+    from modules.telemetry import TelemetryHub
+
+    hub = get_or_create_hub(lambda: TelemetryHub(IRSDK(), pywinauto.Application()))
+    hub.connect()
+    return hub
+
 
 class SubprocessManager:
     """
-    Manages subprocesses using threading.
+    Runs a session's events on one EventRuntime.
+
+    Events' ``run`` methods are run as coroutines through the event's
+    ``run_async`` where it has one; other callables run on a thread of their
+    own, as they always have.
+
+    Events given as ``workers`` instead run in processes of their own, reading
+    telemetry the hub publishes to shared memory.  The cancel and busy events
+    are then shared with those processes.
 
     Attributes:
         stopped (bool): Indicates if the subprocess manager is stopped.
         cancel_event (threading.Event): Event to signal cancellation.
         busy_event (threading.Event): Event to signal busy state.
         chat_lock (threading.Lock): Lock to ensure thread-safe access to chat method.
-        threads (list): List of threads for the subprocesses.
+        runtime (EventRuntime): The loop the events run on.
+        futures (list): A concurrent.futures.Future per event, resolved when it finishes.
+        workers (list): An EventWorker per event run in a process of its own.
     """
 
-    def __init__(self, coros):
+    def __init__(self, coros, workers=()):
         """
         Initializes the SubprocessManager class.
 
         Args:
-            coros (list): List of coroutine functions to be run in threads.
+            coros (list): The events' run methods, or other functions taking the shared objects.
+            workers (list, optional): (event class, keyword arguments) for each event to run in a process of its own. Defaults to none.
         """
         self.stopped = False
-        self.cancel_event = threading.Event()
-        self.busy_event = threading.Event()
+        self.hub = None
+        self.writer = None
+        self.workers = [EventWorker(event_class, args) for event_class, args in workers]
+        if self.workers:
+            context = get_worker_context()
+            self.cancel_event = context.Event()
+            self.busy_event = context.Event()
+        else:
+            self.cancel_event = threading.Event()
+            self.busy_event = threading.Event()
         self.chat_lock = threading.Lock()
         self.audio_queue = queue.Queue()
         self.broadcast_text_queue = queue.Queue()
         self.chat_consumer_queue = queue.Queue()
-        self.threads = [
-            threading.Thread(
-                target=coro,
-                kwargs={
-                    "cancel_event": self.cancel_event,
-                    "busy_event": self.busy_event,
-                    "chat_lock": self.chat_lock,
-                    "audio_queue": self.audio_queue,
-                    "broadcast_text_queue": self.broadcast_text_queue,
-                    "chat_consumer_queue": self.chat_consumer_queue,
-                },
-            )
-            for coro in coros
-        ]
+        self.coros = list(coros)
+        self.runtime = EventRuntime()
+        self.futures = []
+
+    @property
+    def threads(self):
+        """
+        list: The threads running events' synchronous code.
+        """
+        return self.runtime.threads
 
     def start(self):
         """
-        Starts all threads.
+        Starts all events, and the shared telemetry hub if the events use one.
         """
+        self.hub = get_hub()
+        if self.hub is None and self.workers:
+            self.hub = create_hub()
+        if self.hub is not None:
+            self.hub.start()
         self.cancel_event.clear()
-        for thread in self.threads:
-            thread.start()
+        kwargs = {
+            "cancel_event": self.cancel_event,
+            "busy_event": self.busy_event,
+            "chat_lock": self.chat_lock,
+            "audio_queue": self.audio_queue,
+            "broadcast_text_queue": self.broadcast_text_queue,
+            "chat_consumer_queue": self.chat_consumer_queue,
+        }
+        for coro in self.coros:
+            event = getattr(coro, "__self__", None)
+            if getattr(coro, "__name__", None) == "run" and hasattr(event, "run_async"):
+                self.futures.append(self.runtime.submit(event.run_async(**kwargs)))
+            else:
+                self.futures.append(self.runtime.submit(run_in_thread(coro, **kwargs)))
+        if self.workers:
+            self.start_workers(kwargs)
+
+    def start_workers(self, kwargs):
+        """
+        Starts publishing telemetry to shared memory and starts the workers.
+
+        Args:
+            kwargs (dict): The shared objects the events run with.
+        """
+        hub = self.hub
+        self.writer = SharedTelemetryWriter(hub)
+        self.writer.start()
+        chat_dispatcher = get_or_create_chat_dispatcher(
+            lambda: ChatDispatcher(
+                ClipboardTransport(hub.view(), hub.pwa), lock=self.chat_lock
+            )
+        )
+        for worker in self.workers:
+            worker.start(
+                self.writer,
+                chat_dispatcher,
+                kwargs["cancel_event"],
+                kwargs["busy_event"],
+                **{name: kwargs[name] for name in RELAYED_QUEUES},
+            )
 
     def stop(self):
         """
-        Sets the cancel event to stop all threads.
+        Sets the cancel event and stops all events.
         """
         self.cancel_event.set()
+        # Coroutines are cancelled straight away.
+        self.runtime.stop()
 
-        # send sigterm to any threads that remain
         # Wait for threads to finish gracefully
         for thread in self.threads:
-            thread.join(timeout=10)
+            thread.join(timeout=THREAD_JOIN_TIMEOUT)
         # Forcibly kill any threads that are still alive
         for thread in self.threads:
             if thread.is_alive():
@@ -78,3 +167,15 @@ class SubprocessManager:
                         raise SystemError("PyThreadState_SetAsyncExc failed")
                 except Exception as e:
                     print(f"Failed to forcibly kill thread {thread.name}: {e}")
+        for worker in self.workers:
+            worker.stop()
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+        # Drop any chat still queued by the stopped events.
+        dispatcher = get_chat_dispatcher()
+        if dispatcher is not None:
+            dispatcher.stop()
+        if self.hub is not None:
+            self.hub.stop()
+            self.hub = None
@@ -0,0 +1,31 @@
+from modules.telemetry.hub import (
+    TelemetryHub,
+    TelemetrySnapshot,
+    TelemetryView,
+    get_hub,
+    get_or_create_hub,
+    has_hub,
+    set_hub,
+)
+from modules.telemetry.class_pace import ClassPace, get_class_pace
+from modules.telemetry.driver_directory import DriverDirectory, get_driver_directory
+from modules.telemetry.field_classification import FieldClassification
+from modules.telemetry.field_snapshot import FieldSnapshot
+from modules.telemetry.incident_tracker import IncidentTracker, IncidentWindow
+from modules.telemetry.incident_stream import (
+    IncidentEvent,
+    IncidentKind,
+    IncidentStream,
+    IncidentSubscription,
+    get_incident_stream,
+)
+from modules.telemetry.leader_lap import get_leader_lap
+from modules.telemetry.pit_lane import PitLaneTracker, get_pit_lane_tracker
+from modules.telemetry.speed_estimator import SpeedEstimator, get_speed_estimator
+from modules.telemetry.step_delta import StepDelta
+from modules.telemetry.shared_memory import SharedTelemetrySDK, SharedTelemetryWriter
+from modules.telemetry.track_model import (
+    TrackModel,
+    get_track_model,
+    parse_track_length,
+)
@@ -0,0 +1,150 @@
+import threading
+import weakref
+
+import numpy as np
+
+from modules.telemetry.incident_stream import SESSION_RESTART_TICKS
+
+# Lap time reported for a class nobody in it has set a time for yet.
+NO_LAP_TIME = 999999
+
+
+class ClassPace:
+    """
+    Fastest lap per car class, and the classes ranked by it, for a session.
+
+    A car's lap time is its best lap, or its last lap if it doesn't have a best
+    lap yet.  Each update only recomputes the classes of cars whose lap time
+    changed, so reading the pace every tick costs almost nothing.  Class
+    membership is only reread when DriverInfo changes, and then only the
+    classes cars moved between are recomputed.
+
+    Every caller updates the pace with its own view; ticks older than the
+    last update are ignored.
+
+    Attributes:
+        tick (int): The SessionTick of the last update.
+        class_lap_times (dict): Fastest lap time keyed by CarIdxClass, in order
+            of first appearance in CarIdxClass.  NO_LAP_TIME for classes without one.
+        class_speed_rank (dict): Rank of each class by lap time, fastest first,
+            as strings starting at '1'.
+    """
+
+    def __init__(self):
+        self.tick = None
+        self.class_lap_times = {}
+        self.class_speed_rank = {}
+        self._driver_info = None
+        self._classes = None
+        self._lap_times = None
+        self._lock = threading.Lock()
+
+    def update(self, sdk, tick=None):
+        """
+        Updates the pace from the sdk's current lap times.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.
+            tick (int, optional): The SessionTick being read. Defaults to sdk["SessionTick"].
+
+        Returns:
+            ClassPace: This ClassPace.
+        """
+        if tick is None:
+            tick = sdk["SessionTick"]
+        if self._is_stale(tick):
+            return self
+        with self._lock:
+            if self._is_stale(tick):
+                return self
+            if self.tick is not None and tick <= self.tick:
+                # A new session: nothing carries over.
+                self.class_lap_times = {}
+                self._driver_info = None
+                self._classes = None
+                self._lap_times = None
+            best = np.asarray(sdk["CarIdxBestLapTime"], dtype=np.float64)
+            last = np.asarray(sdk["CarIdxLastLapTime"], dtype=np.float64)
+            lap_times = np.where(best > 0, best, last)
+
+            classes = self._classes
+            changed = set()
+            driver_info = sdk["DriverInfo"]
+            if classes is None or driver_info is not self._driver_info:
+                classes = np.asarray(sdk["CarIdxClass"])
+                changed = self._moved_classes(classes)
+                self._driver_info = driver_info
+            if self._lap_times is not None and len(self._lap_times) == len(lap_times):
+                changed.update(classes[lap_times != self._lap_times].tolist())
+            else:
+                changed.update(classes.tolist())
+
+            if changed:
+                class_lap_times = {
+                    car_class: self.class_lap_times.get(car_class)
+                    for car_class in dict.fromkeys(classes.tolist())
+                }
+                for car_class in changed & class_lap_times.keys():
+                    times = lap_times[(classes == car_class) & (lap_times > 0)]
+                    class_lap_times[car_class] = (
+                        float(times.min()) if len(times) else NO_LAP_TIME
+                    )
+                # Publish new dicts rather than mutating, so readers holding
+                # the old ones see a consistent table.
+                self.class_lap_times = class_lap_times
+                self.class_speed_rank = {
+                    car_class: str(i + 1)
+                    for i, car_class in enumerate(
+                        sorted(class_lap_times, key=class_lap_times.get)
+                    )
+                }
+            self._classes = classes
+            self._lap_times = lap_times
+            self.tick = tick
+        return self
+
+    def _is_stale(self, tick):
+        if self.tick is None:
+            return False
+        return self.tick - SESSION_RESTART_TICKS < tick <= self.tick
+
+    def _moved_classes(self, classes):
+        # The classes any car left or joined, or every class if the field's
+        # size changed.
+        if self._classes is None or len(self._classes) != len(classes):
+            return set(classes.tolist())
+        moved = classes != self._classes
+        return set(classes[moved].tolist()) | set(self._classes[moved].tolist())
+
+    def fastest_lap(self, car_class):
+        """
+        Gets the fastest lap for a class, or None if no car is in the class.
+        """
+        return self.class_lap_times.get(car_class)
+
+
+# One ClassPace per telemetry source: the hub when events share one, and
+# otherwise the sdk itself.
+_paces = weakref.WeakKeyDictionary()
+_paces_lock = threading.Lock()
+
+
+def get_class_pace(sdk):
+    """
+    Gets the ClassPace shared by every event reading the same telemetry,
+    updated to the sdk's current tick.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.
+
+    Returns:
+        ClassPace: The pace shared by every caller in the session.
+    """
+    source = getattr(sdk, "hub", None)
+    if source is None:
+        source = sdk
+    with _paces_lock:
+        pace = _paces.get(source)
+        if pace is None:
+            pace = _paces[source] = ClassPace()
+    return pace.update(sdk)
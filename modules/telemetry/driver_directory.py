@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+
+
+class DriverDirectory:
+    """
+    O(1) lookups into ``DriverInfo["Drivers"]``, built once per session info update.
+
+    Lookups by car number and user name return the first matching driver,
+    the same record the list comprehensions they replace would have found.
+
+    Attributes:
+        driver_info (dict): The DriverInfo the directory was built from.
+        drivers (list): Every driver record, in DriverInfo order.
+        entries (list): Every driver record except the pace car.
+        pace_car_idx (int): CarIdx of the pace car, or None if there isn't one.
+    """
+
+    def __init__(self, driver_info):
+        """
+        Initializes the DriverDirectory.
+
+        Args:
+            driver_info (dict): The session's DriverInfo, as returned by sdk["DriverInfo"].
+        """
+        self.driver_info = driver_info
+        self.drivers = list(driver_info["Drivers"])
+        self.entries = [d for d in self.drivers if d["CarIsPaceCar"] != 1]
+        self.pace_car_idx = next(
+            (d["CarIdx"] for d in self.drivers if d["CarIsPaceCar"] == 1), None
+        )
+        self._by_car_idx = {}
+        self._by_car_number = {}
+        self._by_user_name = {}
+        self._by_class = {}
+        for d in self.drivers:
+            self._by_car_idx.setdefault(d["CarIdx"], d)
+            self._by_car_number.setdefault(d["CarNumber"], d)
+            if "UserName" in d:
+                self._by_user_name.setdefault(d["UserName"], d)
+        for d in self.entries:
+            self._by_class.setdefault(d.get("CarClassID"), []).append(d["CarIdx"])
+
+    def __len__(self):
+        return len(self.drivers)
+
+    def by_car_idx(self, car_idx):
+        """
+        Gets the driver record for a CarIdx, or None.
+        """
+        return self._by_car_idx.get(car_idx)
+
+    def by_car_number(self, car_number):
+        """
+        Gets the driver record for a car number, or None.
+        """
+        return self._by_car_number.get(car_number)
+
+    def by_user_name(self, user_name):
+        """
+        Gets the driver record for a user name, or None.
+        """
+        return self._by_user_name.get(user_name)
+
+    def car_number(self, car_idx):
+        """
+        Gets the car number for a CarIdx.
+
+        Raises:
+            KeyError: If no driver has the CarIdx.
+        """
+        return self._by_car_idx[car_idx]["CarNumber"]
+
+    def car_idx(self, car_number):
+        """
+        Gets the CarIdx for a car number.
+
+        Raises:
+            KeyError: If no driver has the car number.
+        """
+        return self._by_car_number[car_number]["CarIdx"]
+
+    def in_class(self, car_class_id):
+        """
+        Gets the CarIdx of every entry in a class, using DriverInfo's CarClassID.
+
+        Returns:
+            list: CarIdx of the entries in the class, in DriverInfo order.
+        """
+        return list(self._by_class.get(car_class_id, ()))
+
+    def is_pace_car(self, car_idx):
+        return car_idx == self.pace_car_idx
+
+
+# DriverInfo dicts are only replaced when the sim publishes a session info
+# update, so the identity of the dict stands in for the update counter.  The
+# dicts are held here, which keeps their ids from being reused.
+_MAX_CACHED = 8
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_driver_directory(sdk):
+    """
+    Gets the DriverDirectory for the sdk's current DriverInfo.
+
+    The directory is rebuilt only when DriverInfo changes, and is shared by
+    every caller reading the same DriverInfo.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.
+
+    Returns:
+        DriverDirectory: The directory for the current session info.
+    """
+    driver_info = sdk["DriverInfo"]
+    key = id(driver_info)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached.driver_info is driver_info:
+            _cache.move_to_end(key)
+            return cached
+    directory = DriverDirectory(driver_info)
+    with _cache_lock:
+        _cache[key] = directory
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_CACHED:
+            _cache.popitem(last=False)
+    return directory
@@ -0,0 +1,66 @@
+class FieldClassification:
+    """
+    Sorts one tick's field into lapped and pit road cars.
+
+    Built from a FieldSnapshot with array operations once per tick and shared
+    by every caller, instead of each caller recomputing every car's distance
+    and the leader's laps.  Results that depend on ``max_laps_behind_leader``
+    are cached per value.
+
+    Lapped cars are measured against the furthest car of any kind, pace car
+    included, as ``BaseEvent.get_lap_down_cars`` always has.
+
+    Attributes:
+        field (FieldSnapshot): The snapshot the classification was built from.
+        max_distance_covered (float): Laps plus lap fraction of the furthest car, pace car included.
+        max_lap_completed (int): Most laps completed by any car, pace car included.
+        on_pit_road (np.ndarray): CarIdx of the entries on pit road, in DriverInfo order.
+    """
+
+    def __init__(self, field):
+        """
+        Initializes the FieldClassification.
+
+        Args:
+            field (FieldSnapshot): The tick's field.
+        """
+        self.field = field
+        self.max_distance_covered = float(field.total_completed.max())
+        self.max_lap_completed = int(field.lap_completed.max())
+        self.on_pit_road = field.car_idx[field.on_pit_road[field.car_idx]]
+        self._lapped = {}
+
+    def lapped(self, max_laps_behind_leader=99):
+        """
+        Gets the entries at least a lap down, as ``BaseEvent.get_lap_down_cars``.
+
+        Args:
+            max_laps_behind_leader (int, optional): Maximum laps down to be considered in the field. Defaults to 99.
+
+        Returns:
+            np.ndarray: CarIdx of the lapped cars, furthest round first.
+        """
+        lapped = self._lapped.get(max_laps_behind_leader)
+        if lapped is None:
+            order = self.field.order
+            totals = self.field.total_completed[order]
+            furthest = self.max_distance_covered
+            lapped = self._lapped[max_laps_behind_leader] = order[
+                (furthest - 1 >= totals)
+                & (totals >= furthest - max_laps_behind_leader - 1)
+            ]
+        return lapped
+
+    def wave_arounds(self, max_laps_behind_leader=99):
+        """
+        Gets the lapped cars close enough to the leader to be waved around.
+
+        Args:
+            max_laps_behind_leader (int, optional): Maximum laps down to be considered in the field. Defaults to 99.
+
+        Returns:
+            np.ndarray: CarIdx of the cars, furthest round first.
+        """
+        lapped = self.lapped(max_laps_behind_leader)
+        laps = self.field.lap_completed[lapped]
+        return lapped[laps >= self.max_lap_completed - max_laps_behind_leader]
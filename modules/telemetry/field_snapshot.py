@@ -0,0 +1,125 @@
+import numpy as np
+
+from modules.telemetry.driver_directory import get_driver_directory
+
+
+class FieldSnapshot:
+    """
+    The whole field for one telemetry tick, as NumPy arrays indexed by CarIdx.
+
+    Built once per tick and shared by every caller, instead of each caller
+    rebuilding a list of per-car dicts from individual ``sdk[...]`` lookups.
+
+    Attributes:
+        tick (int): The SessionTick the snapshot was built from, if known.
+        car_idx (np.ndarray): CarIdx of every non-pace-car entry, in DriverInfo order.
+        car_numbers (dict): CarNumber keyed by CarIdx for every entry.
+        lap_completed (np.ndarray): CarIdxLapCompleted.
+        lap_dist_pct (np.ndarray): CarIdxLapDistPct.
+        on_pit_road (np.ndarray): CarIdxOnPitRoad as booleans.
+        last_lap_time (np.ndarray): CarIdxLastLapTime.
+        f2_time (np.ndarray): CarIdxF2Time.
+        session_flags (np.ndarray): CarIdxSessionFlags, or None if the sdk doesn't provide them.
+        total_completed (np.ndarray): lap_completed + lap_dist_pct.
+        order (np.ndarray): CarIdx of every entry, sorted by total_completed, leader first.
+    """
+
+    def __init__(self, sdk, tick=None):
+        """
+        Initializes the FieldSnapshot from the current sdk state.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+            tick (int, optional): The SessionTick being read. Defaults to None.
+        """
+        self.tick = tick
+        drivers = get_driver_directory(sdk).entries
+        self.car_idx = np.array([d["CarIdx"] for d in drivers], dtype=np.intp)
+        self.car_numbers = {d["CarIdx"]: d["CarNumber"] for d in drivers}
+
+        # Keep the raw sequences for the dict view so its values are exactly
+        # what sdk[...] would have returned.
+        self._raw = {
+            "LapCompleted": sdk["CarIdxLapCompleted"],
+            "LapDistPct": sdk["CarIdxLapDistPct"],
+            "InPits": sdk["CarIdxOnPitRoad"],
+            "last_lap_time": sdk["CarIdxLastLapTime"],
+            "f2time": sdk["CarIdxF2Time"],
+        }
+        self.lap_completed = np.asarray(self._raw["LapCompleted"])
+        self.lap_dist_pct = np.asarray(self._raw["LapDistPct"], dtype=np.float64)
+        self.on_pit_road = np.asarray(self._raw["InPits"], dtype=bool)
+        self.last_lap_time = np.asarray(self._raw["last_lap_time"], dtype=np.float64)
+        self.f2_time = np.asarray(self._raw["f2time"], dtype=np.float64)
+        try:
+            self.session_flags = np.asarray(sdk["CarIdxSessionFlags"], dtype=np.int64)
+        except KeyError:
+            self.session_flags = None
+        self.total_completed = self.lap_completed + self.lap_dist_pct
+
+        # A stable sort on the negated distance keeps tied cars in DriverInfo
+        # order, matching list.sort(reverse=True) on the dict view.
+        entry_totals = self.total_completed[self.car_idx]
+        self.order = self.car_idx[np.argsort(-entry_totals, kind="stable")]
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def leader(self):
+        """
+        int: CarIdx of the car furthest around the track.
+        """
+        return int(self.order[0])
+
+    @property
+    def max_total_completed(self):
+        """
+        float: Laps plus lap fraction completed by the leader.
+        """
+        return float(self.total_completed[self.order].max())
+
+    def in_field(self, max_laps_behind_leader=99):
+        """
+        Gets the running order, without cars too far behind the leader.
+
+        Args:
+            max_laps_behind_leader (int, optional): Maximum laps down to be considered in the field. Defaults to 99.
+
+        Returns:
+            np.ndarray: CarIdx of the cars in the field, leader first.
+        """
+        if not len(self.order):
+            return self.order
+        totals = self.total_completed[self.order]
+        return self.order[totals >= totals[0] - max_laps_behind_leader - 1]
+
+    def running_order(self, max_laps_behind_leader=99):
+        """
+        Gets the running order as a list of dicts, as returned by
+        ``BaseEvent.get_current_running_order``.
+
+        The dicts are built fresh on every call, so callers may modify them.
+
+        Args:
+            max_laps_behind_leader (int, optional): Maximum laps down to be considered in the field. Defaults to 99.
+
+        Returns:
+            list: List of dictionaries representing the running order.
+        """
+        raw = self._raw
+        lap_completed = raw["LapCompleted"]
+        lap_dist_pct = raw["LapDistPct"]
+        return [
+            {
+                "CarIdx": car_idx,
+                "CarNumber": self.car_numbers[car_idx],
+                "LapCompleted": lap_completed[car_idx],
+                "LapDistPct": lap_dist_pct[car_idx],
+                "InPits": raw["InPits"][car_idx],
+                "total_completed": lap_completed[car_idx] + lap_dist_pct[car_idx],
+                "last_lap_time": raw["last_lap_time"][car_idx],
+                "f2time": raw["f2time"][car_idx],
+            }
+            for car_idx in self.in_field(max_laps_behind_leader).tolist()
+        ]
@@ -0,0 +1,449 @@
+import logging
+import threading
+import time
+
+# Session info (YAML) keys.  iRacing only re-publishes these when the header's
+# session_info_update counter changes, so the hub carries them over between
+# snapshots instead of re-reading them every tick.
+SESSION_INFO_KEYS = (
+    "WeekendInfo",
+    "DriverInfo",
+    "SplitTimeInfo",
+)
+
+# Telemetry keys read by the events.  Anything else an event asks for is read
+# through the hub the first time and added to this set from then on.
+TELEMETRY_KEYS = (
+    "SessionTick",
+    "SessionNum",
+    "SessionTime",
+    "SessionTimeTotal",
+    "SessionTimeRemain",
+    "SessionLapsRemain",
+    "SessionLapsTotal",
+    "SessionState",
+    "SessionFlags",
+    "PlayerCarIdx",
+    "IsGarageVisible",
+    "WeatherDeclaredWet",
+    "CarIdxLap",
+    "CarIdxLapCompleted",
+    "CarIdxLapDistPct",
+    "CarIdxOnPitRoad",
+    "CarIdxClass",
+    "CarIdxLastLapTime",
+    "CarIdxBestLapTime",
+    "CarIdxF2Time",
+    "CarIdxSessionFlags",
+    "CarIdxPaceFlags",
+)
+
+# Minimum time between two synchronous samples when the hub thread isn't
+# running.  iRacing publishes at 60 Hz, so sampling faster is wasted work.
+TICK_PERIOD = 1 / 60
+# Minimum time between attempts to reattach to a sim that isn't running.
+RECONNECT_INTERVAL = 1.0
+
+
+class TelemetrySnapshot:
+    """
+    Immutable telemetry for a single SessionTick, shared by every event.
+
+    Array values are stored as tuples so that one event can't modify what the
+    others see.  Session info dicts are shared as-is, exactly as irsdk shares
+    its parsed YAML between callers.
+
+    Attributes:
+        tick (int): The SessionTick the snapshot was taken on.
+        session_info_update (int): The session info counter at sampling time, if known.
+    """
+
+    __slots__ = ("tick", "session_info_update", "_values", "_memo", "_memo_lock")
+
+    def __init__(self, tick, values, session_info_update=None):
+        self.tick = tick
+        self.session_info_update = session_info_update
+        self._values = values
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def keys(self):
+        return self._values.keys()
+
+    def memo(self, name, factory):
+        """
+        Returns a value derived from this snapshot, computing it at most once.
+
+        Lets several events share per-tick derived data (the running order,
+        for example) without each one rebuilding it.
+
+        Args:
+            name (hashable): Cache key for the derived value.
+            factory (callable): Computes the value on the first request.
+        """
+        try:
+            return self._memo[name]
+        except KeyError:
+            pass
+        with self._memo_lock:
+            if name not in self._memo:
+                self._memo[name] = factory()
+            return self._memo[name]
+
+    def _add(self, key, value):
+        self._values[key] = _freeze(value)
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+class TelemetryHub:
+    """
+    Owns the single IRSDK connection and publishes one snapshot per SessionTick.
+
+    Events read from the hub through a TelemetryView, which keeps the
+    ``sdk[key]`` / ``freeze_var_buffer_latest`` interface they already use.
+
+    Attributes:
+        sdk (irsdk.IRSDK): The only IRSDK instance in the process.
+        pwa (pywinauto.Application): The pywinauto Application connected to the sim.
+        keys (list): Keys read into every snapshot.
+        lock (threading.RLock): Serialises access to the underlying sdk.
+        connected (bool): Whether the sdk started and is still connected to the sim.
+    """
+
+    def __init__(self, sdk, pwa=None, keys=TELEMETRY_KEYS + SESSION_INFO_KEYS):
+        self.sdk = sdk
+        self.pwa = pwa
+        self.keys = list(keys)
+        self.lock = threading.RLock()
+        self.connected = False
+        self.thread = None
+        self._pwa_connected = False
+        self._connect_attempted_at = None
+        self.users = 0
+        self._stop = threading.Event()
+        self._ticked = threading.Condition()
+        self._snapshot = None
+        self._sampled_at = 0.0
+        from modules.logging_context import get_logger
+
+        self.logger = logging.LoggerAdapter(
+            get_logger() or logging.getLogger(__name__), {"event": "TelemetryHub"}
+        )
+
+    def connect(self):
+        """
+        Starts the sdk and connects pywinauto to the sim.
+
+        Does nothing while the sdk is connected.  If the sim wasn't running
+        when the sdk last started, or has since been restarted, the sdk is
+        restarted, at most once every RECONNECT_INTERVAL.
+
+        Returns:
+            bool: True if the sdk is connected.
+        """
+        with self.lock:
+            if self.connected and getattr(self.sdk, "is_connected", True):
+                return True
+            self.connected = False
+            now = time.monotonic()
+            if (
+                self._connect_attempted_at is not None
+                and now - self._connect_attempted_at < RECONNECT_INTERVAL
+            ):
+                return False
+            self._connect_attempted_at = now
+            self.sdk.shutdown()
+            if not self.sdk.startup():
+                self.logger.debug("Sim not running; will retry.")
+                return False
+            if self.pwa is not None and not self._pwa_connected:
+                self.pwa.connect(best_match="iRacing.com Simulator", timeout=10)
+                self._pwa_connected = True
+            self.connected = True
+            return True
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """
+        Starts the sampling thread, or registers another user of a running one.
+        """
+        with self.lock:
+            self.users += 1
+            if self.running:
+                return
+            self.connect()
+            self._stop.clear()
+            self.thread = threading.Thread(
+                target=self._sample_loop, name="TelemetryHub", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self):
+        """
+        Releases one user and stops the sampling thread once nobody needs it.
+        Wakes anything waiting on a tick.
+        """
+        with self.lock:
+            self.users = max(0, self.users - 1)
+            if self.users:
+                return
+        self._stop.set()
+        with self._ticked:
+            self._ticked.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        self.thread = None
+        with self.lock:
+            if not self.users:
+                # Reattach when next used, in case the sim restarts in between.
+                self.connected = False
+                self._pwa_connected = False
+                self._connect_attempted_at = None
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            try:
+                previous = self._snapshot
+                snapshot = self.sample()
+                if snapshot is previous:
+                    # freeze_var_buffer_latest already waited up to one tick
+                    # for new data; the sim is paused or disconnected.
+                    self._stop.wait(TICK_PERIOD)
+            except Exception as e:
+                self.logger.debug(f"Error sampling telemetry: {e}")
+                self._stop.wait(1)
+
+    def sample(self):
+        """
+        Reads the latest telemetry buffer and publishes it if the tick is new.
+
+        Returns:
+            TelemetrySnapshot: The latest snapshot.
+        """
+        self.connect()
+        with self.lock:
+            self.sdk.freeze_var_buffer_latest()
+            try:
+                self._sampled_at = time.monotonic()
+                tick = self.sdk["SessionTick"]
+                previous = self._snapshot
+                if previous is not None and tick == previous.tick:
+                    return previous
+                snapshot = self._read(tick, previous)
+            finally:
+                self.sdk.unfreeze_var_buffer_latest()
+        with self._ticked:
+            self._snapshot = snapshot
+            self._ticked.notify_all()
+        return snapshot
+
+    def _read(self, tick, previous):
+        session_info_update = getattr(self.sdk, "session_info_update", None)
+        reuse_session_info = (
+            previous is not None
+            and session_info_update is not None
+            and session_info_update == previous.session_info_update
+        )
+        values = {}
+        for key in self.keys:
+            if reuse_session_info and key in SESSION_INFO_KEYS and key in previous:
+                values[key] = previous[key]
+                continue
+            try:
+                values[key] = _freeze(self.sdk[key])
+            except KeyError:
+                continue
+        return TelemetrySnapshot(tick, values, session_info_update)
+
+    @property
+    def latest(self):
+        """
+        The most recent snapshot.  Samples on demand if the hub thread isn't running.
+        """
+        if not self.running and (
+            self._snapshot is None or time.monotonic() - self._sampled_at >= TICK_PERIOD
+        ):
+            return self.sample()
+        if self._snapshot is None:
+            return self.wait_for_tick()
+        return self._snapshot
+
+    def wait_for_tick(self, after_tick=None, timeout=None, cancel_event=None):
+        """
+        Blocks until a snapshot newer than ``after_tick`` is published.
+
+        Args:
+            after_tick (int, optional): Return once a snapshot with a later tick exists. Defaults to None, meaning any snapshot.
+            timeout (float, optional): Maximum seconds to wait. Defaults to None.
+            cancel_event (threading.Event, optional): Stop waiting at the next tick or timeout once set. Defaults to None.
+
+        Returns:
+            TelemetrySnapshot: The newest snapshot, which may be stale if the wait timed out.
+        """
+        if not self.running:
+            return self.latest
+
+        def ready():
+            if cancel_event is not None and cancel_event.is_set():
+                return True
+            return self._stop.is_set() or (
+                self._snapshot is not None
+                and (after_tick is None or self._snapshot.tick != after_tick)
+            )
+
+        with self._ticked:
+            self._ticked.wait_for(ready, timeout=timeout)
+            return self._snapshot
+
+    def read_through(self, snapshot, key):
+        """
+        Reads a key that isn't part of the snapshot directly from the sdk.
+
+        The key is added to ``keys`` so later snapshots include it, and to the
+        given snapshot so other events on the same tick see the same value.
+
+        Raises:
+            KeyError: If the sdk doesn't know the key.
+        """
+        with self.lock:
+            value = self.sdk[key]
+            if key not in self.keys:
+                self.keys.append(key)
+            if snapshot is not None:
+                snapshot._add(key, value)
+        return _freeze(value)
+
+    def chat_command(self, chat_command_mode):
+        with self.lock:
+            return self.sdk.chat_command(chat_command_mode)
+
+    def view(self):
+        """
+        Returns a new TelemetryView for one event.
+        """
+        return TelemetryView(self)
+
+
+class TelemetryView:
+    """
+    Per-event handle onto a TelemetryHub with the same interface as irsdk.IRSDK.
+
+    ``freeze_var_buffer_latest`` pins the hub's newest snapshot so every read
+    until ``unfreeze_var_buffer_latest`` comes from the same tick.  Reads while
+    unfrozen always see the newest snapshot.
+
+    Attributes:
+        hub (TelemetryHub): The hub this view reads from.
+    """
+
+    def __init__(self, hub):
+        self.hub = hub
+        self._frozen = None
+
+    def __bool__(self):
+        return True
+
+    def __getitem__(self, key):
+        snapshot = self.snapshot
+        try:
+            return snapshot[key]
+        except KeyError:
+            return self.hub.read_through(snapshot, key)
+
+    @property
+    def snapshot(self):
+        """
+        TelemetrySnapshot: The pinned snapshot if frozen, otherwise the hub's latest.
+        """
+        return self._frozen if self._frozen is not None else self.hub.latest
+
+    @property
+    def session_info_update(self):
+        return self.snapshot.session_info_update
+
+    def freeze_var_buffer_latest(self):
+        self._frozen = None
+        self._frozen = self.hub.latest
+
+    def unfreeze_var_buffer_latest(self):
+        self._frozen = None
+
+    def startup(self, *args, **kwargs):
+        self.hub.connect()
+        return True
+
+    def shutdown(self):
+        # The hub owns the connection; one event shutting down must not
+        # disconnect the others.
+        return
+
+    def chat_command(self, chat_command_mode=1):
+        return self.hub.chat_command(chat_command_mode)
+
+
+# Global hub instance, shared by every event that doesn't bring its own sdk.
+_global_hub = None
+_global_hub_lock = threading.Lock()
+
+
+def set_hub(hub):
+    """
+    Set the global telemetry hub.
+
+    Args:
+        hub: The TelemetryHub to share, or None to clear it
+    """
+    global _global_hub
+    _global_hub = hub
+    return hub
+
+
+def get_hub():
+    """
+    Get the global telemetry hub.
+
+    Returns:
+        The global TelemetryHub, or None if not set
+    """
+    return _global_hub
+
+
+def has_hub():
+    """
+    Check if a telemetry hub has been created.
+
+    Returns:
+        True if a hub is set, False otherwise
+    """
+    return _global_hub is not None
+
+
+def get_or_create_hub(factory):
+    """
+    Get the global telemetry hub, creating it with ``factory`` if needed.
+
+    Args:
+        factory: Callable returning a new TelemetryHub
+
+    Returns:
+        The global TelemetryHub
+    """
+    with _global_hub_lock:
+        if _global_hub is None:
+            set_hub(factory())
+        return _global_hub
@@ -0,0 +1,311 @@
+import queue
+import threading
+import weakref
+from collections import namedtuple
+from enum import Enum
+
+from modules.telemetry.driver_directory import get_driver_directory
+from modules.telemetry.field_snapshot import FieldSnapshot
+from modules.telemetry.incident_tracker import IncidentTracker
+from modules.telemetry.step_delta import StepDelta
+
+# SessionState once the leader has taken the checkered flag.
+SESSION_STATE_CHECKERED = 5
+# A SessionTick this far behind the last update means a new session started,
+# rather than a subscriber's view lagging the others.
+SESSION_RESTART_TICKS = 600
+
+
+class IncidentKind(Enum):
+    """
+    What an IncidentEvent reports.
+
+    INCIDENT: The car's incident count went up (``delta`` is 1, 2, 4, ...).
+    COLLISION: The count went up by 4 or more within the subscription's
+        collision window.
+    THRESHOLD: The count reached one of the subscription's thresholds.
+    """
+
+    INCIDENT = "incident"
+    COLLISION = "collision"
+    THRESHOLD = "threshold"
+
+
+class IncidentEvent(
+    namedtuple(
+        "IncidentEvent",
+        [
+            "kind",
+            "car_number",
+            "car_idx",
+            "incidents",
+            "previous",
+            "session_time",
+            "threshold",
+        ],
+        defaults=[None],
+    )
+):
+    """
+    One change in a car's incident count, as published by IncidentStream.
+
+    Attributes:
+        kind (IncidentKind): What the event reports.
+        car_number (str): The car number.
+        car_idx (int): The car's CarIdx.
+        incidents (int): The car's incident count.
+        previous (int): The count before this change.
+        session_time (float): SessionTime of the tick the change was seen on.
+        threshold (int): The threshold reached, for THRESHOLD events.
+    """
+
+    __slots__ = ()
+
+    @property
+    def delta(self):
+        return self.incidents - self.previous
+
+    @property
+    def label(self):
+        """
+        str: The change as the sim shows it, e.g. '4x'.
+        """
+        return f"{self.delta}x"
+
+
+class IncidentSubscription:
+    """
+    One subscriber's view of an IncidentStream.
+
+    Events are queued from the tick the subscription was made on, so a
+    subscriber can poll as often or as rarely as it likes without missing any.
+
+    Attributes:
+        collision_window (float): Seconds for a 4x to count as a collision, or None.
+        thresholds (container): Incident counts to report reaching, or None.
+            A ``range`` describes a recurring threshold cheaply.
+        events (queue.Queue): IncidentEvents not yet polled.
+    """
+
+    def __init__(self, stream, collision_window=None, thresholds=None):
+        self.stream = stream
+        self.collision_window = collision_window
+        self.thresholds = thresholds
+        self.events = queue.Queue()
+
+    def poll(self, sdk):
+        """
+        Updates the stream to the sdk's current tick and gets the events
+        since the last poll.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+
+        Returns:
+            list: IncidentEvents, oldest first.
+        """
+        self.stream.update(sdk)
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        """
+        Stops the subscription receiving events.
+        """
+        self.stream.unsubscribe(self)
+
+    def _publish(self, event, collided):
+        self.events.put(event)
+        if self.collision_window is not None and event.car_number in collided.get(
+            self.collision_window, ()
+        ):
+            self.events.put(event._replace(kind=IncidentKind.COLLISION))
+        if self.thresholds is not None:
+            for threshold in range(event.previous + 1, event.incidents + 1):
+                if threshold in self.thresholds:
+                    self.events.put(
+                        event._replace(kind=IncidentKind.THRESHOLD, threshold=threshold)
+                    )
+
+
+class IncidentStream:
+    """
+    Every car's incident count changes, computed once per tick for every subscriber.
+
+    TeamIncidentCount only changes with a session info update, so a tick on
+    which DriverInfo is unchanged costs one identity check however many
+    incident rules are subscribed.  When it has changed, only cars whose
+    count moved are looked at.
+
+    Cars stop being reported once they have taken the checkered flag.
+
+    Attributes:
+        tick (int): The SessionTick of the last update.
+        session_time (float): The SessionTime of the last update.
+        counts (dict): The latest TeamIncidentCount keyed by car number.
+        finished (set): Car numbers that have taken the checkered flag.
+    """
+
+    def __init__(self):
+        self.tick = None
+        self.session_time = 0.0
+        self.counts = {}
+        self.finished = set()
+        self._driver_info = None
+        self._field = None
+        self._subscriptions = []
+        self._trackers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, collision_window=None, thresholds=None):
+        """
+        Starts receiving this stream's events.
+
+        Args:
+            collision_window (float, optional): Also report a COLLISION when a car's
+                count goes up by 4 or more within this many seconds. Defaults to None.
+            thresholds (container, optional): Also report a THRESHOLD for each of
+                these counts a car reaches. Defaults to None.
+
+        Returns:
+            IncidentSubscription: The subscription.
+        """
+        subscription = IncidentSubscription(self, collision_window, thresholds)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if collision_window is not None and collision_window not in self._trackers:
+                tracker = IncidentTracker(collision_window, carry=True)
+                for car_number, incidents in self.counts.items():
+                    tracker.record(car_number, incidents, self.session_time)
+                self._trackers[collision_window] = tracker
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            windows = {s.collision_window for s in self._subscriptions}
+            for window in list(self._trackers):
+                if window not in windows:
+                    del self._trackers[window]
+
+    def update(self, sdk, tick=None):
+        """
+        Publishes the incident changes since the last update.
+
+        Ticks older than the last update are ignored, so every subscriber can
+        call this with its own view.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+            tick (int, optional): The SessionTick being read. Defaults to sdk["SessionTick"].
+
+        Returns:
+            IncidentStream: This IncidentStream.
+        """
+        if tick is None:
+            tick = sdk["SessionTick"]
+        if self._is_stale(tick):
+            return self
+        with self._lock:
+            if self._is_stale(tick):
+                return self
+            if self.tick is not None and tick <= self.tick:
+                self._restart()
+            self.tick = tick
+            self.session_time = sdk["SessionTime"]
+            if sdk["SessionState"] == SESSION_STATE_CHECKERED:
+                self._update_finished(sdk, tick)
+            driver_info = sdk["DriverInfo"]
+            if driver_info is not self._driver_info:
+                self._driver_info = driver_info
+                self._update_counts(sdk)
+        return self
+
+    def _is_stale(self, tick):
+        if self.tick is None:
+            return False
+        return self.tick - SESSION_RESTART_TICKS < tick <= self.tick
+
+    def _restart(self):
+        self.counts.clear()
+        self.finished.clear()
+        self._driver_info = None
+        self._field = None
+        for window in self._trackers:
+            self._trackers[window] = IncidentTracker(window, carry=True)
+
+    def _update_finished(self, sdk, tick):
+        field = FieldSnapshot(sdk, tick)
+        if self._field is not None:
+            for car_idx in StepDelta(self._field, field).completed_lap:
+                car_number = field.car_numbers.get(car_idx)
+                if car_number is not None:
+                    self.finished.add(car_number)
+        self._field = field
+
+    def _update_counts(self, sdk):
+        now = self.session_time
+        changed = []
+        for driver in get_driver_directory(sdk).drivers:
+            car_number = driver["CarNumber"]
+            if car_number in self.finished:
+                continue
+            incidents = driver["TeamIncidentCount"]
+            previous = self.counts.get(car_number)
+            if incidents == previous:
+                continue
+            self.counts[car_number] = incidents
+            for tracker in self._trackers.values():
+                tracker.record(car_number, incidents, now)
+            if previous is not None and incidents > previous:
+                changed.append((driver, previous, incidents))
+
+        if not changed or not self._subscriptions:
+            return
+        cars = [driver["CarNumber"] for driver, _, _ in changed]
+        collided = {}
+        for window, tracker in self._trackers.items():
+            tracker.expire(now, cars)
+            collided[window] = set(tracker.jumps(4, cars))
+        for driver, previous, incidents in changed:
+            event = IncidentEvent(
+                IncidentKind.INCIDENT,
+                driver["CarNumber"],
+                driver["CarIdx"],
+                incidents,
+                previous,
+                now,
+            )
+            for subscription in self._subscriptions:
+                subscription._publish(event, collided)
+
+
+# One IncidentStream per telemetry source: the hub when events share one, and
+# otherwise the sdk itself.
+_streams = weakref.WeakKeyDictionary()
+_streams_lock = threading.Lock()
+
+
+def get_incident_stream(sdk):
+    """
+    Gets the IncidentStream shared by every event reading the same telemetry.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) the caller reads.
+
+    Returns:
+        IncidentStream: The stream.
+    """
+    source = getattr(sdk, "hub", None)
+    if source is None:
+        source = sdk
+    with _streams_lock:
+        stream = _streams.get(source)
+        if stream is None:
+            stream = _streams[source] = IncidentStream()
+        return stream
@@ -0,0 +1,185 @@
+import math
+from collections import deque
+
+
+class IncidentWindow:
+    """
+    One car's incident counts over a sliding time window.
+
+    Samples are kept in arrival order, alongside two monotonic queues whose
+    fronts are the window's lowest and highest count, so the spread is O(1)
+    and each sample is added and expired in amortised O(1).
+
+    Attributes:
+        samples (collections.deque): (timestamp, incidents) in the window, oldest first.
+    """
+
+    __slots__ = ("samples", "_min", "_max")
+
+    def __init__(self):
+        self.samples = deque()
+        self._min = deque()
+        self._max = deque()
+
+    def __len__(self):
+        return len(self.samples)
+
+    def append(self, timestamp, incidents):
+        """
+        Adds a sample.  Samples must be added in time order.
+
+        Args:
+            timestamp (float): When the count was read.
+            incidents (int): The car's incident count.
+        """
+        sample = (timestamp, incidents)
+        self.samples.append(sample)
+        while self._min and self._min[-1][1] >= incidents:
+            self._min.pop()
+        self._min.append(sample)
+        while self._max and self._max[-1][1] <= incidents:
+            self._max.pop()
+        self._max.append(sample)
+
+    def expire(self, cutoff, carry=False):
+        """
+        Drops the samples taken before ``cutoff``.
+
+        Args:
+            cutoff (float): The start of the window.
+            carry (bool, optional): Keep the last sample before ``cutoff``, as
+                the count at the start of the window. Defaults to False.
+        """
+        samples = self.samples
+        if carry:
+            while len(samples) > 1 and samples[1][0] <= cutoff:
+                samples.popleft()
+        else:
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+        start = samples[0][0] if samples else math.inf
+        while self._min and self._min[0][0] < start:
+            self._min.popleft()
+        while self._max and self._max[0][0] < start:
+            self._max.popleft()
+
+    def restart(self):
+        """
+        Drops every sample except the latest.
+        """
+        if self.samples:
+            latest = self.samples[-1]
+            self.samples = deque([latest])
+            self._min = deque([latest])
+            self._max = deque([latest])
+
+    @property
+    def spread(self):
+        """
+        int: The highest count in the window minus the lowest, or 0 if it's empty.
+        """
+        if not self.samples:
+            return 0
+        return self._max[0][1] - self._min[0][1]
+
+
+class IncidentTracker:
+    """
+    Finds cars whose incident count jumped by a threshold within a time window.
+
+    Replaces a DataFrame that grew by one row per car per tick: each car has
+    its own IncidentWindow, so a tick costs O(cars) however long the window.
+
+    With ``carry`` set, a car's count only needs recording when it changes:
+    the last sample before the window stands for the count at its start.
+
+    Attributes:
+        window (float): Seconds of samples kept per car.
+        carry (bool): Whether counts are only recorded when they change.
+    """
+
+    def __init__(self, window, carry=False):
+        """
+        Initializes the IncidentTracker.
+
+        Args:
+            window (float): Seconds of samples kept per car.
+            carry (bool, optional): Whether counts are only recorded when they change. Defaults to False.
+        """
+        self.window = window
+        self.carry = carry
+        self._cars = {}
+
+    def __len__(self):
+        return len(self._cars)
+
+    def __contains__(self, car_number):
+        return car_number in self._cars
+
+    def record(self, car_number, incidents, timestamp):
+        """
+        Adds a car's incident count.
+
+        Args:
+            car_number (str): The car number.
+            incidents (int): The car's incident count.
+            timestamp (float): When the count was read.
+        """
+        window = self._cars.get(car_number)
+        if window is None:
+            window = self._cars[car_number] = IncidentWindow()
+        window.append(timestamp, incidents)
+
+    def expire(self, now, cars=None):
+        """
+        Drops samples older than the window, and cars left with none.
+
+        Args:
+            now (float): The current time, on the same clock as the samples.
+            cars (iterable, optional): Only expire these car numbers. Defaults to every car.
+        """
+        cutoff = now - self.window
+        for car_number in list(self._cars) if cars is None else cars:
+            window = self._cars.get(car_number)
+            if window is None:
+                continue
+            window.expire(cutoff, self.carry)
+            if not window:
+                del self._cars[car_number]
+
+    def forget(self, car_number):
+        """
+        Drops every sample for a car.
+        """
+        self._cars.pop(car_number, None)
+
+    def jumps(self, threshold=4, cars=None):
+        """
+        Gets the cars whose incident counts in the window differ by ``threshold``
+        or more, and forgets their samples so a jump is only reported once.
+
+        With ``carry`` set, a car's latest sample is kept as the start of its
+        next window.
+
+        Args:
+            threshold (int, optional): The spread that counts as a jump. Defaults to 4.
+            cars (iterable, optional): Only check these car numbers. Defaults to every car.
+
+        Returns:
+            list: Car numbers, in the order they were first recorded, or in
+            the order of ``cars``.
+        """
+        windows = self._cars
+        jumped = [
+            car_number
+            for car_number in (windows if cars is None else cars)
+            if car_number in windows
+            and len(windows[car_number]) >= 2
+            and windows[car_number].spread >= threshold
+        ]
+        for car_number in jumped:
+            if self.carry:
+                windows[car_number].restart()
+            else:
+                del windows[car_number]
+        return jumped
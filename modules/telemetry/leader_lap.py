@@ -0,0 +1,30 @@
+from modules.telemetry.driver_directory import get_driver_directory
+
+
+def get_leader_lap(sdk):
+    """
+    Gets how far round the race the leader is, in laps.
+
+    The same value as ``FieldSnapshot.max_total_completed``, without building
+    or sorting the field.  Computed once per tick and shared when the sdk is a
+    telemetry view or snapshot.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+
+    Returns:
+        float: The leader's completed laps plus their distance round the current one.
+    """
+    snapshot = getattr(sdk, "snapshot", sdk)
+    if hasattr(snapshot, "memo"):
+        return snapshot.memo(get_leader_lap, lambda: _leader_lap(snapshot))
+    return _leader_lap(sdk)
+
+
+def _leader_lap(sdk):
+    lap_completed = sdk["CarIdxLapCompleted"]
+    lap_dist_pct = sdk["CarIdxLapDistPct"]
+    return max(
+        float(lap_completed[d["CarIdx"]]) + lap_dist_pct[d["CarIdx"]]
+        for d in get_driver_directory(sdk).entries
+    )
@@ -0,0 +1,142 @@
+import threading
+import weakref
+
+from modules.telemetry.driver_directory import get_driver_directory
+from modules.telemetry.incident_stream import SESSION_RESTART_TICKS
+
+
+class PitLaneTracker:
+    """
+    The cars on pit road, kept up to date from CarIdxOnPitRoad transitions.
+
+    Each update only looks at the cars whose CarIdxOnPitRoad changed since
+    the last one, or at every car when DriverInfo changes, so checking
+    whether pit lane is clear costs nothing while it is empty and one lookup
+    per car while it isn't.  The pace car is never counted.
+
+    Every caller updates the tracker with its own view; ticks older than the
+    last update are ignored.
+
+    Attributes:
+        tick (int): The SessionTick of the last update.
+        cars (dict): SessionTick each car on pit road entered it on, keyed by CarIdx.
+    """
+
+    def __init__(self):
+        self.tick = None
+        self.cars = {}
+        self._on_pit_road = None
+        self._driver_info = None
+        self._lock = threading.Lock()
+
+    def update(self, sdk, tick=None):
+        """
+        Applies the pit road entries and exits since the last update.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+            tick (int, optional): The SessionTick being read. Defaults to sdk["SessionTick"].
+
+        Returns:
+            PitLaneTracker: This PitLaneTracker.
+        """
+        if tick is None:
+            tick = sdk["SessionTick"]
+        if self._is_stale(tick):
+            return self
+        with self._lock:
+            if self._is_stale(tick):
+                return self
+            if self.tick is not None and tick <= self.tick:
+                self.cars.clear()
+                self._on_pit_road = None
+            self.tick = tick
+            on_pit_road = sdk["CarIdxOnPitRoad"]
+            driver_info = sdk["DriverInfo"]
+            previous = self._on_pit_road
+            if (
+                previous is None
+                or len(previous) != len(on_pit_road)
+                or driver_info is not self._driver_info
+            ):
+                changed = range(len(on_pit_road))
+            elif on_pit_road is previous or on_pit_road == previous:
+                return self
+            else:
+                changed = [
+                    car_idx
+                    for car_idx, (now, before) in enumerate(zip(on_pit_road, previous))
+                    if now != before
+                ]
+            self._on_pit_road = on_pit_road
+            self._driver_info = driver_info
+            directory = get_driver_directory(sdk)
+            for car_idx in changed:
+                if not on_pit_road[car_idx]:
+                    self.cars.pop(car_idx, None)
+                elif car_idx not in self.cars and not directory.is_pace_car(car_idx):
+                    if directory.by_car_idx(car_idx) is not None:
+                        self.cars[car_idx] = tick
+        return self
+
+    def _is_stale(self, tick):
+        if self.tick is None:
+            return False
+        return self.tick - SESSION_RESTART_TICKS < tick <= self.tick
+
+    def in_field(self, sdk, max_laps_behind_leader=99):
+        """
+        Gets the cars on pit road close enough to the leader to hold up a pit close.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) the tracker was last updated from.
+            max_laps_behind_leader (int, optional): Cars more laps down than this are ignored. Defaults to 99.
+
+        Returns:
+            list: CarIdx of the cars, in the order they entered pit road.
+        """
+        cars = list(self.cars)
+        if not cars:
+            return cars
+        laps = sdk["CarIdxLapCompleted"]
+        lead_lap = max(laps)
+        return [c for c in cars if laps[c] >= lead_lap - max_laps_behind_leader]
+
+    def is_clear(self, sdk, max_laps_behind_leader=99):
+        """
+        Checks whether pit lane is clear, ignoring cars too far down to matter.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) the tracker was last updated from.
+            max_laps_behind_leader (int, optional): Cars more laps down than this are ignored. Defaults to 99.
+
+        Returns:
+            bool: True if no car close enough to the leader is on pit road.
+        """
+        return not self.in_field(sdk, max_laps_behind_leader)
+
+
+# One PitLaneTracker per telemetry source: the hub when events share one, and
+# otherwise the sdk itself.
+_trackers = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+
+def get_pit_lane_tracker(sdk):
+    """
+    Gets the PitLaneTracker shared by every event reading the same telemetry.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) the caller reads.
+
+    Returns:
+        PitLaneTracker: The tracker.
+    """
+    source = getattr(sdk, "hub", None)
+    if source is None:
+        source = sdk
+    with _trackers_lock:
+        tracker = _trackers.get(source)
+        if tracker is None:
+            tracker = _trackers[source] = PitLaneTracker()
+        return tracker
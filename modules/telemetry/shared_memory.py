@@ -0,0 +1,298 @@
+import logging
+import pickle
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from modules.telemetry.hub import SESSION_INFO_KEYS, TICK_PERIOD
+
+# Bytes reserved for one tick's pickled telemetry, and for the pickled session
+# info.  DriverInfo for a full field is a few hundred kilobytes.
+TELEMETRY_BLOCK_SIZE = 1 << 20
+SESSION_INFO_BLOCK_SIZE = 8 << 20
+# Every block starts with a sequence number, odd while a write is in
+# progress, and the length of the payload that follows.
+_HEADER = struct.Struct("<QQ")
+# Times a reader retries a block that was rewritten while it was being read.
+READ_RETRIES = 100
+# How long the writer blocks waiting for a tick before rechecking for stop.
+WAIT_SLICE = 0.1
+# How long a reader waits for the writer to start publishing a key it asked for.
+KEY_REQUEST_TIMEOUT = 1.0
+
+
+class _SeqlockBlock:
+    """
+    One shared memory block, written by one process and read by any number.
+
+    Readers copy the payload out and check the sequence number didn't change
+    while they did, so a write never blocks on a slow reader.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+
+    @property
+    def sequence(self):
+        return _HEADER.unpack_from(self.shm.buf)[0]
+
+    def write(self, payload):
+        buf = self.shm.buf
+        size = len(payload)
+        if _HEADER.size + size > len(buf):
+            raise ValueError(
+                f"{size} bytes doesn't fit in shared memory block {self.shm.name}"
+            )
+        sequence = _HEADER.unpack_from(buf)[0]
+        _HEADER.pack_into(buf, 0, sequence + 1, 0)
+        buf[_HEADER.size : _HEADER.size + size] = payload
+        _HEADER.pack_into(buf, 0, sequence + 2, size)
+
+    def read(self, known=None):
+        """
+        Reads the payload, unless it is the one with sequence number ``known``.
+
+        Returns:
+            tuple: (sequence, payload), with payload None if unchanged or never written.
+        """
+        buf = self.shm.buf
+        for _ in range(READ_RETRIES):
+            sequence, size = _HEADER.unpack_from(buf)
+            if sequence == known or sequence == 0:
+                return sequence, None
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            payload = bytes(buf[_HEADER.size : _HEADER.size + size])
+            if _HEADER.unpack_from(buf)[0] == sequence:
+                return sequence, payload
+        raise TimeoutError(f"Shared memory block {self.shm.name} kept changing")
+
+    def close(self):
+        self.shm.close()
+
+
+class SharedTelemetryWriter:
+    """
+    Publishes a TelemetryHub's snapshots to shared memory, for events running
+    in worker processes.
+
+    Each tick's telemetry is pickled into one block.  Session info goes into a
+    second block and is only rewritten when it changes, so readers keep the
+    same DriverInfo object between session info updates, as they do in-process.
+
+    Attributes:
+        hub (TelemetryHub): The hub whose snapshots are published.
+        names (tuple): The names of the telemetry and session info blocks, for SharedTelemetrySDK.
+    """
+
+    def __init__(
+        self,
+        hub,
+        telemetry_size=TELEMETRY_BLOCK_SIZE,
+        session_info_size=SESSION_INFO_BLOCK_SIZE,
+    ):
+        """
+        Initializes the SharedTelemetryWriter, creating its shared memory.
+
+        Args:
+            hub (TelemetryHub): The hub whose snapshots are published.
+            telemetry_size (int, optional): Bytes for one tick's telemetry. Defaults to TELEMETRY_BLOCK_SIZE.
+            session_info_size (int, optional): Bytes for the session info. Defaults to SESSION_INFO_BLOCK_SIZE.
+        """
+        self.hub = hub
+        self._telemetry = _SeqlockBlock(
+            shared_memory.SharedMemory(create=True, size=telemetry_size)
+        )
+        self._session_info = _SeqlockBlock(
+            shared_memory.SharedMemory(create=True, size=session_info_size)
+        )
+        self.tick = None
+        self.thread = None
+        self._written_session_info = None
+        self._stop = threading.Event()
+        from modules.logging_context import get_logger
+
+        self.logger = logging.LoggerAdapter(
+            get_logger() or logging.getLogger(__name__),
+            {"event": "SharedTelemetryWriter"},
+        )
+
+    @property
+    def names(self):
+        return (self._telemetry.shm.name, self._session_info.shm.name)
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def publish(self, snapshot):
+        """
+        Writes a snapshot to shared memory.
+
+        Args:
+            snapshot (TelemetrySnapshot): The snapshot.
+        """
+        session_info = {
+            key: snapshot[key] for key in SESSION_INFO_KEYS if key in snapshot
+        }
+        written = self._written_session_info
+        if written is None or any(
+            session_info.get(key) is not written.get(key)
+            for key in session_info.keys() | written.keys()
+        ):
+            self._session_info.write(
+                pickle.dumps(session_info, pickle.HIGHEST_PROTOCOL)
+            )
+            self._written_session_info = session_info
+        telemetry = {
+            key: snapshot[key]
+            for key in snapshot.keys()
+            if key not in SESSION_INFO_KEYS
+        }
+        self._telemetry.write(
+            pickle.dumps((snapshot.tick, telemetry), pickle.HIGHEST_PROTOCOL)
+        )
+        self.tick = snapshot.tick
+
+    def request_key(self, key):
+        """
+        Adds a key a reader asked for to the hub's snapshots, if the sdk has it.
+
+        Args:
+            key (str): The telemetry key.
+        """
+        try:
+            self.hub.read_through(None, key)
+        except KeyError:
+            self.logger.debug(f"Worker asked for unknown telemetry key {key}")
+
+    def start(self):
+        """
+        Starts publishing every new snapshot from the hub.
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self.thread = threading.Thread(
+            target=self._run, name="SharedTelemetryWriter", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops publishing and frees the shared memory.
+        """
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        self.thread = None
+        for block in (self._telemetry, self._session_info):
+            block.close()
+            try:
+                block.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                snapshot = self.hub.wait_for_tick(
+                    after_tick=self.tick, timeout=WAIT_SLICE, cancel_event=self._stop
+                )
+                if snapshot is None or snapshot.tick == self.tick:
+                    self._stop.wait(TICK_PERIOD)
+                    continue
+                self.publish(snapshot)
+            except Exception as e:
+                self.logger.debug(f"Error publishing telemetry: {e}")
+                self._stop.wait(1)
+
+
+class SharedTelemetrySDK:
+    """
+    Reads what a SharedTelemetryWriter publishes, through the parts of the
+    irsdk.IRSDK interface that TelemetryHub uses.
+
+    A worker process wraps it in its own TelemetryHub, so its events read
+    telemetry exactly as they would in the parent.
+
+    Attributes:
+        session_info_update (int): Changes whenever the session info does.
+    """
+
+    def __init__(self, names, request_key=None):
+        """
+        Initializes the SharedTelemetrySDK, attaching to the writer's shared memory.
+
+        Args:
+            names (tuple): SharedTelemetryWriter.names.
+            request_key (callable, optional): Asks the writer to publish a key it doesn't yet. Defaults to None.
+        """
+        telemetry_name, session_info_name = names
+        self._telemetry = _SeqlockBlock(shared_memory.SharedMemory(name=telemetry_name))
+        self._session_info = _SeqlockBlock(
+            shared_memory.SharedMemory(name=session_info_name)
+        )
+        self.request_key = request_key
+        self.session_info_update = 0
+        self._telemetry_sequence = None
+        self._values = {}
+        self._session_values = {}
+        self._unknown = set()
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        if key in self._session_values:
+            return self._session_values[key]
+        if (
+            self.request_key is None
+            or self._telemetry_sequence is None
+            or key in self._unknown
+        ):
+            raise KeyError(key)
+        self.request_key(key)
+        deadline = time.monotonic() + KEY_REQUEST_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(TICK_PERIOD)
+            self._read()
+            if key in self._values:
+                return self._values[key]
+        self._unknown.add(key)
+        raise KeyError(key)
+
+    def freeze_var_buffer_latest(self):
+        """
+        Loads the latest published tick.  Reads come from it until the next call.
+        """
+        self._read()
+
+    def unfreeze_var_buffer_latest(self):
+        return
+
+    def startup(self, *args, **kwargs):
+        return True
+
+    def shutdown(self):
+        return
+
+    def close(self):
+        """
+        Detaches from the shared memory.
+        """
+        self._values = {}
+        self._session_values = {}
+        self._telemetry.close()
+        self._session_info.close()
+
+    def _read(self):
+        sequence, payload = self._telemetry.read(self._telemetry_sequence)
+        if payload is not None:
+            self._telemetry_sequence = sequence
+            _, self._values = pickle.loads(payload)
+        sequence, payload = self._session_info.read(2 * self.session_info_update)
+        if payload is not None:
+            self.session_info_update = sequence // 2
+            self._session_values = pickle.loads(payload)
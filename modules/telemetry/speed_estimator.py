@@ -0,0 +1,192 @@
+import threading
+import weakref
+
+import numpy as np
+
+from modules.telemetry.incident_stream import SESSION_RESTART_TICKS
+from modules.telemetry.track_model import get_track_model
+
+# Samples kept per car.  Enough for SPEED_WINDOW at the 10 Hz most events
+# sample at, and a quarter of a second at 60 Hz.
+WINDOW_SAMPLES = 16
+# Seconds of samples the smoothed speed and acceleration are taken over.
+SPEED_WINDOW = 1.0
+KPH_PER_MPS = 3.6
+
+
+class SpeedEstimator:
+    """
+    Every car's speed and acceleration, from a short ring buffer of
+    (SessionTime, CarIdxLapDistPct) samples.
+
+    Each update adds one sample for the whole field, and the speeds are
+    worked out for every car at once with array operations, so reading one
+    car's speed is a lookup.  Steps backwards, and steps where a car isn't in
+    the world (a LapDistPct below zero), count as no distance.
+
+    Every caller updates the estimator with its own view; ticks older than
+    the last update, and ticks on which SessionTime hasn't moved, are ignored.
+
+    Attributes:
+        tick (int): The SessionTick of the last sample.
+        track_length (float): Metres per lap, from the session's TrackModel.
+        speed (np.ndarray): Metres per second over the last SPEED_WINDOW seconds, indexed by CarIdx.
+        latest_speed (np.ndarray): Metres per second over the last step between samples, indexed by CarIdx.
+        acceleration (np.ndarray): Metres per second squared over the last SPEED_WINDOW seconds, indexed by CarIdx.
+    """
+
+    def __init__(self, window=SPEED_WINDOW, samples=WINDOW_SAMPLES):
+        """
+        Initializes the SpeedEstimator.
+
+        Args:
+            window (float, optional): Seconds to smooth over. Defaults to SPEED_WINDOW.
+            samples (int, optional): Samples kept per car. Defaults to WINDOW_SAMPLES.
+        """
+        self.window = window
+        self.samples = samples
+        self.tick = None
+        self.track_length = None
+        self.speed = np.zeros(0)
+        self.latest_speed = np.zeros(0)
+        self.acceleration = np.zeros(0)
+        self._times = None
+        self._pcts = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def update(self, sdk, tick=None):
+        """
+        Adds the sdk's current tick to the buffer and recomputes the speeds.
+
+        Args:
+            sdk (irsdk.IRSDK): The sdk (or telemetry view) to read.  Should be frozen by the caller.
+            tick (int, optional): The SessionTick being read. Defaults to sdk["SessionTick"].
+
+        Returns:
+            SpeedEstimator: This SpeedEstimator.
+        """
+        if tick is None:
+            tick = sdk["SessionTick"]
+        if self._is_stale(tick):
+            return self
+        with self._lock:
+            if self._is_stale(tick):
+                return self
+            session_time = sdk["SessionTime"]
+            pcts = np.asarray(sdk["CarIdxLapDistPct"], dtype=np.float64)
+            self.track_length = get_track_model(sdk).length
+            if (
+                self._times is None
+                or (self.tick is not None and tick <= self.tick)
+                or self._pcts.shape[1] != len(pcts)
+            ):
+                self._reset(len(pcts))
+            elif self._count and session_time <= self._times[-1]:
+                return self
+            self.tick = tick
+            self._times = np.roll(self._times, -1)
+            self._pcts = np.roll(self._pcts, -1, axis=0)
+            self._times[-1] = session_time
+            self._pcts[-1] = pcts
+            self._count = min(self._count + 1, self.samples)
+            self._estimate()
+        return self
+
+    def _is_stale(self, tick):
+        if self.tick is None:
+            return False
+        return self.tick - SESSION_RESTART_TICKS < tick <= self.tick
+
+    def _reset(self, cars):
+        self._times = np.zeros(self.samples)
+        self._pcts = np.zeros((self.samples, cars))
+        self._count = 0
+        self.speed = np.zeros(cars)
+        self.latest_speed = np.zeros(cars)
+        self.acceleration = np.zeros(cars)
+
+    def _estimate(self):
+        if self._count < 2:
+            return
+        times = self._times[-self._count :]
+        pcts = self._pcts[-self._count :]
+        # Keep the samples inside the window, but always the last step.
+        first = min(
+            int(np.searchsorted(times, times[-1] - self.window)), len(times) - 2
+        )
+        times = times[first:]
+        pcts = pcts[first:]
+
+        dt = np.diff(times)
+        # Wrap steps across the line, and treat a step back (a car reversing,
+        # or LapDistPct jitter while stopped) as no distance.
+        laps = (np.diff(pcts, axis=0) + 0.5) % 1 - 0.5
+        distance = np.clip(laps, 0, None) * self.track_length
+        distance[(pcts[1:] < 0) | (pcts[:-1] < 0)] = 0
+        step_speed = distance / dt[:, None]
+
+        self.latest_speed = step_speed[-1]
+        self.speed = distance.sum(axis=0) / (times[-1] - times[0])
+        if len(dt) < 2:
+            self.acceleration = np.zeros(len(self.speed))
+            return
+        # Least squares slope of each step's speed against its midpoint.
+        midpoints = (times[1:] + times[:-1]) / 2
+        centred = midpoints - midpoints.mean()
+        self.acceleration = (centred @ step_speed) / (centred @ centred)
+
+    def speed_kph(self, car_idx):
+        """
+        Gets a car's smoothed speed.
+
+        Args:
+            car_idx (int): The car's CarIdx.
+
+        Returns:
+            float: Kilometres per hour over the last SPEED_WINDOW seconds, or 0 before two samples.
+        """
+        if car_idx >= len(self.speed):
+            return 0.0
+        return float(self.speed[car_idx]) * KPH_PER_MPS
+
+    def latest_speed_kph(self, car_idx):
+        """
+        Gets a car's speed over the last step between samples, which reacts
+        to it speeding up within one sample.
+
+        Args:
+            car_idx (int): The car's CarIdx.
+
+        Returns:
+            float: Kilometres per hour, or 0 before two samples.
+        """
+        if car_idx >= len(self.latest_speed):
+            return 0.0
+        return float(self.latest_speed[car_idx]) * KPH_PER_MPS
+
+
+# One SpeedEstimator per telemetry source: the hub when events share one, and
+# otherwise the sdk itself.
+_estimators = weakref.WeakKeyDictionary()
+_estimators_lock = threading.Lock()
+
+
+def get_speed_estimator(sdk):
+    """
+    Gets the SpeedEstimator shared by every event reading the same telemetry.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) the caller reads.
+
+    Returns:
+        SpeedEstimator: The estimator.
+    """
+    source = getattr(sdk, "hub", None)
+    if source is None:
+        source = sdk
+    with _estimators_lock:
+        estimator = _estimators.get(source)
+        if estimator is None:
+            estimator = _estimators[source] = SpeedEstimator()
+        return estimator
@@ -0,0 +1,127 @@
+import numpy as np
+
+from modules.telemetry.field_snapshot import FieldSnapshot
+
+
+class StepDelta:
+    """
+    What changed for every car between two steps, computed in one vectorised pass.
+
+    A step is either a FieldSnapshot or a running order as returned by
+    ``BaseEvent.get_current_running_order``.  A car only shows up in a
+    transition if it is present in both steps.
+
+    Each transition is published as a frozenset of CarIdx, so callers looping
+    over the field can check a car in O(1).
+
+    Attributes:
+        present (frozenset): Cars present in both steps.
+        completed_lap (frozenset): Cars whose LapCompleted went up by exactly one.
+        left_pits (frozenset): Cars that left pit road, after their first lap.
+        entered_pits (frozenset): Cars that entered pit road after their first lap, or while disconnected.
+        new_lap_time (frozenset): Cars with a new last lap time.
+        disconnected (frozenset): Cars whose LapDistPct became -1.
+        reconnected (frozenset): Cars whose LapDistPct stopped being -1.
+        flags_changed (frozenset): Cars whose CarIdxSessionFlags changed.  Only available between FieldSnapshots.
+    """
+
+    def __init__(self, last_step, this_step):
+        """
+        Initializes the StepDelta.
+
+        Args:
+            last_step (FieldSnapshot | list): The earlier step.
+            this_step (FieldSnapshot | list): The later step.
+        """
+        size = max(_size(last_step), _size(this_step))
+        last = _StepArrays(last_step, size)
+        this = _StepArrays(this_step, size)
+        both = last.present & this.present
+        both_racing = both & (last.lap_completed > 0) & (this.lap_completed > 0)
+        pits_now = this.in_pits == 1
+
+        self.present = _cars(both)
+        self.completed_lap = _cars(
+            both & (this.lap_completed == last.lap_completed + 1)
+        )
+        self.left_pits = _cars(both_racing & (this.in_pits == 0) & (last.in_pits == 1))
+        self.entered_pits = _cars(
+            (both_racing & pits_now & (last.in_pits == 0))
+            | (both & pits_now & (last.lap_dist_pct < 0))
+        )
+        self.new_lap_time = _cars(both & (this.last_lap_time != last.last_lap_time))
+        self.disconnected = _cars(
+            both & (this.lap_dist_pct == -1) & (last.lap_dist_pct != -1)
+        )
+        self.reconnected = _cars(
+            both & (this.lap_dist_pct != -1) & (last.lap_dist_pct == -1)
+        )
+        if last.session_flags is not None and this.session_flags is not None:
+            self.flags_changed = _cars(
+                both & (this.session_flags != last.session_flags)
+            )
+        else:
+            self.flags_changed = frozenset()
+
+
+def _cars(mask):
+    return frozenset(np.flatnonzero(mask).tolist())
+
+
+def _size(step):
+    if isinstance(step, FieldSnapshot):
+        return len(step.lap_completed)
+    return max((car["CarIdx"] for car in step), default=-1) + 1
+
+
+class _StepArrays:
+    """
+    Dense CarIdx-indexed arrays for one step, with a mask of the cars present.
+    """
+
+    __slots__ = (
+        "present",
+        "lap_completed",
+        "lap_dist_pct",
+        "in_pits",
+        "last_lap_time",
+        "session_flags",
+    )
+
+    def __init__(self, step, size):
+        self.present = np.zeros(size, dtype=bool)
+        if isinstance(step, FieldSnapshot):
+            n = len(step.lap_completed)
+            self.present[step.car_idx] = True
+            self.lap_completed = _pad(step.lap_completed, size, n)
+            self.lap_dist_pct = _pad(step.lap_dist_pct, size, n)
+            self.in_pits = _pad(step.on_pit_road.astype(np.int8), size, n)
+            self.last_lap_time = _pad(step.last_lap_time, size, n)
+            self.session_flags = (
+                _pad(step.session_flags, size, n)
+                if step.session_flags is not None
+                else None
+            )
+            return
+
+        car_idx = np.fromiter((car["CarIdx"] for car in step), dtype=np.intp)
+        self.present[car_idx] = True
+        self.lap_completed = _scatter(step, "LapCompleted", car_idx, size)
+        self.lap_dist_pct = _scatter(step, "LapDistPct", car_idx, size)
+        self.in_pits = _scatter(step, "InPits", car_idx, size)
+        self.last_lap_time = _scatter(step, "last_lap_time", car_idx, size)
+        self.session_flags = None
+
+
+def _pad(values, size, n):
+    if n == size:
+        return values
+    padded = np.zeros(size, dtype=values.dtype)
+    padded[:n] = values
+    return padded
+
+
+def _scatter(step, key, car_idx, size):
+    values = np.zeros(size, dtype=np.float64)
+    values[car_idx] = np.fromiter((car[key] for car in step), dtype=np.float64)
+    return values
@@ -0,0 +1,157 @@
+import bisect
+import threading
+import weakref
+
+
+def parse_track_length(weekend_info):
+    """
+    Parses WeekendInfo's TrackLength, e.g. "4.023 km", into metres.
+
+    Args:
+        weekend_info (dict): The session's WeekendInfo.
+
+    Returns:
+        float: The track length in metres.
+    """
+    return float(str(weekend_info["TrackLength"]).replace(" km", "")) * 1000
+
+
+class TrackModel:
+    """
+    The track's geometry, parsed once per session instead of by every caller
+    that converts between lap fraction, distance and time.
+
+    Length comes from WeekendInfo and sectors from SplitTimeInfo.
+
+    Attributes:
+        weekend_info (dict): The WeekendInfo the model was built from.
+        length (float): The lap length in metres, i.e. metres per 1.0 of CarIdxLapDistPct.
+        sectors (tuple): SectorStartPct of every sector, in order.  Just (0.0,) without SplitTimeInfo.
+    """
+
+    def __init__(self, weekend_info, split_time_info=None):
+        """
+        Initializes the TrackModel.
+
+        Args:
+            weekend_info (dict): The session's WeekendInfo.
+            split_time_info (dict, optional): The session's SplitTimeInfo. Defaults to None.
+        """
+        self.load(weekend_info, split_time_info)
+
+    def load(self, weekend_info, split_time_info=None):
+        """
+        Rebuilds the geometry from new session info.
+
+        Args:
+            weekend_info (dict): The session's WeekendInfo.
+            split_time_info (dict, optional): The session's SplitTimeInfo. Defaults to None.
+        """
+        self.weekend_info = weekend_info
+        self.length = parse_track_length(weekend_info)
+        sectors = (split_time_info or {}).get("Sectors") or ()
+        starts = sorted(float(sector["SectorStartPct"]) for sector in sectors)
+        self.sectors = tuple(starts) or (0.0,)
+
+    def to_metres(self, pct):
+        """
+        Converts a fraction of a lap to metres.
+
+        Args:
+            pct (float): The fraction of a lap.
+
+        Returns:
+            float: Metres.
+        """
+        return pct * self.length
+
+    def to_pct(self, metres):
+        """
+        Converts metres to a fraction of a lap.
+
+        Args:
+            metres (float): The distance.
+
+        Returns:
+            float: The fraction of a lap.
+        """
+        return metres / self.length
+
+    def distance(self, from_pct, to_pct):
+        """
+        Gets the distance forward round the track from one LapDistPct to another.
+
+        Args:
+            from_pct (float): Where from.
+            to_pct (float): Where to, wrapping across the line if it is behind from_pct.
+
+        Returns:
+            float: Metres.
+        """
+        return (to_pct - from_pct) % 1 * self.length
+
+    def time_to_cover(self, from_pct, to_pct, speed):
+        """
+        Gets how long it takes to get from one LapDistPct to another.
+
+        Args:
+            from_pct (float): Where from.
+            to_pct (float): Where to, wrapping across the line if it is behind from_pct.
+            speed (float): Metres per second.
+
+        Returns:
+            float: Seconds, or infinity if speed isn't positive.
+        """
+        if speed <= 0:
+            return float("inf")
+        return self.distance(from_pct, to_pct) / speed
+
+    def sector(self, pct):
+        """
+        Gets the sector a LapDistPct is in.
+
+        Args:
+            pct (float): The LapDistPct.
+
+        Returns:
+            int: The sector's index in ``sectors``.
+        """
+        return max(bisect.bisect_right(self.sectors, pct % 1) - 1, 0)
+
+
+# One TrackModel per telemetry source: the hub when events share one, and
+# otherwise the sdk itself.
+_models = weakref.WeakKeyDictionary()
+_models_lock = threading.Lock()
+
+
+def get_track_model(sdk):
+    """
+    Gets the TrackModel shared by every event reading the same telemetry,
+    rebuilt when the session info changes.
+
+    Args:
+        sdk (irsdk.IRSDK): The sdk (or telemetry view) the caller reads.
+
+    Returns:
+        TrackModel: The model.
+    """
+    source = getattr(sdk, "hub", None)
+    if source is None:
+        source = sdk
+    weekend_info = sdk["WeekendInfo"]
+    with _models_lock:
+        model = _models.get(source)
+        if model is not None and model.weekend_info is weekend_info:
+            return model
+    try:
+        split_time_info = sdk["SplitTimeInfo"]
+    except KeyError:
+        split_time_info = None
+    with _models_lock:
+        model = _models.get(source)
+        if model is None:
+            model = _models[source] = TrackModel(weekend_info, split_time_info)
+        elif model.weekend_info is not weekend_info:
+            model.load(weekend_info, split_time_info)
+        return model
@@ -0,0 +1,283 @@
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+from modules.telemetry import get_leader_lap
+from modules.telemetry.hub import TICK_PERIOD
+
+# SessionState while the race is running.
+SESSION_STATE_RACING = 4
+# How long the scheduler blocks on a tick before rechecking for stop.
+WAIT_SLICE = 0.1
+# Seconds between quickie checks for events whose quickie window has opened,
+# as often as each event used to check while polling its own start.
+QUICKIE_CHECK_PERIOD = 1.0
+
+
+class Trigger:
+    """
+    One event's scheduled start.
+
+    Attributes:
+        event (RandomEvent): The event to wake.
+        due (float): The session seconds the trigger fires after, or the leader lap it fires on.
+        quickie_from (float): When the event's quickie window opens, in the same units as ``due``, or None if it has none.
+        on_lap (bool): Whether ``due`` is a lap rather than session seconds.
+        future (concurrent.futures.Future): Resolves when the trigger fires.
+    """
+
+    __slots__ = ("event", "due", "quickie_from", "on_lap", "future")
+
+    def __init__(self, event, due, quickie_from, on_lap=False):
+        self.event = event
+        self.due = due
+        self.quickie_from = quickie_from
+        self.on_lap = on_lap
+        self.future = Future()
+
+    def cancel(self):
+        """
+        Stops waiting for the trigger.
+        """
+        self.future.cancel()
+
+
+class TriggerScheduler:
+    """
+    Wakes scheduled events when their start time or lap comes round, from
+    one thread.
+
+    Time triggers are kept in a heap ordered by due time, and lap triggers in
+    a list sorted by lap that the leader's lap is compared against, so a tick
+    costs a couple of comparisons however many events are waiting.  While lap
+    triggers are waiting, the leader's lap is worked out once per tick and
+    published as ``leader_lap``.
+    Instead of every event polling ``is_time_to_start`` on a thread of its
+    own, each event waits on its Trigger's future.
+
+    Events whose quickie window has opened have ``check_and_set_quickie_flag``
+    called as they did while polling, and once more as their trigger fires.
+
+    The thread only runs while there are triggers waiting.
+
+    Attributes:
+        hub (TelemetryHub): The hub the triggers are checked against.
+        leader_lap (float): The leader's lap on the last tick lap triggers were checked on.
+    """
+
+    def __init__(self, hub):
+        """
+        Initializes the TriggerScheduler.
+
+        Args:
+            hub (TelemetryHub): The hub the triggers are checked against.
+        """
+        self.hub = hub
+        self.thread = None
+        self.leader_lap = None
+        self._times = []
+        self._laps = []
+        self._time_windows = []
+        self._lap_windows = []
+        self._open = []
+        self._waiting = 0
+        self._quickies_checked_at = None
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        from modules.logging_context import get_logger
+
+        self.logger = logging.LoggerAdapter(
+            get_logger() or logging.getLogger(__name__), {"event": "TriggerScheduler"}
+        )
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def waiting(self):
+        """
+        int: Number of triggers that haven't fired or been cancelled.
+        """
+        return self._waiting
+
+    def at_time(self, event, start_time, quickie_from):
+        """
+        Schedules an event's start once the session has run for ``start_time`` seconds.
+
+        The trigger only fires while the race is running with more than a
+        second left, as ``RandomTimedEvent.is_time_to_start`` requires.
+
+        Args:
+            event (RandomTimedEvent): The event.
+            start_time (float): Session seconds the event starts after.
+            quickie_from (float): Session seconds the event's quickie window opens at.
+
+        Returns:
+            Trigger: The trigger, whose future resolves when the event should start.
+        """
+        return self._add(Trigger(event, start_time, quickie_from))
+
+    def at_lap(self, event, lap, quickie_from):
+        """
+        Schedules an event's start, or end, once the leader has completed ``lap`` laps.
+
+        Args:
+            event (RandomLapEvent): The event.
+            lap (float): Leader laps the trigger fires on.
+            quickie_from (float): Leader laps the event's quickie window opens at, or None for an end.
+
+        Returns:
+            Trigger: The trigger, whose future resolves when the leader reaches ``lap``.
+        """
+        return self._add(Trigger(event, lap, quickie_from, on_lap=True))
+
+    def _add(self, trigger):
+        entry = (trigger.due, next(self._sequence), trigger)
+        window = (trigger.quickie_from, entry[1], trigger)
+        with self._lock:
+            if trigger.on_lap:
+                bisect.insort(self._laps, entry)
+                windows = self._lap_windows
+            else:
+                heapq.heappush(self._times, entry)
+                windows = self._time_windows
+            if trigger.quickie_from is not None:
+                heapq.heappush(windows, window)
+            self._waiting += 1
+            if not self.running:
+                self.thread = threading.Thread(
+                    target=self._run, name="TriggerScheduler", daemon=True
+                )
+                self.thread.start()
+        trigger.future.add_done_callback(self._finished)
+        return trigger
+
+    def _finished(self, future):
+        with self._lock:
+            self._waiting -= 1
+
+    def _run(self):
+        tick = None
+        while True:
+            with self._lock:
+                if not self._waiting:
+                    self._clear()
+                    self.thread = None
+                    return
+            try:
+                snapshot = self.hub.wait_for_tick(after_tick=tick, timeout=WAIT_SLICE)
+                if snapshot is None or snapshot.tick == tick:
+                    time.sleep(TICK_PERIOD)
+                    continue
+                tick = snapshot.tick
+                self.step(snapshot)
+            except Exception as e:
+                self.logger.debug(f"Error checking triggers: {e}")
+                time.sleep(1)
+
+    def _clear(self):
+        self._times.clear()
+        self._laps.clear()
+        self._time_windows.clear()
+        self._lap_windows.clear()
+        self._open.clear()
+
+    def step(self, snapshot):
+        """
+        Fires the triggers due on a snapshot, and checks quickie flags.
+
+        Called by the scheduler's thread for every new tick.
+
+        Args:
+            snapshot (TelemetrySnapshot): The tick to check.
+
+        Returns:
+            list: The Triggers that fired, in the order they were due.
+        """
+        now = time.monotonic()
+        check_quickies = (
+            self._quickies_checked_at is None
+            or now - self._quickies_checked_at >= QUICKIE_CHECK_PERIOD
+        )
+        racing = snapshot.get("SessionState") == SESSION_STATE_RACING
+        fired = []
+        with self._lock:
+            time_valid = False
+            if self._times:
+                remaining = snapshot["SessionTimeRemain"]
+                elapsed = snapshot["SessionTimeTotal"] - remaining
+                time_valid = remaining > 1 and racing
+                _open_windows(self._time_windows, elapsed, self._open)
+                while time_valid and self._times and self._times[0][0] < elapsed:
+                    fired.append(heapq.heappop(self._times)[2])
+
+            lap = None
+            if self._laps:
+                lap = self.leader_lap = get_leader_lap(snapshot)
+                _open_windows(self._lap_windows, lap, self._open)
+                due = bisect.bisect_right(self._laps, (lap, float("inf")))
+                fired.extend(entry[2] for entry in self._laps[:due])
+                del self._laps[:due]
+            lap_valid = lap is not None and lap >= 1 and racing
+            fired = [t for t in fired if not t.future.done()]
+
+            if check_quickies:
+                self._quickies_checked_at = now
+                quickies = [t for t in self._open if not t.future.done()]
+            else:
+                quickies = []
+            quickies.extend(fired)
+            self._open = [
+                t
+                for t in self._open
+                if not t.future.done() and t not in fired and not t.event.quickie
+            ]
+
+        for trigger in quickies:
+            if trigger.quickie_from is None:
+                continue
+            if not (lap_valid if trigger.on_lap else time_valid):
+                continue
+            try:
+                trigger.event.check_and_set_quickie_flag()
+            except Exception as e:
+                self.logger.debug(f"Error checking quickie for {trigger.event}: {e}")
+        for trigger in fired:
+            if trigger.future.set_running_or_notify_cancel():
+                trigger.future.set_result(snapshot.tick)
+        return fired
+
+
+def _open_windows(windows, now, opened):
+    while windows and windows[0][0] <= now:
+        trigger = heapq.heappop(windows)[2]
+        if not trigger.future.done():
+            opened.append(trigger)
+
+
+# One TriggerScheduler per telemetry hub.
+_schedulers = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_trigger_scheduler(hub):
+    """
+    Gets the TriggerScheduler shared by every event reading a telemetry hub.
+
+    Args:
+        hub (TelemetryHub): The hub.
+
+    Returns:
+        TriggerScheduler: The scheduler.
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(hub)
+        if scheduler is None:
+            scheduler = _schedulers[hub] = TriggerScheduler(hub)
+        return scheduler
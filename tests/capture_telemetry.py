@@ -130,6 +130,7 @@ except ImportError:
 from modules.events.random_code_69_event import RandomTimedCode69Event
 from modules.logging_configuration import init_logging
 from modules.logging_context import set_logger
+from modules.telemetry import parse_track_length
 
 _logger, _logfile = init_logging()
 set_logger(_logger, _logfile)
@@ -176,10 +177,9 @@ def _parse_track_length_km(weekend_info: dict | None) -> float | None:
     """Extract a float km value from WeekendInfo['TrackLength'] ("4.023 km")."""
     if not weekend_info:
         return None
-    raw = weekend_info.get("TrackLength", "")
     try:
-        return float(str(raw).replace(" km", "").strip())
-    except (ValueError, TypeError):
+        return parse_track_length(weekend_info) / 1000
+    except (KeyError, ValueError, TypeError):
         return None
 
 
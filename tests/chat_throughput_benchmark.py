@@ -0,0 +1,281 @@
+"""
+chat_throughput_benchmark.py -- Chat dispatcher latency on replayed chat traffic
+================================================================================
+
+Every chat message costs real time to type into the sim, so in big fields the
+chat is the bottleneck: messages queue up behind each other, and a race
+control command stuck behind a burst of reminders reaches the sim late.  This
+script measures that without a sim.
+
+HOW IT WORKS
+------------
+1.  Each fixture's ``RandomTimedCode69Event`` is replayed at full speed, as in
+    the replay tests, and every ``_chat`` call is recorded with the
+    SessionTime it was made at and its priority.
+
+2.  The recorded chat is then played back in (scaled) real time into a
+    ``ChatDispatcher`` whose ``LoopbackTransport`` takes ``--send-ms`` per
+    message, for each send time given.  A longer send time is a slower chat,
+    i.e. a higher load relative to what the chat can carry.
+
+3.  For every message the report gives, in sim seconds:
+
+    * queueing delay -- from ``_chat`` until the dispatcher started sending it;
+    * time to send   -- from ``_chat`` until it had been sent.
+
+    Admin commands (``!y``, ``!bl``, ...) taking longer than ``--late-s`` are
+    counted as late, and any still unsent ``--drain-s`` after the last
+    message as dropped.
+
+USAGE
+-----
+::
+
+    python tests/chat_throughput_benchmark.py
+    python tests/chat_throughput_benchmark.py --send-ms 300 600 --speed 10
+    python tests/chat_throughput_benchmark.py --fixture mugello
+
+The exit code is 1 if any admin command was dropped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+from modules.logging_configuration import init_logging  # noqa: E402
+from modules.logging_context import set_logger  # noqa: E402
+
+_logger, _logfile = init_logging()
+set_logger(_logger, _logfile)
+
+from modules.chat import (  # noqa: E402
+    ChatDispatcher,
+    ChatPriority,
+    LoopbackTransport,
+    default_priority,
+)
+from tests.conftest import ReplayFixture, discover_fixtures  # noqa: E402
+
+
+@dataclass
+class ChatCall:
+    session_time: float
+    message: str
+    race_control: bool
+    priority: ChatPriority
+
+
+@dataclass
+class ThroughputResult:
+    description: str
+    send_ms: float
+    messages: int = 0
+    sim_seconds: float = 0.0
+    queue_delay: list[float] = field(default_factory=list)
+    time_to_send: list[float] = field(default_factory=list)
+    commands: int = 0
+    late_commands: int = 0
+    dropped: int = 0
+    dropped_commands: int = 0
+
+    @property
+    def messages_per_minute(self) -> float:
+        return 60.0 * self.messages / self.sim_seconds if self.sim_seconds else 0.0
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else float("nan")
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+def record_chat(fixture: ReplayFixture, timeout: float = 120.0) -> list[ChatCall]:
+    """Replay one fixture at full speed and record every ``_chat`` call."""
+    sdk = fixture.build_sdk()
+    event = fixture.build_event(sdk)
+    calls: list[ChatCall] = []
+
+    def _chat(message: str, race_control: bool = False, priority=None) -> None:
+        if priority is None:
+            priority = default_priority(message, race_control)
+        calls.append(ChatCall(sdk["SessionTime"], message, race_control, priority))
+
+    def _sleep(seconds: float) -> None:
+        if event.cancel_event.is_set():
+            raise KeyboardInterrupt
+
+    event._chat = _chat
+    event.sleep = _sleep
+
+    def _run() -> None:
+        try:
+            event.event_sequence()
+        except (StopIteration, IndexError, KeyboardInterrupt):
+            pass
+
+    thread = threading.Thread(target=_run, name="ChatRecorder", daemon=True)
+    thread.start()
+    thread.join(timeout=timeout)
+    if thread.is_alive():
+        event.cancel_event.set()
+        thread.join(timeout=5)
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# Playback
+# ---------------------------------------------------------------------------
+
+
+def play_back(
+    description: str,
+    calls: list[ChatCall],
+    send_ms: float,
+    speed: float,
+    late_s: float,
+    drain_s: float,
+) -> ThroughputResult:
+    """Play recorded chat into a loopback dispatcher in scaled real time."""
+    result = ThroughputResult(description, send_ms, messages=len(calls))
+    if not calls:
+        return result
+    result.sim_seconds = calls[-1].session_time - calls[0].session_time
+
+    transport = LoopbackTransport(send_time=send_ms / 1000.0 / speed)
+    dispatcher = ChatDispatcher(transport)
+    queued: dict[str, deque] = defaultdict(deque)
+    futures = []
+
+    started = time.monotonic()
+    first = calls[0].session_time
+    for call in calls:
+        due = started + (call.session_time - first) / speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        queued_at = time.monotonic()
+        future = dispatcher.send(
+            call.message, race_control=call.race_control, priority=call.priority
+        )
+        wire_message = f"/all {call.message}" if call.race_control else call.message
+        queued[wire_message].append((queued_at, call))
+        futures.append((future, call))
+
+    deadline = time.monotonic() + drain_s / speed
+    for future, _ in futures:
+        try:
+            future.exception(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:
+            break
+    dispatcher.stop(timeout=1)
+
+    # Messages with the same text are sent in the order they were queued.
+    for record in list(transport.sent):
+        queued_at, call = queued[record.message].popleft()
+        result.queue_delay.append((record.started_at - queued_at) * speed)
+        time_to_send = (record.sent_at - queued_at) * speed
+        result.time_to_send.append(time_to_send)
+        if call.priority == ChatPriority.COMMAND:
+            result.commands += 1
+            if time_to_send > late_s:
+                result.late_commands += 1
+    for pending in queued.values():
+        for _, call in pending:
+            result.dropped += 1
+            if call.priority == ChatPriority.COMMAND:
+                result.commands += 1
+                result.dropped_commands += 1
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure chat dispatcher latency on chat recorded from replays.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--send-ms",
+        type=float,
+        nargs="+",
+        default=[100.0, 300.0, 600.0],
+        help="Sim milliseconds each message takes to send.  One run per value.",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=25.0, help="Simulated seconds per wall second."
+    )
+    parser.add_argument(
+        "--late-s",
+        type=float,
+        default=2.0,
+        help="Sim seconds after which an admin command counts as late.",
+    )
+    parser.add_argument(
+        "--drain-s",
+        type=float,
+        default=60.0,
+        help="Sim seconds to wait for the outbox to empty after the last message.",
+    )
+    parser.add_argument(
+        "--fixture",
+        default="",
+        help="Only run fixtures whose description or file name contains this text.",
+    )
+    args = parser.parse_args(argv)
+
+    fixtures = [
+        f
+        for f in discover_fixtures()
+        if args.fixture.lower() in f.description.lower()
+        or args.fixture.lower() in f.telemetry_path.name.lower()
+    ]
+    if not fixtures:
+        print("No fixtures matched.")
+        return 1
+
+    print(
+        f"{'fixture':32} {'send ms':>7} {'msg/min':>7} {'queue p50':>9} {'queue p99':>9} "
+        f"{'send p50':>8} {'send p99':>8} {'cmds':>5} {'late':>5} {'dropped':>7}"
+    )
+    dropped_commands = 0
+    for fixture in fixtures:
+        calls = record_chat(fixture)
+        for send_ms in args.send_ms:
+            r = play_back(
+                fixture.description,
+                calls,
+                send_ms,
+                args.speed,
+                args.late_s,
+                args.drain_s,
+            )
+            dropped_commands += r.dropped_commands
+            print(
+                f"{r.description[:32]:32} {r.send_ms:7.0f} {r.messages_per_minute:7.1f} "
+                f"{_percentile(r.queue_delay, 50):9.2f} {_percentile(r.queue_delay, 99):9.2f} "
+                f"{_percentile(r.time_to_send, 50):8.2f} {_percentile(r.time_to_send, 99):8.2f} "
+                f"{r.commands:5d} {r.late_commands:5d} {r.dropped:7d}"
+            )
+
+    if dropped_commands:
+        print(f"\n{dropped_commands} admin command(s) were never sent.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
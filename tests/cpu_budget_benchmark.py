@@ -0,0 +1,240 @@
+"""
+cpu_budget_benchmark.py -- CPU budget check for event threads on replay fixtures
+================================================================================
+
+The replay tests run events as fast as the CPU allows, which says nothing
+about how much of a core an event burns while waiting on a live sim.  This
+script replays the fixtures in (scaled) real time instead, the way the sim
+publishes telemetry, and measures the CPU time of each event thread.
+
+HOW IT WORKS
+------------
+1.  ``PacedReplaySDK`` wraps ``ReplaySDK`` so that it behaves like the live
+    sim: ``freeze_var_buffer_latest()`` blocks until the next 60 Hz
+    publication and latches whichever recorded frame is due by the wall
+    clock (scaled by ``--speed``).  A loop that re-freezes without sleeping
+    therefore spins at the sim's publication rate, exactly as it would live.
+
+2.  Each fixture's ``RandomTimedCode69Event`` is run in its own thread with
+    ``_chat`` replaced by a no-op and ``sleep`` scaled by ``--speed``.
+
+3.  ``time.thread_time()`` is sampled inside the event thread, so the
+    reported CPU is that thread's alone.  It is compared with the wall time
+    the thread ran for to give a percentage of one core.
+
+USAGE
+-----
+::
+
+    python tests/cpu_budget_benchmark.py
+    python tests/cpu_budget_benchmark.py --speed 2 --max-seconds 60 --budget-pct 5
+    python tests/cpu_budget_benchmark.py --fixture mugello
+
+The exit code is 1 if any event thread exceeded the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_ROOT))
+
+from modules.logging_configuration import init_logging  # noqa: E402
+from modules.logging_context import set_logger  # noqa: E402
+
+_logger, _logfile = init_logging()
+set_logger(_logger, _logfile)
+
+from tests.conftest import ReplayFixture, discover_fixtures  # noqa: E402
+from tests.mock_irsdk import ReplaySDK  # noqa: E402
+
+# iRacing publishes telemetry at 60 Hz.
+PUBLISH_INTERVAL_S: float = 1.0 / 60.0
+
+
+# ---------------------------------------------------------------------------
+# PacedReplaySDK
+# ---------------------------------------------------------------------------
+
+
+class PacedReplaySDK(ReplaySDK):
+    """``ReplaySDK`` that serves frames by wall-clock time instead of per call.
+
+    Parameters
+    ----------
+    telemetry_path:
+        Path to a fixture telemetry file.
+    speed:
+        Simulated seconds per wall-clock second.
+    """
+
+    def __init__(self, telemetry_path: str | Path, speed: float = 1.0) -> None:
+        super().__init__(telemetry_path)
+        self.speed = speed
+        self._session_times = [frame["SessionTime"] for frame in self.frames]
+        self._started_at: float | None = None
+        self._frozen = False
+
+    def _due_frame_index(self) -> int:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        elapsed = (time.monotonic() - self._started_at) * self.speed
+        return (
+            bisect.bisect_right(self._session_times, self._session_times[0] + elapsed)
+            - 1
+        )
+
+    def __getitem__(self, key: str):
+        if not self._frozen:
+            self.current_frame_index = min(
+                self._due_frame_index(), self._total_frames - 1
+            )
+        return super().__getitem__(key)
+
+    def freeze_var_buffer_latest(self) -> None:
+        """Wait for the next 60 Hz publication and latch the frame due then."""
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        since_start = time.monotonic() - self._started_at
+        time.sleep(PUBLISH_INTERVAL_S - since_start % PUBLISH_INTERVAL_S)
+        index = self._due_frame_index()
+        if index >= self._total_frames - 1 and self.current_frame_index == index:
+            raise StopIteration(
+                f"PacedReplaySDK: all {self._total_frames} frames have been consumed."
+            )
+        self.current_frame_index = min(index, self._total_frames - 1)
+        self._frozen = True
+
+    def unfreeze_var_buffer_latest(self) -> None:
+        self._frozen = False
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CpuSample:
+    description: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    chat_messages: int = 0
+    outcome: str = ""
+
+    @property
+    def cpu_pct(self) -> float:
+        return 100.0 * self.cpu_s / self.wall_s if self.wall_s else 0.0
+
+
+def measure_fixture(
+    fixture: ReplayFixture, speed: float, max_seconds: float
+) -> CpuSample:
+    """Run one fixture's Code 69 event in paced real time and measure its thread."""
+    sample = CpuSample(fixture.description)
+    sdk = PacedReplaySDK(fixture.telemetry_path, speed=speed)
+    event = fixture.build_event(sdk)
+
+    def _chat(message: str, race_control: bool = False, priority=None) -> None:
+        sample.chat_messages += 1
+
+    real_sleep = event.sleep
+    event._chat = _chat
+    event.sleep = lambda seconds: real_sleep(seconds / speed)
+
+    def _run() -> None:
+        wall_start = time.monotonic()
+        cpu_start = time.thread_time()
+        try:
+            event.event_sequence()
+            sample.outcome = "completed"
+        except StopIteration:
+            sample.outcome = "replay exhausted"
+        except KeyboardInterrupt:
+            sample.outcome = f"stopped after {max_seconds:.0f}s"
+        except Exception as exc:  # noqa: BLE001
+            sample.outcome = f"error: {exc!r}"
+        finally:
+            sample.cpu_s = time.thread_time() - cpu_start
+            sample.wall_s = time.monotonic() - wall_start
+
+    thread = threading.Thread(target=_run, name="CpuBudgetEvent", daemon=True)
+    thread.start()
+    thread.join(timeout=max_seconds)
+    if thread.is_alive():
+        event.cancel_event.set()
+        thread.join(timeout=5)
+    return sample
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the CPU used by Code 69 event threads on paced replays.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--speed", type=float, default=4.0, help="Simulated seconds per wall second."
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=30.0,
+        help="Wall-clock seconds to run each fixture for before stopping it.",
+    )
+    parser.add_argument(
+        "--budget-pct",
+        type=float,
+        default=5.0,
+        help="Maximum CPU per event thread, as a percentage of one core.",
+    )
+    parser.add_argument(
+        "--fixture",
+        default="",
+        help="Only run fixtures whose description or file name contains this text.",
+    )
+    args = parser.parse_args(argv)
+
+    fixtures = [
+        f
+        for f in discover_fixtures()
+        if args.fixture.lower() in f.description.lower()
+        or args.fixture.lower() in f.telemetry_path.name.lower()
+    ]
+    if not fixtures:
+        print("No fixtures matched.")
+        return 1
+
+    print(
+        f"{'fixture':40} {'wall s':>7} {'cpu s':>7} {'cpu %':>6} {'chat':>5}  outcome"
+    )
+    over_budget = []
+    for fixture in fixtures:
+        sample = measure_fixture(fixture, args.speed, args.max_seconds)
+        flag = ""
+        if sample.cpu_pct > args.budget_pct:
+            over_budget.append(sample)
+            flag = "  OVER BUDGET"
+        print(
+            f"{sample.description[:40]:40} {sample.wall_s:7.1f} {sample.cpu_s:7.2f} "
+            f"{sample.cpu_pct:6.1f} {sample.chat_messages:5d}  {sample.outcome}{flag}"
+        )
+
+    if over_budget:
+        print(
+            f"\n{len(over_budget)} event thread(s) exceeded {args.budget_pct:.1f}% of one core."
+        )
+        return 1
+    print(f"\nAll event threads stayed under {args.budget_pct:.1f}% of one core.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
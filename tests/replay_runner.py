@@ -196,7 +196,9 @@ class ReplayRunner:
         #     race_control prefix logic so that callers can assert on the
         #     exact string (e.g. "/all Green Flag!").
         # ------------------------------------------------------------------
-        def _capturing_chat(message: str, race_control: bool = False) -> None:
+        def _capturing_chat(
+            message: str, race_control: bool = False, priority: Any = None
+        ) -> None:
             # Replicate the /all prefix that the real implementation applies
             wire_message = f"/all {message}" if race_control else message
             result.chat_messages.append(wire_message)
@@ -0,0 +1,132 @@
+"""
+test_caution.py -- Unit tests for the caution wave-around dispatcher
+====================================================================
+
+Steps a ``WaveAroundDispatcher`` through synthetic ticks and checks which
+wave-around commands reach a loopback chat, and in what order.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from modules.chat import ChatDispatcher, LoopbackTransport
+from modules.events.base_event import BaseEvent
+from modules.events.random_caution_event import WaveAroundDispatcher
+from modules.telemetry import TelemetryHub
+from tests.mock_irsdk import MockPWA, ReplaySDK
+from tests.test_replay import _base_frame, _build_telemetry_json
+
+
+def _frame(tick: int, lap_completed: list[int], lap_dist_pct: list[float], **kwargs):
+    pace_flags = kwargs.pop("pace_flags", [0, 0, 0, 0])
+    frame = _base_frame(
+        tick=tick,
+        session_time=10.0 + tick / 60,
+        session_time_remain=3590.0 - tick / 60,
+        lap_completed=lap_completed,
+        lap_dist_pct=lap_dist_pct,
+        **kwargs,
+    )
+    frame["CarIdxPaceFlags"] = pace_flags
+    return frame
+
+
+def _event(tmp_path: Path, frames: list[dict]) -> tuple[BaseEvent, LoopbackTransport]:
+    path = tmp_path / "caution.json"
+    path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+    sdk = ReplaySDK(path)
+    event = BaseEvent(sdk=sdk, pwa=MockPWA())
+    transport = LoopbackTransport()
+    event.chat_dispatcher = ChatDispatcher(transport)
+    return event, transport
+
+
+class TestWaveAroundDispatcher:
+    def test_waves_cars_crossing_together_in_track_order(self, tmp_path: Path) -> None:
+        event, transport = _event(
+            tmp_path,
+            [
+                _frame(100, [0, 6, 4, 4], [-1.0, 0.5, 0.97, 0.98]),
+                _frame(101, [0, 6, 5, 5], [-1.0, 0.51, 0.01, 0.02]),
+                _frame(
+                    102, [0, 6, 5, 5], [-1.0, 0.52, 0.02, 0.03], pace_flags=[0, 0, 0, 4]
+                ),
+            ],
+        )
+        waves = WaveAroundDispatcher(event, [2, 3])
+
+        event.sdk.freeze_var_buffer_latest()
+        assert waves.step() == [3, 2]
+        event.sdk.freeze_var_buffer_latest()
+        assert waves.step() == []
+        assert waves.waiting == [2]
+
+        deadline = time.monotonic() + 5
+        while len(transport.sent) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        event.chat_dispatcher.stop(timeout=5)
+        assert transport.messages == ["!w 33", "!eol 33", "!w 22", "!eol 22"]
+        assert set(waves.lateness) == {"33", "22"}
+        assert all(late >= 0 for late in waves.lateness.values())
+
+    def test_skips_cars_on_pit_road(self, tmp_path: Path) -> None:
+        event, transport = _event(
+            tmp_path,
+            [
+                _frame(100, [0, 6, 4, 4], [-1.0, 0.5, 0.97, 0.98]),
+                _frame(
+                    101,
+                    [0, 6, 5, 5],
+                    [-1.0, 0.51, 0.01, 0.02],
+                    on_pit_road=[0, 0, 1, 0],
+                ),
+            ],
+        )
+        waves = WaveAroundDispatcher(event, [2, 3])
+
+        event.sdk.freeze_var_buffer_latest()
+        assert waves.step() == [3]
+        assert waves.waiting == [2, 3]
+
+    def test_lateness_is_measured_on_the_session_clock(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        frames = [
+            _frame(99, [0, 6, 4, 4], [-1.0, 0.49, 0.96, 0.97]),
+            _frame(100, [0, 6, 4, 4], [-1.0, 0.5, 0.97, 0.98]),
+            _frame(101, [0, 6, 5, 4], [-1.0, 0.51, 0.01, 0.99]),
+            _frame(102, [0, 6, 5, 4], [-1.0, 0.52, 0.02, 0.99]),
+        ]
+        # The sim is two seconds on from the crossing when the !w goes out.
+        frames[3]["SessionTime"] = frames[2]["SessionTime"] + 2.0
+        path = tmp_path / "caution.json"
+        path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+        hub = TelemetryHub(ReplaySDK(path), MockPWA())
+        # Publish ticks only when the test samples.
+        monkeypatch.setattr(TelemetryHub, "running", property(lambda hub: True))
+        hub.sample()
+        event = BaseEvent(sdk=hub.view(), pwa=MockPWA())
+        sent = []
+
+        def chat(message, race_control=False, priority=None):
+            sent.append(Future())
+            return sent[-1]
+
+        event._chat = chat
+        event.sdk.freeze_var_buffer_latest()
+        waves = WaveAroundDispatcher(event, [2])
+
+        hub.sample()
+        event.sdk.freeze_var_buffer_latest()
+        assert waves.step() == [2]
+        hub.sample()
+        # However long the step took on the wall clock, only the session time
+        # between the crossing and the send counts.
+        sent[0].set_result(time.monotonic() + 30)
+        assert waves.lateness == {"22": pytest.approx(2.0)}
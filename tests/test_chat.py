@@ -0,0 +1,178 @@
+"""
+test_chat.py -- Unit tests for the chat dispatcher and reminder cache
+=====================================================================
+
+Drives ``ChatDispatcher`` against a ``ReplaySDK`` and ``MockPWA``, recording
+what would have been pasted into the sim's chat.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+
+import modules.chat.transport as transport_module
+from modules.chat import (
+    ChatDispatcher,
+    ChatPriority,
+    ClipboardTransport,
+    LoopbackTransport,
+    ReminderCache,
+    default_priority,
+)
+from modules.events.base_event import BaseEvent
+from tests.mock_irsdk import MockPWA
+from tests.test_telemetry import _replay
+
+
+@pytest.fixture
+def pasted(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    messages: list[str] = []
+    monkeypatch.setattr(transport_module.pyperclip, "copy", messages.append)
+    return messages
+
+
+class TestDefaultPriority:
+    def test_commands_first(self) -> None:
+        assert default_priority("!y") == ChatPriority.COMMAND
+        assert default_priority("!bl 12 D") == ChatPriority.COMMAND
+        assert default_priority("/12 Pass the 34 car.") == ChatPriority.MESSAGE
+        assert default_priority("!y", race_control=True) == ChatPriority.MESSAGE
+
+
+class TestChatDispatcher:
+    def test_sends_in_priority_then_queue_order(self) -> None:
+        lock = threading.Lock()
+        transport = LoopbackTransport()
+        dispatcher = ChatDispatcher(transport, lock=lock)
+
+        # Hold the chat so everything queues up behind the first message.
+        lock.acquire()
+        futures = [
+            dispatcher.send("/12 Let the 34 car by.", priority=ChatPriority.REMINDER),
+            dispatcher.send("/12 Catch the field"),
+            dispatcher.send("Green Flag!", race_control=True),
+            dispatcher.send("!pitclose"),
+            dispatcher.send("!y"),
+        ]
+        lock.release()
+        sent_at = [f.result(timeout=5) for f in futures]
+        dispatcher.stop()
+        pasted = transport.messages
+
+        # The first message may already have been taken before the rest arrived.
+        if pasted[0] == "/12 Let the 34 car by.":
+            pasted = pasted[1:] + pasted[:1]
+        assert pasted == [
+            "!pitclose",
+            "!y",
+            "/12 Catch the field",
+            "/all Green Flag!",
+            "/12 Let the 34 car by.",
+        ]
+        assert sent_at[3] < sent_at[4] < sent_at[1] < sent_at[2]
+
+    def test_stop_cancels_queued_messages(self) -> None:
+        lock = threading.Lock()
+        transport = LoopbackTransport()
+        dispatcher = ChatDispatcher(transport, lock=lock)
+        lock.acquire()
+        futures = [dispatcher.send(f"/{n} Slow down") for n in range(3)]
+        dispatcher.stop(timeout=1)
+        lock.release()
+
+        assert not dispatcher.running
+        for future in futures:
+            with pytest.raises((CancelledError, KeyboardInterrupt)):
+                future.result(timeout=1)
+        assert transport.sent == []
+
+    def test_send_error_resolves_future(
+        self, tmp_path: Path, pasted: list[str]
+    ) -> None:
+        class _BrokenWindow:
+            def type_keys(self, keys: str) -> None:
+                raise RuntimeError("window gone")
+
+        class _BrokenPWA(MockPWA):
+            def __getitem__(self, key: str) -> _BrokenWindow:
+                return _BrokenWindow()
+
+        dispatcher = ChatDispatcher(ClipboardTransport(_replay(tmp_path), _BrokenPWA()))
+        future = dispatcher.send("!y")
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        assert dispatcher.send("!y").exception(timeout=5) is not None
+        dispatcher.stop()
+
+
+class TestTransports:
+    def test_clipboard_pastes_message(self, tmp_path: Path, pasted: list[str]) -> None:
+        dispatcher = ChatDispatcher(ClipboardTransport(_replay(tmp_path), MockPWA()))
+        dispatcher.send("Green Flag!", race_control=True).result(timeout=5)
+        dispatcher.stop()
+        assert pasted == ["/all Green Flag!"]
+
+    def test_loopback_records_send_time(self) -> None:
+        transport = LoopbackTransport(send_time=0.05)
+        dispatcher = ChatDispatcher(transport)
+        sent_at = dispatcher.send("!y").result(timeout=5)
+        dispatcher.stop()
+
+        (record,) = transport.sent
+        assert record.message == "!y"
+        assert record.sent_at <= sent_at
+        assert record.sent_at - record.started_at >= 0.05
+
+
+class TestReminderCache:
+    def test_repeats_only_when_changed_or_stale(self) -> None:
+        cache = ReminderCache(ttl=24)
+        let_by = {("34", "let_by"): "Let the 12 car by."}
+
+        assert cache.due(let_by, now=100) == let_by
+        assert cache.due(let_by, now=108) == {}
+        assert cache.due({("34", "let_by"): "Let the 12, 7 cars by."}, now=116) == {
+            ("34", "let_by"): "Let the 12, 7 cars by."
+        }
+        assert cache.due({("34", "let_by"): "Let the 12, 7 cars by."}, now=132) == {}
+        assert cache.due({("34", "let_by"): "Let the 12, 7 cars by."}, now=140) == {
+            ("34", "let_by"): "Let the 12, 7 cars by."
+        }
+
+    def test_forgets_resolved_instructions(self) -> None:
+        cache = ReminderCache(ttl=24)
+        reminders = {
+            ("34", "let_by"): "Let the 12 car by.",
+            ("12", "pass"): "Pass the 34 car.",
+        }
+        cache.due(reminders, now=100)
+
+        # The 34 car let the 12 by; another lane's cars don't count.
+        assert cache.due({}, now=108, cars=["34", "12"]) == {}
+        assert len(cache) == 0
+        cache.due({("7", "pass"): "Pass the 8 car."}, now=108)
+        assert cache.due({}, now=110, cars=["34"]) == {}
+        assert len(cache) == 1
+
+        assert cache.due(reminders, now=116) == reminders
+
+
+class TestBaseEventChat:
+    def test_chat_returns_without_waiting(
+        self, tmp_path: Path, pasted: list[str]
+    ) -> None:
+        event = BaseEvent(sdk=_replay(tmp_path), pwa=MockPWA())
+        event.chat_lock.acquire()
+
+        future = event._chat("/22 Pass the 11 car.")
+        assert not future.done()
+        assert event.chat_consumer_queue.empty()
+
+        event.chat_lock.release()
+        future.result(timeout=5)
+        event.get_chat_dispatcher().stop()
+        assert pasted == ["/22 Pass the 11 car."]
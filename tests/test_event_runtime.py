@@ -0,0 +1,127 @@
+"""
+test_event_runtime.py -- Unit tests for the asyncio event runtime
+=================================================================
+
+Runs ``BaseEvent`` subclasses through ``SubprocessManager`` on its
+``EventRuntime``, both as coroutines and through the thread shim for
+synchronous events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+import modules.subprocess_manager as subprocess_manager
+from modules import SubprocessManager
+from modules.event_runtime import run_in_thread
+from modules.events import RandomEvent
+from modules.events.base_event import BaseEvent
+from tests.mock_irsdk import MockPWA
+from tests.test_telemetry import _replay
+
+
+class _AsyncEvent(BaseEvent):
+    started = False
+
+    async def async_event_sequence(self) -> None:
+        self.started = True
+        await self.async_sleep(30)
+
+
+class _SyncEvent(BaseEvent):
+    started = False
+
+    def event_sequence(self) -> None:
+        self.started = True
+        self.sleep(30)
+
+
+class _ScheduledEvent(RandomEvent):
+    polls = 0
+
+    def is_time_to_start(self) -> bool:
+        self.polls += 1
+        return self.polls > 1
+
+    async def async_event_sequence(self) -> None:
+        await self.async_chat("!y")
+
+
+@pytest.fixture
+def no_hub(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(subprocess_manager, "get_hub", lambda: None)
+
+
+def _wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+class TestSubprocessManager:
+    def test_coroutine_events_need_no_thread(self, tmp_path: Path, no_hub) -> None:
+        events = [_AsyncEvent(sdk=_replay(tmp_path), pwa=MockPWA()) for _ in range(20)]
+        manager = SubprocessManager([event.run for event in events])
+        manager.start()
+        _wait_for(lambda: all(event.started for event in events))
+        assert manager.threads == []
+        assert events[0].cancel_event is manager.cancel_event
+
+        started = time.monotonic()
+        manager.stop()
+        assert time.monotonic() - started < 1
+        assert all(future.done() for future in manager.futures)
+
+    def test_sync_events_run_on_their_own_thread(self, tmp_path: Path, no_hub) -> None:
+        event = _SyncEvent(sdk=_replay(tmp_path), pwa=MockPWA())
+        manager = SubprocessManager([event.run])
+        manager.start()
+        _wait_for(lambda: event.started)
+        (thread,) = manager.threads
+        assert thread.name == "_SyncEvent"
+
+        started = time.monotonic()
+        manager.stop()
+        assert time.monotonic() - started < 1
+        assert not thread.is_alive()
+
+    def test_scheduled_events_wait_on_the_loop(self, tmp_path: Path, no_hub) -> None:
+        event = _ScheduledEvent(sdk=_replay(tmp_path), pwa=MockPWA())
+        sent: list[str] = []
+        event._chat = lambda message, race_control=False, priority=None: sent.append(
+            message
+        )
+        manager = SubprocessManager([event.run])
+        manager.start()
+        manager.futures[0].result(timeout=5)
+        manager.stop()
+
+        assert sent == ["!y"]
+        assert event.polls == 2
+        assert manager.threads == []
+
+
+class TestAsyncPrimitives:
+    def test_wait_for_next_tick_decimates_ticks(self, tmp_path: Path) -> None:
+        event = BaseEvent(sdk=_replay(tmp_path, n_frames=30), pwa=MockPWA())
+
+        async def ticks() -> list[int]:
+            return [
+                await event.async_wait_for_next_tick(),
+                await event.async_wait_for_next_tick(max_hz=10),
+                await event.async_wait_for_next_tick(max_hz=20),
+            ]
+
+        assert asyncio.run(ticks()) == [101, 107, 110]
+
+    def test_cancelled_thread_cancels_its_task(self) -> None:
+        def cancelled() -> None:
+            raise KeyboardInterrupt
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run_in_thread(cancelled))
@@ -0,0 +1,121 @@
+"""
+test_event_workers.py -- Unit tests for events running in worker processes
+==========================================================================
+
+Publishes replayed telemetry to shared memory and reads it back the way a
+worker does, then runs an event in a real worker process and checks that its
+chat and queue items reach the parent.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from modules import SubprocessManager
+from modules.chat import ChatDispatcher, LoopbackTransport, set_chat_dispatcher
+from modules.events.base_event import BaseEvent
+from modules.telemetry import (
+    SharedTelemetrySDK,
+    SharedTelemetryWriter,
+    TelemetryHub,
+    set_hub,
+)
+from tests.mock_irsdk import MockPWA
+from tests.test_telemetry import _replay
+
+
+class _WorkerEvent(BaseEvent):
+    def event_sequence(self) -> None:
+        self.sdk.freeze_var_buffer_latest()
+        tick = self.sdk["SessionTick"]
+        self._chat("!y").result(timeout=10)
+        self.audio_queue.put(tick)
+
+
+@pytest.fixture
+def writer(tmp_path: Path):
+    hub = TelemetryHub(_replay(tmp_path), MockPWA())
+    writer = SharedTelemetryWriter(
+        hub, telemetry_size=1 << 16, session_info_size=1 << 16
+    )
+    yield writer
+    writer.stop()
+
+
+class TestSharedTelemetry:
+    def test_reader_sees_published_snapshots(self, writer) -> None:
+        snapshot = writer.hub.sample()
+        writer.publish(snapshot)
+        reader = TelemetryHub(SharedTelemetrySDK(writer.names))
+        try:
+            shared = reader.sample()
+            assert shared.tick == snapshot.tick
+            assert shared["CarIdxLapDistPct"] == snapshot["CarIdxLapDistPct"]
+            assert shared["DriverInfo"] == snapshot["DriverInfo"]
+
+            writer.publish(writer.hub.sample())
+            later = reader.sample()
+            assert later.tick == snapshot.tick + 1
+            assert later["DriverInfo"] is shared["DriverInfo"]
+        finally:
+            reader.sdk.close()
+
+    def test_session_info_is_republished_when_it_changes(self, writer) -> None:
+        writer.publish(writer.hub.sample())
+        sdk = SharedTelemetrySDK(writer.names)
+        try:
+            sdk.freeze_var_buffer_latest()
+            update = sdk.session_info_update
+            driver_info = sdk["DriverInfo"]
+
+            replay = writer.hub.sdk
+            replay.static["DriverInfo"] = dict(replay.static["DriverInfo"])
+            replay.static["DriverInfo"]["PaceCarIdx"] = 1
+            writer.publish(writer.hub.sample())
+            sdk.freeze_var_buffer_latest()
+            assert sdk.session_info_update == update + 1
+            assert sdk["DriverInfo"] is not driver_info
+            assert sdk["DriverInfo"]["PaceCarIdx"] == 1
+        finally:
+            sdk.close()
+
+    def test_reader_asks_for_unpublished_keys(self, writer) -> None:
+        for frame in writer.hub.sdk.frames:
+            frame["CarIdxRPM"] = [0, 8000, 8100, 8200]
+        writer.publish(writer.hub.sample())
+
+        def request_key(key: str) -> None:
+            writer.request_key(key)
+            writer.publish(writer.hub.sample())
+
+        sdk = SharedTelemetrySDK(writer.names, request_key=request_key)
+        try:
+            sdk.freeze_var_buffer_latest()
+            assert sdk["CarIdxRPM"] == (0, 8000, 8100, 8200)
+            with pytest.raises(KeyError):
+                sdk["NotAKey"]
+        finally:
+            sdk.close()
+
+
+class TestEventWorker:
+    def test_worker_chat_and_queues_reach_the_parent(self, tmp_path: Path) -> None:
+        set_hub(TelemetryHub(_replay(tmp_path), MockPWA()))
+        transport = LoopbackTransport()
+        set_chat_dispatcher(ChatDispatcher(transport))
+        manager = SubprocessManager([], workers=[(_WorkerEvent, {})])
+        try:
+            manager.start()
+            tick = manager.audio_queue.get(timeout=60)
+            (worker,) = manager.workers
+            worker.process.join(timeout=10)
+        finally:
+            manager.stop()
+            set_chat_dispatcher(None)
+            set_hub(None)
+
+        assert 101 <= tick <= 104
+        assert transport.messages == ["!y"]
+        assert worker.process.exitcode == 0
@@ -0,0 +1,59 @@
+"""
+test_incident_penalty.py -- Unit tests for IncidentPenaltyEvent
+===============================================================
+
+Replays DriverInfo incident counts through ``IncidentPenaltyEvent`` and
+records the penalties it would have sent.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from modules.events import IncidentPenaltyEvent
+from tests.mock_irsdk import MockPWA
+from tests.test_telemetry import _incident_replay
+
+
+def _run(event: IncidentPenaltyEvent) -> list[str]:
+    sent: list[str] = []
+    event._chat = lambda message, race_control=False, priority=None: sent.append(
+        message
+    )
+    with pytest.raises(StopIteration):
+        event.event_sequence()
+    return sent
+
+
+class TestIncidentPenaltyEvent:
+    def test_penalizes_on_the_tick_a_limit_is_reached(self, tmp_path: Path) -> None:
+        sdk = _incident_replay(
+            tmp_path,
+            [
+                (0.0, {}),
+                (0.1, {"11": 8}),
+                (0.2, {"11": 10, "22": 9}),
+                (0.3, {"11": 10, "22": 10}),
+                (0.4, {"11": 15, "22": 10}),
+                (0.5, {"11": 20, "22": 14}),
+            ],
+        )
+        event = IncidentPenaltyEvent(
+            initial_penalty_incidents=10,
+            recurring_peanlty_every_incidents=5,
+            end_recurring_incidents=20,
+            initial_penalty="30",
+            recurring_penalty="60",
+            end_recurring_penalty="0",
+            sdk=sdk,
+            pwa=MockPWA(),
+        )
+
+        assert _run(event) == [
+            "!bl 11 30 (10x)",
+            "!bl 22 30 (10x)",
+            "!bl 11 60 (15x)",
+            "!bl 11 0 (20x)",
+        ]
@@ -180,7 +180,7 @@ def _base_frame(
     }
 
 
-def _build_synthetic_frames() -> list[dict]:
+def _build_synthetic_frames(burst_frame: int = 200) -> list[dict]:
     """
     Build a list of telemetry frames that will drive a full Code 69 cycle.
 
@@ -246,7 +246,7 @@ def _build_synthetic_frames() -> list[dict]:
                 - then enters the restart-speed while-loop.
               The restart speed threshold is:
                 restart_speed = 69 * (125/100) = 86.25 kph
-              monitor_speed() computes:
+              The SpeedEstimator's latest step gives the leader's speed:
                 speed = distance_delta / time_delta * track_km * 3600
               For speed > 86.25 we need the leader to be moving quickly.
               We make cars advance by 0.05 per frame in the restart phase and
@@ -288,8 +288,8 @@ def _build_synthetic_frames() -> list[dict]:
     # Track which phase we are in so we can vary the advancement rate.
     # Phases:
     #   0 = waiting for lap completion (frames 0-39)
-    #   1 = pacing / building order    (frames 40-199)
-    #   2 = restart burst              (frames 200+)
+    #   1 = pacing / building order    (frames 40 to burst_frame - 1)
+    #   2 = restart burst              (frames burst_frame+)
     #
     # We signal phase transitions with a simple counter.
     LAP_COMPLETE_FRAME = 40  # frame index where LapCompleted flips 1→2
@@ -313,7 +313,7 @@ def _build_synthetic_frames() -> list[dict]:
             dist[2] = 0.01  # P2 a tiny bit behind
             dist[3] = 0.005  # P3 further back
 
-        elif frame_idx < 200:
+        elif frame_idx < burst_frame:
             # Phase 1: pacing.  Cars advance slowly.
             for slot in [1, 2, 3]:
                 new_dist = round(dist[slot] + advance_slow, 6)
@@ -734,6 +734,31 @@ class TestCode69RestartOrder:
         assert result.completed
         assert "code69begin" not in result.audio_events
 
+    @pytest.mark.parametrize("burst_frame, early", [(200, False), (120, True)])
+    def test_code69_flags_leader_going_before_told(
+        self, tmp_path: Path, burst_frame: int, early: bool
+    ) -> None:
+        """
+        The leader is only penalised for accelerating too early if they are
+        over the restart speed as they are told to go.
+
+        The field reaches the restart position around frame 130.  Bursting at
+        frame 200 is after the leader is told to go; at frame 120 it is before.
+        """
+        data = _build_telemetry_json(_build_synthetic_frames(burst_frame))
+        # On a 10 m lap the pacing pace is ~12 kph and the burst ~108 kph,
+        # either side of the 86.25 kph restart speed.
+        data["meta"]["static"]["WeekendInfo"] = {"TrackLength": "0.01 km"}
+        path = tmp_path / "restart.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        sdk = ReplaySDK(path)
+
+        result = ReplayRunner(sdk, _make_event(sdk)).run(timeout=30)
+
+        assert result.completed and result.exception is None
+        assert any("Green Flag" in m for m in result.chat_messages)
+        assert any("Accelerated too early" in m for m in result.chat_messages) is early
+
     def test_frames_consumed_increases(self, sample_telemetry_path: Path) -> None:
         """``result.frames_consumed`` reflects how many frames were read."""
         sdk = ReplaySDK(sample_telemetry_path)
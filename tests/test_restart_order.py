@@ -0,0 +1,270 @@
+"""
+test_restart_order.py -- Unit tests for RestartOrderManager
+===========================================================
+
+Builds restart orders on the captured fixtures and checks
+``update_car_positions`` against the original pairwise implementation.
+"""
+
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from modules.events.random_code_69_event import (
+    RestartOrderManager,
+    RestartRecord,
+    _find_inversions,
+)
+from modules.telemetry import FieldSnapshot
+from tests.conftest import FIXTURES_DIR
+from tests.mock_irsdk import ReplaySDK
+
+
+def _legacy_update_car_positions(manager: RestartOrderManager) -> None:
+    """The O(n^2) ``update_car_positions`` the inversion pass replaced."""
+    sdk = manager.sdk
+    for i, car in enumerate(manager.order):
+        manager.order[i]["ActualPosition"] = (
+            sdk["CarIdxLapCompleted"][car["CarIdx"]]
+            + sdk["CarIdxLapDistPct"][car["CarIdx"]]
+            - car["BeganPacingLap"]
+        )
+    for i, car in enumerate(manager.order):
+        manager.order[i]["IncorrectOvertakes"] = []
+        manager.order[i]["IncorrectlyOvertakenBy"] = []
+        for car_ahead in manager.order[:i]:
+            wave_adjusted_car_ahead_position = (
+                car_ahead["ActualPosition"]
+                - car_ahead["WaveAround"]
+                - car_ahead["SlowerClassCatchup"]
+                + car["WaveAround"]
+                + car["SlowerClassCatchup"]
+            )
+            if (
+                car["ActualPosition"] > wave_adjusted_car_ahead_position
+                and not sdk["CarIdxOnPitRoad"][car_ahead["CarIdx"]]
+                and not sdk["CarIdxOnPitRoad"][car["CarIdx"]]
+                and not sdk["CarIdxLapDistPct"][car_ahead["CarIdx"]] == -1
+                and not sdk["CarIdxLapDistPct"][car["CarIdx"]] == -1
+            ):
+                manager.order[i]["IncorrectOvertakes"].append(car_ahead["CarNumber"])
+        for car_behind in manager.order[i + 1 :]:
+            wave_adjusted_car_behind_position = (
+                car_behind["ActualPosition"]
+                - car_behind["WaveAround"]
+                - car_behind["SlowerClassCatchup"]
+                + car["WaveAround"]
+                + car["SlowerClassCatchup"]
+            )
+            if (
+                car["ActualPosition"] < wave_adjusted_car_behind_position
+                and not sdk["CarIdxOnPitRoad"][car_behind["CarIdx"]]
+                and not sdk["CarIdxOnPitRoad"][car["CarIdx"]]
+                and not sdk["CarIdxLapDistPct"][car_behind["CarIdx"]] == -1
+                and not sdk["CarIdxLapDistPct"][car["CarIdx"]] == -1
+            ):
+                manager.order[i]["IncorrectlyOvertakenBy"].append(
+                    car_behind["CarNumber"]
+                )
+        manager.order[i]["WavesRemain"] = (
+            car["ActualPosition"] - (car["WaveAround"] + car["SlowerClassCatchup"])
+            < manager.leader()["ActualPosition"] - 1
+        ) and car["ActualPosition"] > 0
+
+
+def _legacy_leader(manager: RestartOrderManager) -> dict | None:
+    """The pre-cache ``RestartOrderManager.leader``."""
+    sdk = manager.sdk
+    return next(
+        (
+            car
+            for car in manager.order
+            if sdk["CarIdxLapDistPct"][car["CarIdx"]] != -1
+            and (
+                not [
+                    c for c in manager.order if not sdk["CarIdxOnPitRoad"][c["CarIdx"]]
+                ]
+                or not sdk["CarIdxOnPitRoad"][car["CarIdx"]]
+            )
+        ),
+        None,
+    )
+
+
+def _summary(manager: RestartOrderManager) -> list[tuple]:
+    return [
+        (
+            car["CarIdx"],
+            car["ActualPosition"],
+            car["IncorrectOvertakes"],
+            car["IncorrectlyOvertakenBy"],
+            car["WavesRemain"],
+        )
+        for car in manager.order
+    ]
+
+
+class TestFindInversions:
+    def test_in_order(self) -> None:
+        assert _find_inversions([3.0, 2.0, 2.0, 1.0]) == ({}, {})
+
+    def test_out_of_order(self) -> None:
+        passed, passed_by = _find_inversions([2.0, 3.0, 1.0, 2.5])
+        assert passed == {1: [0], 3: [0, 2]}
+        assert passed_by == {0: [1, 3], 2: [3]}
+
+
+class TestUpdateCarPositions:
+    @pytest.mark.parametrize(
+        "fixture",
+        [
+            "bathurst.json.gz",
+            "miami.json.gz",
+            "mugello.json.gz",
+            "rbr.json.gz",
+            "S11R7.json.gz",
+        ],
+    )
+    def test_matches_legacy(self, fixture: str) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / fixture)
+        rng = random.Random(fixture)
+        total = len(sdk.frames)
+        checked = overtakes = 0
+
+        # Start pacing at a few points in the replay, adding the field in a
+        # shuffled order with some wave arounds so the order is full of
+        # overtakes, then follow it through the rest of the replay.
+        for start in range(total // 10, total, total // 4):
+            sdk.current_frame_index = start
+            manager = RestartOrderManager(sdk)
+            cars = FieldSnapshot(sdk).order.tolist()
+            connected = [c for c in cars if sdk["CarIdxLapDistPct"][c] != -1]
+            if not connected:
+                continue
+            rng.shuffle(cars)
+            # The order needs a leader from the first car on.
+            cars.remove(connected[0])
+            cars.insert(0, connected[0])
+            for car_idx in cars:
+                manager.add_car_to_order(
+                    car_idx,
+                    wave_around=int(rng.random() < 0.2),
+                    slower_class_catchup=int(rng.random() < 0.1),
+                )
+
+            for frame in range(start, total, 7):
+                sdk.current_frame_index = frame
+                legacy = copy.copy(manager)
+                legacy.order = copy.deepcopy(manager.order)
+                assert manager.leader() is _legacy_leader(manager), f"frame {frame}"
+                if manager.leader() is None:
+                    # Both fail the same way once every car has disconnected.
+                    with pytest.raises(TypeError):
+                        _legacy_update_car_positions(legacy)
+                    with pytest.raises(TypeError):
+                        manager.update_car_positions()
+                    continue
+                manager.update_car_positions()
+                _legacy_update_car_positions(legacy)
+                assert _summary(manager) == _summary(legacy), f"frame {frame}"
+                checked += 1
+                overtakes += len(manager.out_of_place_cars)
+
+        assert checked and overtakes
+
+
+class TestLeader:
+    def _manager(self) -> tuple[ReplaySDK, RestartOrderManager]:
+        sdk = ReplaySDK(FIXTURES_DIR / "mugello.json.gz")
+        sdk.current_frame_index = len(sdk.frames) // 2
+        manager = RestartOrderManager(sdk)
+        for car_idx in FieldSnapshot(sdk).order.tolist():
+            manager.add_car_to_order(car_idx)
+        return sdk, manager
+
+    def test_cached_until_next_tick(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        sdk, manager = self._manager()
+        leader = manager.leader()
+        calls = []
+        find_leader = manager._find_leader
+        monkeypatch.setattr(
+            manager, "_find_leader", lambda: calls.append(1) or find_leader()
+        )
+
+        assert manager.leader() is leader
+        assert not calls
+
+        sdk.current_frame_index += 1
+        assert manager.leader() is _legacy_leader(manager)
+        assert len(calls) == 1
+
+    def test_recomputed_when_order_replaced(self) -> None:
+        _, manager = self._manager()
+        leader = manager.leader()
+        manager.order = [c for c in manager.order if c is not leader]
+
+        assert manager.leader() is not leader
+        assert manager.leader() is _legacy_leader(manager)
+
+
+class TestRestartRecord:
+    def _record(self) -> RestartRecord:
+        return RestartRecord(
+            CarIdx=3,
+            CarNumber="42",
+            CarClassOrder="1",
+            BeganPacingLap=5,
+            BeganPacingTick=900,
+            BeganPacingDistance=0.25,
+            WaveAround=1,
+        )
+
+    def test_dict_view(self) -> None:
+        record = self._record()
+        record["LatePit"] = 1
+        record.IncorrectOvertakes.append("7")
+
+        as_dict = record.as_dict()
+        assert list(as_dict) == list(RestartRecord.FIELDS)
+        assert as_dict["CarNumber"] == "42"
+        assert as_dict["LatePit"] == 1
+        assert as_dict["IncorrectOvertakes"] == ["7"]
+        assert as_dict["IncorrectOvertakes"] is not record.IncorrectOvertakes
+        assert record == as_dict
+        assert repr(record) == repr(as_dict)
+        assert RestartRecord.from_mapping(as_dict) == record
+
+    def test_unknown_keys(self) -> None:
+        record = self._record()
+        with pytest.raises(KeyError):
+            record["as_dict"]
+        with pytest.raises(KeyError):
+            record["Unknown"] = 1
+        assert record.get("Unknown") is None
+        assert not hasattr(record, "__dict__")
+
+    def test_overtake_buffers_reused(self) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / "mugello.json.gz")
+        sdk.current_frame_index = len(sdk.frames) // 2
+        manager = RestartOrderManager(sdk)
+        for car_idx in FieldSnapshot(sdk).order.tolist():
+            if sdk["CarIdxLapDistPct"][car_idx] != -1:
+                manager.add_car_to_order(car_idx)
+        # Last to first, so every car is out of place.
+        manager.order.reverse()
+        buffers = [
+            (id(c.IncorrectOvertakes), id(c.IncorrectlyOvertakenBy))
+            for c in manager.order
+        ]
+
+        sdk.current_frame_index += 1
+        manager.update_car_positions()
+
+        assert manager.out_of_place_cars
+        assert buffers == [
+            (id(c.IncorrectOvertakes), id(c.IncorrectlyOvertakenBy))
+            for c in manager.order
+        ]
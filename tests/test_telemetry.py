@@ -0,0 +1,835 @@
+"""
+test_telemetry.py -- Unit tests for the shared telemetry hub
+============================================================
+
+Drives ``TelemetryHub`` / ``TelemetryView`` from a ``ReplaySDK`` built with
+the synthetic frame helpers in ``test_replay.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from modules.events.base_event import BaseEvent
+from modules.telemetry import hub as hub_module
+from modules.telemetry import (
+    ClassPace,
+    FieldClassification,
+    FieldSnapshot,
+    IncidentKind,
+    IncidentTracker,
+    StepDelta,
+    TelemetryHub,
+    TelemetryView,
+    get_class_pace,
+    get_driver_directory,
+    get_hub,
+    get_incident_stream,
+    get_pit_lane_tracker,
+    get_speed_estimator,
+    get_track_model,
+    set_hub,
+)
+from tests.conftest import FIXTURES_DIR
+from tests.mock_irsdk import MockPWA, ReplaySDK
+from tests.test_replay import _base_frame, _build_telemetry_json
+
+
+def _replay(tmp_path: Path, n_frames: int = 5) -> ReplaySDK:
+    frames = [
+        _base_frame(
+            tick=100 + i,
+            session_time=10.0 + i / 60,
+            session_time_remain=3590.0 - i / 60,
+            lap_dist_pct=[-1.0, 0.1 + i / 100, 0.05 + i / 100, 0.02 + i / 100],
+        )
+        for i in range(n_frames)
+    ]
+    path = tmp_path / "hub.json"
+    path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+    return ReplaySDK(path)
+
+
+class TestTelemetryHub:
+    def test_sample_publishes_immutable_snapshot(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        snapshot = hub.sample()
+
+        assert snapshot.tick == 101
+        assert isinstance(snapshot["CarIdxLapDistPct"], tuple)
+        assert snapshot["CarIdxLapDistPct"][1] == pytest.approx(0.11)
+        assert snapshot["DriverInfo"]["Drivers"][1]["CarNumber"] == "11"
+
+    def test_views_agree_on_tick(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        hub.sample()
+        a, b = hub.view(), hub.view()
+        a.freeze_var_buffer_latest()
+        b.freeze_var_buffer_latest()
+
+        assert a.snapshot is b.snapshot
+        hub.sample()
+        # Frozen views keep their tick until they unfreeze.
+        assert a["SessionTick"] == 101
+        a.unfreeze_var_buffer_latest()
+        assert a["SessionTick"] == 102
+
+    def test_missing_key_is_read_through(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA(), keys=("SessionTick",))
+        view = hub.view()
+        view.freeze_var_buffer_latest()
+
+        assert "SessionTime" not in view.snapshot
+        assert view["SessionTime"] == pytest.approx(10.0 + 1 / 60, abs=1e-3)
+        assert "SessionTime" in view.snapshot
+        assert "SessionTime" in hub.sample()
+        with pytest.raises(KeyError):
+            view["NotATelemetryKey"]
+
+    def test_session_info_reused_until_update(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        sdk.session_info_update = 1
+        hub = TelemetryHub(sdk, MockPWA())
+        first = hub.sample()
+        sdk.static["DriverInfo"] = {"Drivers": []}
+
+        assert hub.sample()["DriverInfo"] is first["DriverInfo"]
+        sdk.session_info_update = 2
+        assert hub.sample()["DriverInfo"] == {"Drivers": []}
+
+    def test_reconnects_when_the_sim_is_not_attached(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(hub_module, "RECONNECT_INTERVAL", 0)
+        sdk = _replay(tmp_path)
+        startups = []
+
+        def startup() -> bool:
+            startups.append(sdk.is_connected)
+            return sdk.is_connected
+
+        sdk.startup = startup
+        sdk.is_connected = False
+        hub = TelemetryHub(sdk, MockPWA())
+
+        # The sim isn't running yet, so every sample tries again.
+        assert not hub.connect()
+        hub.sample()
+        assert not hub.connected
+        sdk.is_connected = True
+        hub.sample()
+        assert hub.connected
+        assert startups == [False, False, True]
+
+        # The sim restarts between sessions.
+        sdk.is_connected = False
+        hub.sample()
+        assert len(startups) == 4
+
+        # Once the last user lets go, the next one attaches afresh.
+        sdk.is_connected = True
+        hub.start()
+        hub.stop()
+        assert not hub.connected
+        assert hub.connect()
+        assert startups[-1] is True
+
+    def test_memo_computes_once_per_snapshot(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        snapshot = hub.sample()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return len(calls)
+
+        assert snapshot.memo("x", factory) == 1
+        assert snapshot.memo("x", factory) == 1
+        assert hub.sample().memo("x", factory) == 2
+
+    def test_wait_for_tick_with_thread(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        hub.start()
+        hub.start()
+        try:
+            snapshot = hub.wait_for_tick(timeout=1)
+            while snapshot.tick < 104:
+                snapshot = hub.wait_for_tick(after_tick=snapshot.tick, timeout=1)
+            # The replay has run dry, so waiting for a newer tick times out
+            # with the last snapshot.
+            assert hub.wait_for_tick(after_tick=104, timeout=0.05).tick == 104
+            hub.stop()
+            assert hub.running
+        finally:
+            hub.stop()
+        assert not hub.running
+
+
+class TestBaseEventUsesHub:
+    def test_events_share_global_hub(self, tmp_path: Path) -> None:
+        previous = get_hub()
+        hub = set_hub(TelemetryHub(_replay(tmp_path), MockPWA()))
+        try:
+            a, b = BaseEvent(), BaseEvent()
+            assert isinstance(a.sdk, TelemetryView)
+            assert a.sdk.hub is b.sdk.hub is hub
+            assert a.pwa is hub.pwa
+        finally:
+            set_hub(previous)
+
+
+def _legacy_running_order(sdk, max_laps_behind_leader=99) -> list[dict]:
+    """The dict-list running order as BaseEvent built it before FieldSnapshot."""
+    running_order = [
+        {
+            "CarIdx": car["CarIdx"],
+            "CarNumber": car["CarNumber"],
+            "LapCompleted": sdk["CarIdxLapCompleted"][car["CarIdx"]],
+            "LapDistPct": sdk["CarIdxLapDistPct"][car["CarIdx"]],
+            "InPits": sdk["CarIdxOnPitRoad"][car["CarIdx"]],
+            "total_completed": sdk["CarIdxLapCompleted"][car["CarIdx"]]
+            + sdk["CarIdxLapDistPct"][car["CarIdx"]],
+            "last_lap_time": sdk["CarIdxLastLapTime"][car["CarIdx"]],
+            "f2time": sdk["CarIdxF2Time"][car["CarIdx"]],
+        }
+        for car in sdk["DriverInfo"]["Drivers"]
+        if car["CarIsPaceCar"] != 1
+    ]
+    running_order.sort(key=lambda x: x["total_completed"], reverse=True)
+    return [
+        runner
+        for runner in running_order
+        if runner["total_completed"]
+        >= (running_order[0]["total_completed"] - max_laps_behind_leader - 1)
+    ]
+
+
+class TestFieldSnapshot:
+    @pytest.mark.parametrize("max_laps", [99, 0])
+    def test_running_order_matches_legacy(self, max_laps: int) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / "mugello.json.gz")
+        while not sdk.is_replay_exhausted:
+            field = FieldSnapshot(sdk, sdk["SessionTick"])
+            expected = _legacy_running_order(sdk, max_laps)
+            assert field.running_order(max_laps) == expected
+            assert field.leader == expected[0]["CarIdx"]
+            assert field.max_total_completed == expected[0]["total_completed"]
+            sdk.current_frame_index += 1
+
+    def test_running_order_dicts_are_fresh(self, tmp_path: Path) -> None:
+        field = FieldSnapshot(_replay(tmp_path))
+        field.running_order()[0]["LapDistPct"] = 0
+
+        assert field.running_order()[0]["LapDistPct"] == pytest.approx(0.1)
+        assert list(field.order) == [1, 2, 3]
+
+    def test_event_shares_snapshot_per_tick(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        hub.sample()
+        a = BaseEvent(sdk=hub.view(), pwa=MockPWA())
+        b = BaseEvent(sdk=hub.view(), pwa=MockPWA())
+        a.sdk.freeze_var_buffer_latest()
+        b.sdk.freeze_var_buffer_latest()
+
+        assert a.get_field_snapshot() is b.get_field_snapshot()
+        hub.sample()
+        a.sdk.freeze_var_buffer_latest()
+        assert a.get_field_snapshot() is not b.get_field_snapshot()
+
+
+def _legacy_lap_down_cars(sdk, max_laps_behind_leader: int) -> list[int]:
+    """BaseEvent.get_lap_down_cars before FieldClassification."""
+    laps_completed = sdk["CarIdxLapCompleted"]
+    partial_laps = sdk["CarIdxLapDistPct"]
+    distance_covered = [
+        laps_completed[i] + partial_laps[i] for i in range(len(laps_completed))
+    ]
+    max_distance_covered = max(distance_covered)
+    return sorted(
+        [
+            driver["CarIdx"]
+            for driver in get_driver_directory(sdk).entries
+            if max_distance_covered - 1
+            >= distance_covered[driver["CarIdx"]]
+            >= max_distance_covered - max_laps_behind_leader - 1
+        ],
+        key=lambda x: laps_completed[x] + partial_laps[x],
+        reverse=True,
+    )
+
+
+class TestFieldClassification:
+    @pytest.mark.parametrize("fixture", ["mugello", "vir"])
+    @pytest.mark.parametrize("max_laps", [99, 0])
+    def test_matches_legacy(self, fixture: str, max_laps: int) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / f"{fixture}.json.gz")
+        while not sdk.is_replay_exhausted:
+            classification = FieldClassification(FieldSnapshot(sdk, sdk["SessionTick"]))
+            laps = sdk["CarIdxLapCompleted"]
+            lapped = _legacy_lap_down_cars(sdk, max_laps)
+            on_pit_road = [
+                d["CarIdx"]
+                for d in get_driver_directory(sdk).entries
+                if sdk["CarIdxOnPitRoad"][d["CarIdx"]]
+            ]
+            assert classification.lapped(max_laps).tolist() == lapped
+            assert classification.wave_arounds(max_laps).tolist() == [
+                car for car in lapped if laps[car] >= max(laps) - max_laps
+            ]
+            assert classification.on_pit_road.tolist() == on_pit_road
+            sdk.current_frame_index += 10
+
+    def test_lapped_and_pit_road(self, tmp_path: Path) -> None:
+        frame = _base_frame(
+            tick=100,
+            session_time=10.0,
+            session_time_remain=3590.0,
+            lap_completed=[0, 5, 4, 3],
+            lap_dist_pct=[-1.0, 0.5, 0.4, 0.3],
+            on_pit_road=[0, 0, 1, 0],
+        )
+        path = tmp_path / "classes.json"
+        path.write_text(json.dumps(_build_telemetry_json([frame])), encoding="utf-8")
+        sdk = ReplaySDK(path)
+        classification = FieldClassification(FieldSnapshot(sdk))
+
+        assert classification.lapped().tolist() == [2, 3]
+        assert classification.lapped(1).tolist() == [2]
+        assert classification.wave_arounds(1).tolist() == [2]
+        assert classification.on_pit_road.tolist() == [2]
+
+    def test_event_shares_classification_per_tick(self, tmp_path: Path) -> None:
+        hub = TelemetryHub(_replay(tmp_path), MockPWA())
+        hub.sample()
+        a = BaseEvent(sdk=hub.view(), pwa=MockPWA())
+        b = BaseEvent(sdk=hub.view(), pwa=MockPWA())
+        a.sdk.freeze_var_buffer_latest()
+        b.sdk.freeze_var_buffer_latest()
+
+        assert a.get_field_classification() is b.get_field_classification()
+        assert a.get_lap_down_cars() == []
+
+
+def _legacy_record(step: list[dict], car_idx: int) -> dict | None:
+    return next((r for r in step if r["CarIdx"] == car_idx), None)
+
+
+def _legacy_transitions(car_idx: int, last_step: list[dict], this_step: list[dict]):
+    """The car_has_* checks as BaseEvent implemented them before StepDelta."""
+    last = _legacy_record(last_step, car_idx)
+    this = _legacy_record(this_step, car_idx)
+    if last is None or this is None:
+        return None
+    racing = last["LapCompleted"] > 0 and this["LapCompleted"] > 0
+    return {
+        "completed_lap": this["LapCompleted"] == last["LapCompleted"] + 1,
+        "left_pits": this["InPits"] == 0 and last["InPits"] == 1 and racing,
+        "entered_pits": (this["InPits"] == 1 and last["InPits"] == 0 and racing)
+        or (this["InPits"] == 1 and last["LapDistPct"] < 0),
+        "new_lap_time": this["last_lap_time"] != last["last_lap_time"],
+    }
+
+
+class TestStepDelta:
+    @pytest.mark.parametrize("fixture", ["rbr.json.gz", "bathurst.json.gz"])
+    def test_matches_legacy_car_has_checks(self, fixture: str) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / fixture)
+        last_field = FieldSnapshot(sdk)
+        last_step = last_field.running_order(0)
+        seen = set()
+        while not sdk.is_replay_exhausted:
+            field = FieldSnapshot(sdk)
+            this_step = field.running_order(0)
+            from_lists = StepDelta(last_step, this_step)
+            from_fields = StepDelta(last_field, field)
+            for car_idx in field.car_idx.tolist():
+                expected = _legacy_transitions(car_idx, last_step, this_step)
+                if expected is None:
+                    assert car_idx not in from_lists.present
+                    continue
+                for transition, value in expected.items():
+                    assert (car_idx in getattr(from_lists, transition)) == value
+                    assert (car_idx in getattr(from_fields, transition)) == value
+                    if value:
+                        seen.add(transition)
+            last_field, last_step = field, this_step
+            sdk.current_frame_index += 1
+        assert {"completed_lap", "new_lap_time"} <= seen
+
+    def test_disconnects_and_flags(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        before = FieldSnapshot(sdk)
+        sdk.frames[1]["CarIdxLapDistPct"][2] = -1.0
+        sdk.frames[1]["CarIdxSessionFlags"][3] = 0x10000
+        sdk.current_frame_index = 1
+        after = FieldSnapshot(sdk)
+
+        delta = StepDelta(before, after)
+        assert delta.disconnected == {2}
+        assert delta.flags_changed == {3}
+        assert StepDelta(after, before).reconnected == {2}
+
+    def test_event_caches_delta_per_step_pair(self, tmp_path: Path) -> None:
+        event = BaseEvent(sdk=_replay(tmp_path), pwa=MockPWA())
+        last_step = event.get_current_running_order()
+        this_step = event.get_current_running_order()
+
+        delta = event.step_delta(last_step, this_step)
+        assert event.step_delta(last_step, this_step) is delta
+        assert event.step_delta(this_step, last_step) is not delta
+        assert not event.car_has_completed_lap({"CarIdx": 1}, last_step, this_step)
+
+
+class TestDriverDirectory:
+    def test_lookups(self, tmp_path: Path) -> None:
+        directory = get_driver_directory(_replay(tmp_path))
+
+        assert directory.pace_car_idx == 0
+        assert [d["CarIdx"] for d in directory.entries] == [1, 2, 3]
+        assert directory.car_number(2) == "22"
+        assert directory.car_idx("33") == 3
+        assert directory.by_car_number("99") is None
+        with pytest.raises(KeyError):
+            directory.car_idx("99")
+
+    def test_rebuilt_only_when_driver_info_changes(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        directory = get_driver_directory(sdk)
+        sdk.freeze_var_buffer_latest()
+        assert get_driver_directory(sdk) is directory
+
+        sdk.static["DriverInfo"] = {
+            "Drivers": [{"CarIdx": 1, "CarNumber": "7", "CarIsPaceCar": 0}]
+        }
+        rebuilt = get_driver_directory(sdk)
+        assert rebuilt is not directory
+        assert rebuilt.pace_car_idx is None
+        assert rebuilt.car_idx("7") == 1
+
+
+def _legacy_class_lap_times(sdk: ReplaySDK) -> dict:
+    """The per-manager class pace scan ClassPace replaced."""
+    classes = sdk["CarIdxClass"]
+    best_laps = sdk["CarIdxBestLapTime"]
+    last_laps = sdk["CarIdxLastLapTime"]
+    class_lap_times = {}
+    for car_class in classes:
+        if car_class in class_lap_times:
+            continue
+        best_lap = None
+        for i, c in enumerate(classes):
+            if c == car_class:
+                cars_best = best_laps[i] if best_laps[i] > 0 else last_laps[i]
+                if (best_lap is None or cars_best < best_lap) and cars_best > 0:
+                    best_lap = cars_best
+        class_lap_times[car_class] = 999999 if best_lap is None else best_lap
+    return class_lap_times
+
+
+class TestClassPace:
+    def test_matches_legacy_on_fixture(self) -> None:
+        sdk = ReplaySDK(FIXTURES_DIR / "mugello.json.gz")
+        pace = ClassPace()
+        for frame in range(0, len(sdk.frames), 25):
+            sdk.current_frame_index = frame
+            pace.update(sdk)
+            assert pace.class_lap_times == _legacy_class_lap_times(sdk)
+
+    def test_ranks_classes_as_lap_times_arrive(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        sdk.static["CarIdxClass"] = [11, 1, 2, 2]
+        sdk.static["CarIdxBestLapTime"] = [0.0, 0.0, 0.0, 0.0]
+        for frame in sdk.frames:
+            frame["CarIdxLastLapTime"] = [0.0, 0.0, 0.0, 0.0]
+        sdk.frames[1]["CarIdxLastLapTime"] = [0.0, 91.0, 0.0, 0.0]
+        sdk.frames[2]["CarIdxLastLapTime"] = [0.0, 91.0, 0.0, 88.5]
+        sdk.frames[3]["CarIdxLastLapTime"] = [0.0, 91.0, 0.0, 88.5]
+        pace = ClassPace()
+
+        pace.update(sdk)
+        assert pace.class_lap_times == {11: 999999, 1: 999999, 2: 999999}
+        assert pace.class_speed_rank == {11: "1", 1: "2", 2: "3"}
+
+        sdk.freeze_var_buffer_latest()
+        pace.update(sdk)
+        assert pace.class_speed_rank == {1: "1", 11: "2", 2: "3"}
+
+        sdk.freeze_var_buffer_latest()
+        pace.update(sdk)
+        assert pace.class_lap_times == {11: 999999, 1: 91.0, 2: 88.5}
+        assert pace.class_speed_rank == {2: "1", 1: "2", 11: "3"}
+        assert pace.fastest_lap(2) == 88.5
+        assert pace.fastest_lap(5) is None
+
+        published = pace.class_lap_times
+        sdk.freeze_var_buffer_latest()
+        pace.update(sdk)
+        assert pace.class_lap_times is published
+
+    def test_shared_per_session(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        pace = get_class_pace(sdk)
+        sdk.freeze_var_buffer_latest()
+
+        assert get_class_pace(sdk) is pace
+        assert pace.tick == sdk["SessionTick"]
+
+    def test_kept_across_driver_info_updates(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        sdk.static["CarIdxClass"] = [11, 1, 2, 2]
+        sdk.static["CarIdxBestLapTime"] = [0.0, 91.0, 90.0, 88.5]
+        pace = get_class_pace(sdk)
+        published = pace.class_lap_times
+        assert published == {11: 999999, 1: 91.0, 2: 88.5}
+
+        # An incident count change publishes a new DriverInfo with the same field.
+        sdk.static["DriverInfo"] = dict(sdk.static["DriverInfo"])
+        sdk.freeze_var_buffer_latest()
+        assert get_class_pace(sdk) is pace
+        assert pace.class_lap_times is published
+
+        # Only the classes a car moved between are recomputed.
+        sdk.static["CarIdxClass"] = [11, 1, 1, 2]
+        sdk.static["DriverInfo"] = dict(sdk.static["DriverInfo"])
+        sdk.freeze_var_buffer_latest()
+        assert get_class_pace(sdk) is pace
+        assert pace.class_lap_times == {11: 999999, 1: 90.0, 2: 88.5}
+
+    def test_fastest_lap_for_class_reads_best_laps(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        sdk.static["CarIdxClass"] = [11, 1, 2, 2]
+        sdk.static["CarIdxBestLapTime"] = [0.0, 91.0, -1.0, 88.5]
+        event = BaseEvent(sdk=sdk, pwa=MockPWA())
+
+        assert event.get_fastest_lap_for_class(1) == 91.0
+        assert event.get_fastest_lap_for_class(2) == -1.0
+        assert event.get_fastest_lap_for_class(5) is None
+
+
+def _legacy_4x(samples: list[tuple[float, dict]], window: float) -> list[list[str]]:
+    """The DataFrame bookkeeping driver_4x_generator used before IncidentTracker."""
+    from pandas import DataFrame, concat
+
+    df = DataFrame(data=[], columns=["timestamp", "car_number", "incidents"])
+    reported = []
+    for now, counts in samples:
+        for car_number, incidents in counts.items():
+            row = DataFrame(
+                {
+                    "timestamp": [now],
+                    "car_number": [car_number],
+                    "incidents": [incidents],
+                }
+            )
+            df = concat([df, row], ignore_index=True)
+        df = df[df["timestamp"] >= now - window]
+        y = []
+        for car_number in list(set(df["car_number"])):
+            car_data = df[df["car_number"] == car_number]
+            if len(car_data) < 2:
+                continue
+            if car_data["incidents"].max() - car_data["incidents"].min() >= 4:
+                df = df[df["car_number"] != car_number]
+                y.append(car_number)
+        reported.append(sorted(y))
+    return reported
+
+
+class TestIncidentTracker:
+    def test_matches_legacy_dataframe(self) -> None:
+        rng = random.Random(4)
+        counts = {str(n): 0 for n in range(8)}
+        samples = []
+        for step in range(150):
+            for car_number in counts:
+                counts[car_number] += rng.choice([0, 0, 0, 0, 0, 1, 2, 4])
+            # Cars drop out of the sample stream, as they do after the checkered flag.
+            present = {c: n for c, n in counts.items() if rng.random() > 0.1}
+            samples.append((step * 0.7, present))
+
+        tracker = IncidentTracker(window=5)
+        reported = []
+        for now, present in samples:
+            for car_number, incidents in present.items():
+                tracker.record(car_number, incidents, now)
+            tracker.expire(now)
+            reported.append(sorted(tracker.jumps(4)))
+
+        assert reported == _legacy_4x(samples, window=5)
+        assert any(reported)
+
+    def test_window_spread(self) -> None:
+        tracker = IncidentTracker(window=10)
+        tracker.record("7", 2, 0.0)
+        tracker.record("7", 4, 5.0)
+        assert tracker.jumps(4) == []
+
+        tracker.record("7", 6, 11.0)
+        tracker.expire(11.0)
+        # The sample at t=0 has left the window, so the spread is only 2.
+        assert tracker.jumps(4) == []
+
+        tracker.record("7", 9, 12.0)
+        tracker.expire(12.0)
+        assert tracker.jumps(4) == ["7"]
+        assert "7" not in tracker
+
+
+def _incident_replay(tmp_path: Path, timeline: list[tuple[float, dict]]) -> ReplaySDK:
+    """A replay whose DriverInfo has the given incident counts at each SessionTime."""
+    sdk = _replay(tmp_path, n_frames=len(timeline))
+    for frame, (session_time, counts) in zip(sdk.frames, timeline):
+        frame["SessionTime"] = session_time
+        frame["SessionState"] = 4
+        frame["DriverInfo"] = {
+            "Drivers": [
+                {**d, "TeamIncidentCount": counts.get(d["CarNumber"], 0)}
+                for d in sdk.static["DriverInfo"]["Drivers"]
+            ]
+        }
+    return sdk
+
+
+class TestIncidentStream:
+    def test_publishes_once_per_tick_to_every_subscriber(self, tmp_path: Path) -> None:
+        sdk = _incident_replay(
+            tmp_path,
+            [
+                (0.0, {}),
+                (1.0, {"11": 2, "33": 2}),
+                (3.0, {"11": 4, "33": 2}),
+                (15.0, {"11": 4, "33": 4}),
+            ],
+        )
+        stream = get_incident_stream(sdk)
+        collisions = stream.subscribe(collision_window=10)
+        limits = stream.subscribe(thresholds=range(4, 100, 4))
+        assert get_incident_stream(sdk) is stream
+
+        def kinds(events):
+            return [(e.kind, e.car_number, e.label) for e in events]
+
+        assert collisions.poll(sdk) == []
+        sdk.freeze_var_buffer_latest()
+        assert kinds(collisions.poll(sdk)) == [
+            (IncidentKind.INCIDENT, "11", "2x"),
+            (IncidentKind.INCIDENT, "33", "2x"),
+        ]
+
+        sdk.freeze_var_buffer_latest()
+        assert kinds(collisions.poll(sdk)) == [
+            (IncidentKind.INCIDENT, "11", "2x"),
+            (IncidentKind.COLLISION, "11", "2x"),
+        ]
+        # Polling the same tick again publishes nothing new.
+        assert collisions.poll(sdk) == []
+
+        # The 33's count was 2 when the window opened at 5s, so 4 at 15s is
+        # not a collision.
+        sdk.freeze_var_buffer_latest()
+        assert kinds(collisions.poll(sdk)) == [(IncidentKind.INCIDENT, "33", "2x")]
+
+        threshold_events = [
+            (e.car_number, e.threshold)
+            for e in limits.poll(sdk)
+            if e.kind is IncidentKind.THRESHOLD
+        ]
+        assert threshold_events == [("11", 4), ("33", 4)]
+
+        collisions.close()
+        limits.close()
+        assert stream._subscriptions == []
+
+
+def _pit_lane_replay(tmp_path: Path, car_22_exits: int | None) -> ReplaySDK:
+    frames = [
+        _base_frame(
+            tick=100 + i,
+            session_time=10.0 + i,
+            session_time_remain=3590.0 - i,
+            lap_completed=[6, 5, 5, 3],
+            on_pit_road=[
+                1,
+                int(i in (2, 3)),
+                int(car_22_exits is None or i < car_22_exits),
+                1,
+            ],
+        )
+        for i in range(20)
+    ]
+    path = tmp_path / "pit_lane.json"
+    path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+    return ReplaySDK(path)
+
+
+class TestPitLaneTracker:
+    def test_tracks_entries_and_exits(self, tmp_path: Path) -> None:
+        sdk = _pit_lane_replay(tmp_path, car_22_exits=5)
+        tracker = get_pit_lane_tracker(sdk)
+        seen = []
+        while not sdk.is_replay_exhausted:
+            tracker.update(sdk)
+            seen.append(dict(tracker.cars))
+            sdk.current_frame_index += 1
+
+        # The pace car (CarIdx 0) is never counted.
+        assert seen[0] == {2: 100, 3: 100}
+        assert seen[2] == {2: 100, 3: 100, 1: 102}
+        assert seen[4] == {2: 100, 3: 100}
+        assert seen[5] == {3: 100}
+        assert get_pit_lane_tracker(sdk) is tracker
+
+    def test_ignores_cars_too_far_down(self, tmp_path: Path) -> None:
+        sdk = _pit_lane_replay(tmp_path, car_22_exits=0)
+        tracker = get_pit_lane_tracker(sdk).update(sdk)
+
+        assert list(tracker.cars) == [3]
+        assert tracker.in_field(sdk, 99) == [3]
+        assert tracker.is_clear(sdk, 2)
+
+    def test_wait_ends_on_the_tick_pit_lane_clears(self, tmp_path: Path) -> None:
+        event = BaseEvent(
+            sdk=_pit_lane_replay(tmp_path, car_22_exits=7),
+            pwa=MockPWA(),
+            max_laps_behind_leader=1,
+        )
+
+        assert event.wait_for_cars_to_clear_pit_lane(max_time=60)
+        assert event.sdk["SessionTick"] == 107
+
+    def test_wait_times_out_on_session_time(self, tmp_path: Path) -> None:
+        event = BaseEvent(
+            sdk=_pit_lane_replay(tmp_path, car_22_exits=None),
+            pwa=MockPWA(),
+            max_laps_behind_leader=1,
+        )
+
+        assert not event.wait_for_cars_to_clear_pit_lane(max_time=5)
+        assert event.sdk["SessionTick"] == 105
+
+
+def _speed_replay(tmp_path: Path) -> ReplaySDK:
+    frames = []
+    for i in range(20):
+        frames.append(
+            _base_frame(
+                tick=100 + i,
+                session_time=10.0 + i / 10,
+                session_time_remain=3590.0 - i / 10,
+                lap_dist_pct=[
+                    -1.0,
+                    # 10 m a sample on the 2 km track, crossing the line.
+                    (0.95 + 0.005 * i) % 1,
+                    # 20 m/s faster every sample.
+                    0.1 + 0.0005 * i * (i + 1),
+                    # Stopped, with LapDistPct jittering back and forth.
+                    0.5 - 0.0001 * (i % 2),
+                ],
+            )
+        )
+    path = tmp_path / "speed.json"
+    path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+    return ReplaySDK(path)
+
+
+class TestSpeedEstimator:
+    def test_smoothed_speed_and_acceleration(self, tmp_path: Path) -> None:
+        sdk = _speed_replay(tmp_path)
+        estimator = get_speed_estimator(sdk)
+        while not sdk.is_replay_exhausted:
+            estimator.update(sdk)
+            sdk.current_frame_index += 1
+
+        assert estimator.speed_kph(1) == pytest.approx(360)
+        assert estimator.latest_speed_kph(1) == pytest.approx(360)
+        assert estimator.acceleration[1] == pytest.approx(0, abs=1e-6)
+        # The last second's steps average 290 m/s; the last one is 380 m/s.
+        assert estimator.speed[2] == pytest.approx(290)
+        assert estimator.latest_speed[2] == pytest.approx(380)
+        assert estimator.acceleration[2] == pytest.approx(200)
+        # A step back isn't read as nearly a whole lap forward.
+        assert estimator.speed[3] == pytest.approx(1)
+        assert estimator.speed_kph(0) == 0
+        assert get_speed_estimator(sdk) is estimator
+
+    def test_ignores_repeated_ticks(self, tmp_path: Path) -> None:
+        sdk = _speed_replay(tmp_path)
+        event = BaseEvent(sdk=sdk, pwa=MockPWA())
+        event.get_speed_estimator()
+        sdk.current_frame_index += 1
+        estimator = event.get_speed_estimator()
+        speed = estimator.speed_kph(1)
+
+        assert event.get_speed_estimator().speed_kph(1) == speed
+        assert speed == pytest.approx(360)
+
+
+class TestTrackModel:
+    def test_geometry(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        sdk.static["SplitTimeInfo"] = {
+            "Sectors": [
+                {"SectorNum": 1, "SectorStartPct": 0.4},
+                {"SectorNum": 0, "SectorStartPct": 0.0},
+                {"SectorNum": 2, "SectorStartPct": 0.75},
+            ]
+        }
+        track = get_track_model(sdk)
+
+        assert track.length == 2000
+        assert track.sectors == (0.0, 0.4, 0.75)
+        assert [track.sector(p) for p in (0.1, 0.4, 0.9, 1.2)] == [0, 1, 2, 0]
+        assert track.distance(0.9, 0.1) == pytest.approx(400)
+        assert track.to_pct(track.to_metres(0.25)) == pytest.approx(0.25)
+        assert track.time_to_cover(0.0, 0.5, 50) == pytest.approx(20)
+        assert track.time_to_cover(0.0, 0.5, 0) == float("inf")
+        assert get_track_model(sdk) is track
+
+    def test_rebuilt_when_session_info_changes(self, tmp_path: Path) -> None:
+        sdk = _replay(tmp_path)
+        track = get_track_model(sdk)
+        assert track.sectors == (0.0,)
+
+        sdk.static["WeekendInfo"] = {"TrackLength": "4.5 km"}
+        assert get_track_model(sdk) is track
+        assert track.length == 4500
+
+
+class TestWaitForNextTick:
+    def test_decimates_ticks(self, tmp_path: Path) -> None:
+        event = BaseEvent(sdk=_replay(tmp_path, n_frames=30), pwa=MockPWA())
+
+        assert event.wait_for_next_tick() == 101
+        assert event.wait_for_next_tick(max_hz=10) == 107
+        assert event.wait_for_next_tick(max_hz=20) == 110
+        assert event.sdk.current_frame_index == 10
+
+    def test_wakes_on_cancel(self, tmp_path: Path) -> None:
+        frames = [
+            _base_frame(tick=100, session_time=10.0, session_time_remain=3590.0)
+            for _ in range(600)
+        ]
+        path = tmp_path / "stalled.json"
+        path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+        event = BaseEvent(sdk=ReplaySDK(path), pwa=MockPWA())
+        threading.Timer(0.05, event.cancel_event.set).start()
+
+        started = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            event.wait_for_next_tick()
+        assert time.monotonic() - started < 1
+
+    def test_sleep_wakes_on_cancel(self, tmp_path: Path) -> None:
+        event = BaseEvent(sdk=_replay(tmp_path), pwa=MockPWA())
+        threading.Timer(0.05, event.cancel_event.set).start()
+
+        started = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            event.sleep(5)
+        assert time.monotonic() - started < 1
@@ -0,0 +1,120 @@
+"""
+test_trigger_scheduler.py -- Unit tests for the central start trigger scheduler
+===============================================================================
+
+Drives a ``TriggerScheduler`` from a hub over a synthetic replay and checks
+that time and lap triggers fire on the right tick, that quickie flags are
+checked, and that scheduled events wait on it instead of polling.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from modules.events import TimedEvent
+from modules.telemetry import FieldSnapshot, TelemetryHub, get_leader_lap, set_hub
+from modules.trigger_scheduler import TriggerScheduler
+from tests.mock_irsdk import MockPWA, ReplaySDK
+from tests.test_replay import _base_frame, _build_telemetry_json
+
+
+class _Event:
+    def __init__(self) -> None:
+        self.quickie = False
+        self.quickie_checks = 0
+
+    def check_and_set_quickie_flag(self) -> None:
+        self.quickie_checks += 1
+
+
+def _hub(tmp_path: Path, n_frames: int = 20, state: int = 4) -> TelemetryHub:
+    frames = []
+    for i in range(n_frames):
+        lap = i // 4
+        frame = _base_frame(
+            tick=100 + i,
+            session_time=float(i),
+            session_time_remain=3600.0 - i,
+            lap_completed=[0, lap, lap, lap],
+            lap_dist_pct=[-1.0, 0.5, 0.4, 0.3],
+        )
+        frame["SessionState"] = state
+        frame["SessionTimeTotal"] = 3600.0
+        frames.append(frame)
+    path = tmp_path / "triggers.json"
+    path.write_text(json.dumps(_build_telemetry_json(frames)), encoding="utf-8")
+    return TelemetryHub(ReplaySDK(path), MockPWA())
+
+
+class TestTriggerScheduler:
+    def test_time_triggers_fire_in_due_order(self, tmp_path: Path) -> None:
+        scheduler = TriggerScheduler(_hub(tmp_path))
+        late, early = _Event(), _Event()
+        late_trigger = scheduler.at_time(late, 5, 3)
+        early_trigger = scheduler.at_time(early, 2, 10)
+
+        assert early_trigger.future.result(timeout=5) == 103
+        assert late_trigger.future.result(timeout=5) == 106
+        assert late.quickie_checks >= 1
+        assert early.quickie_checks == 1
+        assert scheduler.waiting == 0
+
+    def test_lap_trigger_fires_on_the_leaders_lap(self, tmp_path: Path) -> None:
+        scheduler = TriggerScheduler(_hub(tmp_path))
+        event = _Event()
+        trigger = scheduler.at_lap(event, 3, 1)
+
+        # Laps go 0.5, 1.5, 2.5, 3.5 every four ticks.
+        assert trigger.future.result(timeout=5) == 112
+        assert event.quickie_checks >= 1
+        assert scheduler.leader_lap == 3.5
+
+    def test_end_lap_trigger_skips_quickie_checks(self, tmp_path: Path) -> None:
+        scheduler = TriggerScheduler(_hub(tmp_path))
+        event = _Event()
+        trigger = scheduler.at_lap(event, 2, None)
+
+        assert trigger.future.result(timeout=5) == 108
+        assert event.quickie_checks == 0
+        assert scheduler.waiting == 0
+
+    def test_triggers_wait_for_the_race(self, tmp_path: Path) -> None:
+        scheduler = TriggerScheduler(_hub(tmp_path, state=3))
+        trigger = scheduler.at_time(_Event(), 2, 0)
+
+        with pytest.raises(TimeoutError):
+            trigger.future.result(timeout=1)
+        trigger.cancel()
+        assert scheduler.waiting == 0
+
+
+class TestLeaderLap:
+    def test_matches_the_field_snapshot(self, tmp_path: Path) -> None:
+        hub = _hub(tmp_path)
+        for _ in range(6):
+            snapshot = hub.sample()
+            field = FieldSnapshot(snapshot, snapshot.tick)
+            assert get_leader_lap(snapshot) == field.max_total_completed
+            assert get_leader_lap(snapshot) is get_leader_lap(snapshot)
+
+
+class TestScheduledEvents:
+    def test_timed_event_waits_on_the_scheduler(self, tmp_path: Path) -> None:
+        hub = set_hub(_hub(tmp_path))
+        try:
+            event = TimedEvent(event_time=0.05, pwa=MockPWA())
+
+            def poll() -> bool:
+                raise AssertionError("is_time_to_start polled")
+
+            event.is_time_to_start = poll
+            event.wait_for_start()
+        finally:
+            set_hub(None)
+
+        assert event.start_time == 3
+        assert hub.latest.tick >= 104
+        assert event.get_trigger_scheduler().waiting == 0